@@ -0,0 +1,64 @@
+"""
+Benchmark how many lines per second ship_logs.py reads and parses from a child's output.
+
+Run it from the e2e_tests directory with:
+
+    python -m tests.cluster.benchmark_ship_logs [--lines N]
+"""
+import argparse
+import io
+import os
+import queue
+import sys
+import time
+from typing import Any, Callable, Dict
+
+here = os.path.dirname(__file__)
+static_srv = os.path.join(here, "../../../master/static/srv")
+old = sys.path
+try:
+    sys.path = [static_srv] + sys.path
+    import ship_logs
+finally:
+    sys.path = old
+
+
+OUTPUTS = {
+    "plain": lambda i: f"step {i}: loss=0.{i:06d}\n",
+    "progress": lambda i: f"\r{i % 100:3d}%|{'#' * (i % 100 // 10):<10}| {i}/1000000 [00:01<00:02]",
+    "prefixed": lambda i: f"[rank={i % 8}] INFO: step {i}: loss=0.{i:06d}\n",
+}  # type: Dict[str, Callable[[int], str]]
+
+
+def read(data: bytes) -> None:
+    for _ in ship_logs.read_newlines_or_carriage_returns(io.BytesIO(data)):
+        pass
+
+
+def collect(data: bytes) -> None:
+    logq = queue.Queue()  # type: queue.Queue
+    collector = ship_logs.Collector(
+        io.BytesIO(data), "stdout", False, {"task_id": "task"}, logq, queue.Queue(), daemon=True
+    )
+    collector._run()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200000)
+    args = parser.parse_args()
+
+    impls = {"read": read, "collect": collect}  # type: Dict[str, Callable[[bytes], Any]]
+    print(f"{'output':>10} " + " ".join(f"{name:>15}" for name in impls))
+    for name, make_line in OUTPUTS.items():
+        data = "".join(make_line(i) for i in range(args.lines)).encode("utf8")
+        rates = []
+        for impl in impls.values():
+            start = time.perf_counter()
+            impl(data)
+            rates.append(args.lines / (time.perf_counter() - start))
+        print(f"{name:>10} " + " ".join(f"{rate:>8.0f} lines/s" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
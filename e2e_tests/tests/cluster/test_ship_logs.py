@@ -1,7 +1,11 @@
+import gzip
 import io
 import json
 import logging
 import os
+import pathlib
+import queue
+import re
 import shutil
 import signal
 import socket
@@ -34,11 +38,23 @@ class ShipLogServer:
     shuts down much faster.
     """
 
-    def __init__(self, ctx: Optional[ssl.SSLContext] = None, reject_logs: bool = False) -> None:
+    def __init__(
+        self,
+        ctx: Optional[ssl.SSLContext] = None,
+        reject_logs: bool = False,
+        keep_alive: bool = False,
+        reject_gzip: bool = False,
+        fail_logs: int = 0,
+    ) -> None:
         self.ctx = ctx
         self.reject_logs = reject_logs
+        self.fail_logs = fail_logs
+        self.keep_alive = keep_alive
+        self.reject_gzip = reject_gzip
         self.quit = False
         self.logs: List[str] = []
+        self.connections = 0
+        self.encodings: List[Optional[str]] = []
 
         self.listener = socket.socket()
         self.listener.bind(("127.0.0.1", 0))
@@ -72,10 +88,13 @@ class ShipLogServer:
                 try:
                     if self.quit:
                         return
+                    self.connections += 1
                     if self.ctx:
                         s = self.ctx.wrap_socket(s, server_side=True)
                     try:
-                        self.serve_one_request(s)
+                        buf: Optional[bytes] = b""
+                        while buf is not None:
+                            buf = self.serve_one_request(s, buf)
                     except Exception:
                         logging.error("error reading request", exc_info=True)
                 finally:
@@ -83,43 +102,62 @@ class ShipLogServer:
         except Exception:
             logging.error("server crashed", exc_info=True)
 
-    def serve_one_request(self, s: socket.socket) -> None:
+    def respond(self, s: socket.socket, status: str) -> bool:
+        """Send a response, and return whether the connection stays open for another request."""
+        if self.keep_alive:
+            s.sendall(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\n\r\n".encode())
+            return True
+        s.sendall(f"HTTP/1.1 {status}\r\n\r\n".encode())
+        return False
+
+    def serve_one_request(self, s: socket.socket, buf: bytes) -> Optional[bytes]:
+        """Serve a request, and return what was read past its end, or None to close."""
         # Receive headers.
-        hdrs = b""
-        while b"\r\n\r\n" not in hdrs:
-            buf = s.recv(4096)
-            if not buf:
+        while b"\r\n\r\n" not in buf:
+            more = s.recv(4096)
+            if not more:
+                # EOF
+                return None
+            buf += more
+        hdrs, body = buf.split(b"\r\n\r\n", maxsplit=1)
+        headers = {}
+        for line in hdrs.decode("utf8").split("\r\n")[1:]:
+            name, value = line.split(":", maxsplit=1)
+            headers[name.strip().lower()] = value.strip()
+
+        # Receive the body.
+        length = int(headers.get("content-length", "0"))
+        while len(body) < length:
+            more = s.recv(4096)
+            if not more:
                 # EOF
-                return
-            hdrs += buf
+                return None
+            body += more
+        body, rest = body[:length], body[length:]
+
         # Detect the initial GET /api/v1/me probe.
         if hdrs.startswith(b"GET"):
-            s.sendall(b"HTTP/1.1 200 OK\r\n\r\n")
-            return
+            return rest if self.respond(s, "200 OK") else None
         # Are we supposed to misbehave?
         if self.reject_logs:
-            s.sendall(b"HTTP/1.1 500 No! I don't wanna!\r\n\r\n")
-            return
-        # Receive body until we have valid json.
-        hdrs, body = hdrs.split(b"\r\n\r\n", maxsplit=1)
-        while True:
-            try:
-                jbody = json.loads(body)
-                break
-            except json.decoder.JSONDecodeError:
-                # Must not have the full body yet.
-                pass
-            buf = s.recv(4096)
-            if not buf:
-                # EOF
-                return
-            body += buf
+            return rest if self.respond(s, "500 No! I don't wanna!") else None
+        if self.fail_logs:
+            self.fail_logs -= 1
+            return rest if self.respond(s, "503 Restarting") else None
+
+        encoding = headers.get("content-encoding")
+        self.encodings.append(encoding)
+        if encoding == "gzip":
+            if self.reject_gzip:
+                return rest if self.respond(s, "415 Unsupported Media Type") else None
+            body = gzip.decompress(body)
+        jbody = json.loads(body)
 
         # Remember the logs we saw.
         self.logs.extend(j["log"] for j in jbody["logs"])
 
         # Send a response.
-        s.sendall(b"HTTP/1.1 200 OK\r\n\r\n")
+        return rest if self.respond(s, "200 OK") else None
 
     def master_url(self) -> str:
         return f"http://127.0.0.1:{self.port}"
@@ -145,6 +183,7 @@ class TestShipLogs:
         log_wait_time: float = 30,
         cert_name: str = "",
         cert_file: str = "",
+        spool_dir: Optional[str] = None,
     ) -> int:
         exit_code = ship_logs.main(
             master_url=master_url,
@@ -155,6 +194,7 @@ class TestShipLogs:
             emit_stdout_logs=False,
             cmd=cmd,
             log_wait_time=log_wait_time,
+            spool_dir=spool_dir,
         )
         assert isinstance(exit_code, int), exit_code
         return exit_code
@@ -249,6 +289,89 @@ class TestShipLogs:
                 # Failed, even on the highest timeout
                 raise ValueError("".join(srv.logs))
 
+    @pytest.mark.e2e_cpu
+    def test_connection_is_kept_alive(self) -> None:
+        cmd = mkcmd(
+            """
+            import time
+            for i in range(3):
+                print(i, flush=True)
+                time.sleep(1.2)
+            """
+        )
+        with ShipLogServer(keep_alive=True) as srv:
+            exit_code = self.run_ship_logs(srv.master_url(), cmd)
+        assert exit_code == 0, exit_code
+        assert srv.logs == ["0\n", "1\n", "2\n"], srv.logs
+        # One connection for the initial probe, and one for every batch of logs.
+        assert len(srv.encodings) == 3, srv.encodings
+        assert srv.connections == 2, srv.connections
+
+    @pytest.mark.e2e_cpu
+    def test_uncompressed_fallback(self) -> None:
+        cmd = mkcmd(
+            """
+            import time
+            print("first", flush=True)
+            time.sleep(1.2)
+            print("second", flush=True)
+            """
+        )
+        with ShipLogServer(reject_gzip=True) as srv:
+            exit_code = self.run_ship_logs(srv.master_url(), cmd)
+        assert exit_code == 0, exit_code
+        assert srv.logs == ["first\n", "second\n"], srv.logs
+        # Only the first batch is tried compressed.
+        assert srv.encodings == ["gzip", None, None], srv.encodings
+
+    @pytest.mark.e2e_cpu
+    def test_logs_are_spooled_during_outage(self, tmp_path: pathlib.Path) -> None:
+        cmd = mkcmd(
+            """
+            import time
+            for i in range(4):
+                print(i, flush=True)
+                time.sleep(0.6)
+            """
+        )
+        # The master fails the first two batches, and so the second batch is spooled behind the
+        # first while the shipper waits to try again.
+        with ShipLogServer(fail_logs=2) as srv:
+            exit_code = self.run_ship_logs(srv.master_url(), cmd, spool_dir=str(tmp_path))
+        assert exit_code == 0, exit_code
+        assert srv.logs == ["0\n", "1\n", "2\n", "3\n"], srv.logs
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.e2e_cpu
+    def test_spool(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(ship_logs, "SPOOL_SEGMENT_BYTES", 10)
+        monkeypatch.setattr(ship_logs, "SPOOL_MAX_BYTES", 30)
+        spool = ship_logs.Spool(str(tmp_path))
+
+        def pop() -> bytes:
+            data: bytes = spool.peek()
+            spool.pop(data)
+            return data
+
+        # Two batches fit in each segment.
+        for i in range(4):
+            spool.append(b"batch%d" % i)
+        assert spool.batches == 4 and len(spool.segments) == 2
+        assert pop() == b"batch0"
+
+        # Appending past the size limit evicts the oldest segment, even if it was partly read.
+        spool.append(b"batch4")
+        spool.append(b"batch5")
+        assert spool.batches == 4 and spool.evicted_batches == 1
+        assert [pop() for _ in range(spool.batches)] == [b"batch2", b"batch3", b"batch4", b"batch5"]
+
+        # Segments are removed once every batch in them is popped.
+        assert spool.dir is not None and os.listdir(spool.dir) == []
+        spool.append(b"batch6")
+        assert pop() == b"batch6"
+        spool.close()
+        assert os.listdir(tmp_path) == []
+
     @pytest.mark.e2e_cpu
     def test_signals_are_forwarded(self) -> None:
         cmd = mkcmd(
@@ -330,21 +453,29 @@ class TestShipLogs:
         cmd = mkcmd(
             """
             # ONLY STANDARD LIBRARY IMPORTS ARE ALLOWED
+            import base64
+            import collections
             import datetime
+            import gzip
+            import http.client
             import io
             import json
             import logging
             import os
             import queue
             import re
+            import shutil
             import signal
             import ssl
             import subprocess
             import sys
+            import tempfile
             import threading
             import time
             import traceback
             import typing
+            import urllib.error
+            import urllib.parse
             import urllib.request
             # END OF STANDARD LIBRARY IMPORTS
 
@@ -563,3 +694,47 @@ class TestReadNewlinesOrCarriageReturns:
         line = next(reader)
         assert line == exp_2, line
         p.wait()
+
+    @pytest.mark.e2e_cpu
+    def test_lines_split_across_reads(self) -> None:
+        class Reads(io.RawIOBase):
+            def __init__(self, reads: List[bytes]) -> None:
+                self.reads = reads
+
+            def read(self, size: int = -1) -> bytes:
+                return self.reads.pop(0) if self.reads else b""
+
+        long_line = b"x" * io.DEFAULT_BUFFER_SIZE
+        fd = Reads(
+            [b"one\ntw", b"o\rthr", b"ee\n" + long_line[:100], long_line[100:] + b"\nla", b"st"]
+        )
+        assert list(ship_logs.read_newlines_or_carriage_returns(fd)) == [
+            "one\n",
+            "two\n",
+            "three\n",
+            "x" * (io.DEFAULT_BUFFER_SIZE - 1) + "\n",
+            "x\n",
+            "last\n",
+        ]
+
+    @pytest.mark.e2e_cpu
+    def test_collector_parses_prefixes(self) -> None:
+        output = b"[rank=1] INFO: hello\n [rank=x] hi\nWARNING: careful\nINFOrmation\n"
+        logq: queue.Queue = queue.Queue()
+        collector = ship_logs.Collector(
+            io.BytesIO(output), "stdout", False, {"task_id": "task"}, logq, queue.Queue(), True
+        )
+        collector._run()
+
+        logs = [logq.get_nowait() for _ in range(logq.qsize())]
+        assert [(log.get("rank_id"), log.get("level"), log["log"]) for log in logs] == [
+            (1, "LOG_LEVEL_INFO", "hello\n"),
+            (None, None, " [rank=x] hi\n"),
+            (None, "LOG_LEVEL_WARNING", "careful\n"),
+            (None, None, "INFOrmation\n"),
+        ]
+        assert all(log["task_id"] == "task" and log["stdtype"] == "stdout" for log in logs)
+        # Timestamps are formatted like datetime.isoformat(), to the millisecond.
+        assert re.fullmatch(
+            r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}\+00:00", logs[0]["timestamp"]
+        ), logs[0]["timestamp"]
@@ -1,5 +1,11 @@
 from determined.common.api import authentication, errors, metric, bindings
-from determined.common.api._session import BaseSession, UnauthSession, Session, TaskSession
+from determined.common.api._session import (
+    BaseSession,
+    UnauthSession,
+    Session,
+    TaskSession,
+    set_http_pool_size,
+)
 from determined.common.api._util import (
     PageOpts,
     get_ntsc_details,
@@ -1,8 +1,10 @@
 import abc
 import copy
 import json as _json
+import os
+import threading
 from types import TracebackType  # noqa:I2041
-from typing import Any, Dict, Optional, TypeVar, Union
+from typing import Any, Dict, Optional, Tuple, TypeVar, Union
 
 import requests
 import urllib3
@@ -22,20 +24,29 @@ DEFAULT_MAX_RETRIES = urllib3.util.retry.Retry(
     status_forcelist=[502, 503, 504],  # Bad Gateway, Service Unavailable, Gateway Timeout
 )
 
+# Default number of connections to each master kept open by the shared HTTP sessions.
+DEFAULT_HTTP_POOL_SIZE = 10
+
 
 def _make_requests_session(
     server_hostname: Optional[str] = None,
     verify: Optional[Union[str, bool]] = None,
     max_retries: Optional[GeneralizedRetry] = None,
     headers: Optional[Dict[str, Any]] = None,
+    pool_maxsize: int = adapters.DEFAULT_POOLSIZE,
 ) -> requests.Session:
     if verify is None:
         verify = True
     requests_session = requests.Session()
     requests_session.mount(
-        "https://", _HTTPSAdapter(server_hostname=server_hostname, max_retries=max_retries)
+        "https://",
+        _HTTPSAdapter(
+            server_hostname=server_hostname, max_retries=max_retries, pool_maxsize=pool_maxsize
+        ),
+    )
+    requests_session.mount(
+        "http://", adapters.HTTPAdapter(max_retries=max_retries, pool_maxsize=pool_maxsize)
     )
-    requests_session.mount("http://", adapters.HTTPAdapter(max_retries=max_retries))
     requests_session.verify = verify
     if headers:
         requests_session.headers.update(headers)
@@ -43,6 +54,72 @@ def _make_requests_session(
     return requests_session
 
 
+class _HTTPSessionPool:
+    """
+    _HTTPSessionPool shares one requests.Session, and so its pool of open connections, between
+    all the BaseSessions in the process which talk to the same master with the same certificate
+    and retry policy.
+
+    The shared requests.Sessions carry no authentication; each BaseSession sends its own headers
+    with every request.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._sessions = {}  # type: Dict[Tuple[Any, ...], requests.Session]
+
+    def get(
+        self, master: str, cert: Optional[certs.Cert], max_retries: Optional[GeneralizedRetry]
+    ) -> requests.Session:
+        server_hostname = cert.name if cert else None
+        verify = cert.bundle if cert else None
+        key = (master, server_hostname, verify, max_retries)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = _make_requests_session(
+                    server_hostname=server_hostname,
+                    verify=verify,
+                    max_retries=max_retries,
+                    pool_maxsize=self.maxsize,
+                )
+                self._sessions[key] = session
+            return session
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            # Requests already in flight keep using the old sessions, which are closed once they
+            # are garbage collected.
+            self._sessions = {}
+
+    def _after_fork(self) -> None:
+        # Connections opened by the parent process must not be shared with a child.
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+
+_http_session_pool = _HTTPSessionPool(DEFAULT_HTTP_POOL_SIZE)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_http_session_pool._after_fork)
+
+
+def set_http_pool_size(size: int) -> None:
+    """
+    Set how many connections to each master are kept open for reuse by all the sessions in this
+    process which are not used as a context manager.  Sessions used as a context manager keep their
+    own connections.
+
+    Arguments:
+        size: the most idle connections to keep open to each master, which is also the most
+            concurrent requests to a master which reuse connections.  Defaults to 10.
+    """
+    if size < 1:
+        raise ValueError(f"HTTP pool size must be at least 1, not {size}")
+    _http_session_pool.resize(size)
+
+
 def _get_error_str(r: requests.models.Response) -> str:
     try:
         json_resp = _json.loads(r.text)
@@ -72,7 +149,8 @@ class BaseSession(metaclass=abc.ABCMeta):
 
     `BaseSession` and subclasses can be used directly, or as a context manager. When used as a
     context manager, all requests within the context will share a persistent underlying HTTP
-    connection. When used directly, each request will create a new HTTP connection.
+    connection. When used directly, requests reuse connections from a pool shared by all the
+    sessions in the process which talk to the same master; see ``set_http_pool_size()``.
 
     TODO (MD-392): Migrate all session usage to persistent, remove context manager usage pattern.
 
@@ -81,7 +159,7 @@ class BaseSession(metaclass=abc.ABCMeta):
     .. code:: python
 
        session = api.Session(...)
-       # Each request opens and closes a new HTTP connection.
+       # Each request reuses an idle connection from the process-wide pool, if there is one.
        session.get(...)
        session.get(...)
 
@@ -124,13 +202,16 @@ class BaseSession(metaclass=abc.ABCMeta):
     def _make_http_session(self) -> requests.Session:
         pass
 
+    def _auth_headers(self) -> Dict[str, str]:
+        return {}
+
     def _do_request(
         self,
         method: str,
         path: str,
         params: Optional[Dict[str, Any]],
         json: Any,
-        data: Optional[str],
+        data: Optional[Union[str, bytes]],
         headers: Optional[Dict[str, Any]],
         timeout: Optional[int],
         stream: bool,
@@ -144,8 +225,13 @@ class BaseSession(metaclass=abc.ABCMeta):
 
         relpath = path.lstrip("/")
 
-        # Use persistent session or create a new single-use one.
-        session = self._http_session or self._make_http_session()
+        # Use the persistent session, or else the one shared through the pool.
+        session = self._http_session
+        if session is None:
+            session = _http_session_pool.get(self.master, self.cert, self._max_retries)
+            auth_headers = self._auth_headers()
+            if auth_headers:
+                headers = {**auth_headers, **(headers or {})}
         try:
             r = session.request(
                 method=method,
@@ -162,10 +248,6 @@ class BaseSession(metaclass=abc.ABCMeta):
             raise errors.MasterNotFoundException(str(e))
         except requests.exceptions.RequestException as e:
             raise errors.BadRequestException(str(e))
-        finally:
-            if not self._http_session:
-                # Close the session if not persistent.
-                session.close()
 
         if r.status_code == 403:
             raise errors.ForbiddenException(message=_get_error_str(r))
@@ -205,7 +287,7 @@ class BaseSession(metaclass=abc.ABCMeta):
         *,
         params: Optional[Dict[str, Any]] = None,
         json: Any = None,
-        data: Optional[str] = None,
+        data: Optional[Union[str, bytes]] = None,
         headers: Optional[Dict[str, Any]] = None,
         timeout: Optional[int] = None,
     ) -> requests.Response:
@@ -217,7 +299,7 @@ class BaseSession(metaclass=abc.ABCMeta):
         *,
         params: Optional[Dict[str, Any]] = None,
         json: Any = None,
-        data: Optional[str] = None,
+        data: Optional[Union[str, bytes]] = None,
         headers: Optional[Dict[str, Any]] = None,
         timeout: Optional[int] = None,
     ) -> requests.Response:
@@ -229,7 +311,7 @@ class BaseSession(metaclass=abc.ABCMeta):
         *,
         params: Optional[Dict[str, Any]] = None,
         json: Any = None,
-        data: Optional[str] = None,
+        data: Optional[Union[str, bytes]] = None,
         headers: Optional[Dict[str, Any]] = None,
         timeout: Optional[int] = None,
     ) -> requests.Response:
@@ -310,9 +392,12 @@ class Session(BaseSession):
             server_hostname=self.cert.name if self.cert else None,
             verify=self.cert.bundle if self.cert else None,
             max_retries=self._max_retries,
-            headers={self.AUTH_HEADER: f"Bearer {self.token}"},
+            headers=self._auth_headers(),
         )
 
+    def _auth_headers(self) -> Dict[str, str]:
+        return {self.AUTH_HEADER: f"Bearer {self.token}"}
+
 
 class TaskSession(Session):
     """
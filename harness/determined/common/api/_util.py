@@ -1,6 +1,9 @@
+import collections
 import enum
+import itertools
 import os
-from typing import Callable, Iterator, Optional, Tuple, TypeVar, Union
+from concurrent import futures
+from typing import Callable, Deque, Generator, Iterator, Optional, Tuple, TypeVar, Union
 from urllib import parse
 
 from determined.common import api, util
@@ -96,8 +99,19 @@ def read_paginated(
     get_with_offset: Callable[[int], T],
     offset: int = 0,
     pages: PageOpts = PageOpts.all,
+    prefetch: int = 0,
 ) -> Iterator[T]:
-    while True:
+    """
+    Yield the pages of a paginated API response, in order.
+
+    With ``prefetch`` set, once the first page reveals the total number of results, the offsets
+    of all the remaining pages are known, so up to ``prefetch`` of them are requested concurrently
+    ahead of the page being yielded.  ``get_with_offset`` must then be safe to call from other
+    threads.
+    """
+    next_offset = offset  # type: Optional[int]
+    while next_offset is not None:
+        offset = next_offset
         resp = get_with_offset(offset)
         pagination = resp.pagination
         assert pagination is not None
@@ -106,8 +120,46 @@ def read_paginated(
         yield resp
         if pagination.endIndex >= pagination.total or pages == PageOpts.single:
             break
-        assert pagination.endIndex is not None
-        offset = pagination.endIndex
+        next_offset = pagination.endIndex
+        page_size = pagination.endIndex - offset
+        if prefetch > 0 and page_size > 0:
+            next_offset = yield from _read_pages_ahead(
+                get_with_offset, range(next_offset, pagination.total, page_size), prefetch
+            )
+
+
+def _read_pages_ahead(
+    get_with_offset: Callable[[int], T], offsets: range, prefetch: int
+) -> Generator[T, None, Optional[int]]:
+    """
+    Yield the pages at each of offsets, keeping up to prefetch requests in flight.  Return the
+    offset to continue reading from, if results were added while reading, or else None.
+    """
+    remaining = iter(offsets)
+    pending = collections.deque()  # type: Deque[futures.Future]
+    executor = futures.ThreadPoolExecutor(max_workers=prefetch)
+    try:
+        for offset in itertools.islice(remaining, prefetch):
+            pending.append(executor.submit(get_with_offset, offset))
+        while pending:
+            resp = pending.popleft().result()  # type: T
+            # Keep the pipeline full while the caller handles this page.
+            for offset in itertools.islice(remaining, 1):
+                pending.append(executor.submit(get_with_offset, offset))
+            yield resp
+    finally:
+        # If the caller stopped early, don't make requests for pages nobody will read.
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+    pagination = resp.pagination
+    assert pagination is not None
+    assert pagination.endIndex is not None
+    assert pagination.total is not None
+    if pagination.endIndex >= pagination.total:
+        return None
+    return pagination.endIndex
 
 
 # Literal["notebook", "tensorboard", "shell", "command"]
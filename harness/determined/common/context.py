@@ -1,5 +1,6 @@
 import collections
 import pathlib
+import time
 from typing import Any, Dict, Iterable, List, Optional
 
 from determined.common import constants, detignore, util, v1file_utils
@@ -7,6 +8,9 @@ from determined.common.api import bindings
 
 LegacyContext = List[Dict[str, Any]]
 
+# Minimum number of seconds between updates of the progress message.
+PROGRESS_INTERVAL = 0.1
+
 
 class _Builder:
     def __init__(self, limit: int) -> None:
@@ -14,6 +18,7 @@ class _Builder:
         self.size = 0
         self.items = []  # type: List[bindings.v1File]
         self.msg = f"Preparing files to send to master... {util.sizeof_fmt(0)} and 0 files"
+        self.last_update = time.monotonic()
         print(self.msg, end="\r", flush=True)
 
     def add_v1File(self, f: bindings.v1File) -> None:
@@ -27,7 +32,11 @@ class _Builder:
                 "files or subdirectories should be omitted."
             )
 
-    def update_msg(self) -> None:
+    def update_msg(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self.last_update < PROGRESS_INTERVAL:
+            return
+        self.last_update = now
         print(" " * len(self.msg), end="\r")
         self.msg = (
             "Preparing files to send to master... "
@@ -54,6 +63,7 @@ class _Builder:
             self.update_msg()
 
     def get_items(self) -> List[bindings.v1File]:
+        self.update_msg(force=True)
         print()
 
         # Check for conflicting root items, which may arise when --include conflicts with either
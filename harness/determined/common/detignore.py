@@ -1,6 +1,9 @@
+import collections
 import os
 import pathlib
-from typing import TYPE_CHECKING, Callable, Iterable, List, Set
+import re
+from concurrent import futures
+from typing import TYPE_CHECKING, Callable, Deque, Iterable, Iterator, List, Optional, Set, Tuple
 
 if TYPE_CHECKING:
     import pathspec
@@ -8,6 +11,15 @@ if TYPE_CHECKING:
 from determined.common import constants, v1file_utils
 from determined.common.api import bindings
 
+# Threads listing directories and reading files while walking a context directory.
+WALK_THREADS = 8
+# Files are read in batches of about this many bytes, and at most READ_AHEAD_BYTES ahead of the
+# consumer of os_walk_to_v1Files.
+READ_BATCH_BYTES = 1024 * 1024
+READ_AHEAD_BYTES = 64 * 1024 * 1024
+
+_NAMED_GROUP = re.compile(r"\(\?P<\w+>")
+
 
 def _build_detignore_pathspec(root_path: pathlib.Path) -> "pathspec.PathSpec":
     ignore = list(constants.DEFAULT_DETIGNORE)
@@ -23,74 +35,171 @@ def _build_detignore_pathspec(root_path: pathlib.Path) -> "pathspec.PathSpec":
     return pathspec.PathSpec.from_lines(pathspec.patterns.GitWildMatchPattern, ignore)
 
 
-def make_shutil_ignore(root_path: pathlib.Path) -> Callable:
-    ignore_spec = _build_detignore_pathspec(root_path)
-
-    def _ignore(path: str, names: List[str]) -> Set[str]:
-        ignored_names = set()  # type: Set[str]
-        for name in names:
-            if name == ".detignore":
-                ignored_names.add(name)
-                continue
+class _Matcher:
+    """
+    Match paths against a .detignore PathSpec with as few regular expression searches as possible.
+
+    As in .gitignore, the last pattern matching a path decides whether it is ignored, so patterns
+    are merged into one regular expression for each run of consecutive patterns which either all
+    ignore or all un-ignore the paths they match.  Without negated patterns, deciding whether a
+    path is ignored takes a single search.
+    """
+
+    def __init__(self, spec: "pathspec.PathSpec") -> None:
+        self._spec = spec
+        self._groups = None  # type: Optional[List[Tuple[bool, re.Pattern]]]
+        try:
+            runs = []  # type: List[Tuple[bool, List[str]]]
+            for pattern in spec.patterns:
+                if pattern.include is None:
+                    continue
+                # Group names would collide once the patterns are merged.
+                regex = _NAMED_GROUP.sub("(?:", pattern.regex.pattern)
+                if runs and runs[-1][0] == pattern.include:
+                    runs[-1][1].append(regex)
+                else:
+                    runs.append((pattern.include, [regex]))
+            self._groups = [
+                (include, re.compile("|".join(f"(?:{r})" for r in regexes)))
+                for include, regexes in reversed(runs)
+            ]
+        except (AttributeError, TypeError, re.error):
+            # Not every kind of pattern is a regular expression; fall back to pathspec.
+            pass
+
+    def match_file(self, path: str) -> bool:
+        if self._groups is None:
+            return bool(self._spec.match_file(path))
+        for include, regex in self._groups:
+            if regex.match(path):
+                return include
+        return False
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """Return whether the file or directory at a POSIX-style path relative to the root path is
+        ignored."""
+        if is_dir:
+            return self.match_file(rel_path) or self.match_file(rel_path + "/")
+        return rel_path.rsplit("/", 1)[-1] == ".detignore" or self.match_file(rel_path)
 
-            file_path = pathlib.Path(path) / name
-            file_rel_path = file_path.relative_to(root_path)
 
-            if (
-                file_path.is_dir() and ignore_spec.match_file(str(file_rel_path) + "/")
-            ) or ignore_spec.match_file(str(file_rel_path)):
-                ignored_names.add(name)
+def make_shutil_ignore(root_path: pathlib.Path) -> Callable:
+    matcher = _Matcher(_build_detignore_pathspec(root_path))
+    root = str(root_path)
 
-        return ignored_names
+    def _ignore(path: str, names: List[str]) -> Set[str]:
+        rel_dir = os.path.relpath(path, root).replace(os.sep, "/")
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        return {
+            name
+            for name in names
+            if matcher.is_ignored(prefix + name, os.path.isdir(os.path.join(path, name)))
+        }
 
     return _ignore
 
 
-def os_walk_to_v1Files(
-    root_path: pathlib.Path, entry_prefix: pathlib.Path
-) -> Iterable[bindings.v1File]:
-    ignore_spec = _build_detignore_pathspec(root_path)
-
-    for parent, dirs, files in os.walk(str(root_path)):
-        keep_dirs = []
-        for directory in dirs:
-            dir_path = pathlib.Path(parent).joinpath(directory)
-            dir_rel_path = dir_path.relative_to(root_path)
-
-            # If the directory matches any path specified in .detignore, then ignore it.
-            if ignore_spec.match_file(str(dir_rel_path)):
-                continue
-            if ignore_spec.match_file(str(dir_rel_path) + "/"):
-                continue
-            keep_dirs.append(directory)
-            # Determined only supports POSIX-style file paths.  Use as_posix() in case this code
-            # is executed in a non-POSIX environment.
-            entry_path = (entry_prefix / dir_rel_path).as_posix()
-
-            yield v1file_utils.v1File_from_local_dir(entry_path, dir_path)
-        # We can modify dirs in-place so that we do not recurse into ignored directories
-        #  See https://docs.python.org/3/library/os.html#os.walk
-        dirs[:] = keep_dirs
-
-        for file in files:
-            file_path = pathlib.Path(parent).joinpath(file)
-            file_rel_path = file_path.relative_to(root_path)
-
-            # If the file is the .detignore file or matches one of the
-            # paths specified in .detignore, then ignore it.
-            if file_rel_path.name == ".detignore":
+def _scan(
+    matcher: _Matcher, path: str, rel_path: str
+) -> Tuple[List[Tuple[str, str, bool]], List[Tuple[str, str, Optional[os.stat_result]]]]:
+    """
+    List the directories and files in a directory which are not ignored.  Directories also say
+    whether to walk into them, which is not done for symlinks, and files come with their stat().
+    """
+    dirs = []  # type: List[Tuple[str, str, bool]]
+    files = []  # type: List[Tuple[str, str, Optional[os.stat_result]]]
+    with os.scandir(path) as it:
+        for entry in it:
+            entry_rel_path = rel_path + entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if matcher.is_ignored(entry_rel_path, is_dir):
                 continue
-            if ignore_spec.match_file(str(file_rel_path)):
+            if is_dir:
+                dirs.append((entry.path, entry_rel_path, not entry.is_symlink()))
                 continue
-
-            # Determined only supports POSIX-style file paths.  Use as_posix() in case this code
-            # is executed in a non-POSIX environment.
-            entry_path = (entry_prefix / file_rel_path).as_posix()
-
             try:
-                entry = v1file_utils.v1File_from_local_file(entry_path, file_path)
+                st = entry.stat()  # type: Optional[os.stat_result]
             except OSError:
-                print(f"Error reading '{entry_path}', skipping this file.")
-                continue
+                st = None
+            files.append((entry.path, entry_rel_path, st))
+    return dirs, files
+
+
+def _walk(
+    matcher: _Matcher, root_path: pathlib.Path, pool: futures.Executor
+) -> Iterator[Tuple[List[Tuple[str, str, bool]], List[Tuple[str, str, Optional[os.stat_result]]]]]:
+    """
+    Yield the directories and files in each directory under root_path which are not ignored, in
+    the order os.walk would, while listing directories concurrently.
+    """
+    stack = [pool.submit(_scan, matcher, str(root_path), "")]
+    while stack:
+        try:
+            dirs, files = stack.pop().result()
+        except OSError:
+            # Like os.walk, skip directories which cannot be listed.
+            continue
+        yield dirs, files
+        subdirs = [pool.submit(_scan, matcher, p, r + "/") for p, r, walk in dirs if walk]
+        stack.extend(reversed(subdirs))
+
+
+def _read_files(files: List[Tuple[str, str, Optional[os.stat_result]]]) -> List[bindings.v1File]:
+    out = []
+    for path, entry_path, st in files:
+        try:
+            out.append(v1file_utils.v1File_from_local_file(entry_path, pathlib.Path(path), st))
+        except OSError:
+            print(f"Error reading '{entry_path}', skipping this file.")
+    return out
+
 
-            yield entry
+def os_walk_to_v1Files(
+    root_path: pathlib.Path, entry_prefix: pathlib.Path
+) -> Iterable[bindings.v1File]:
+    matcher = _Matcher(_build_detignore_pathspec(root_path))
+    # Determined only supports POSIX-style file paths.  Use as_posix() in case this code is
+    # executed in a non-POSIX environment.
+    prefix = entry_prefix.as_posix()
+    prefix = "" if prefix == "." else prefix + "/"
+
+    with futures.ThreadPoolExecutor(WALK_THREADS) as pool:
+        # Files are read in batches on the pool, at most READ_AHEAD_BYTES ahead of the caller, but
+        # yielded in order.
+        reads = collections.deque()  # type: Deque[Tuple[int, futures.Future]]
+        pending_bytes = 0
+        try:
+            for dirs, files in _walk(matcher, root_path, pool):
+                for path, rel_path, _ in dirs:
+                    entry = v1file_utils.v1File_from_local_dir(
+                        prefix + rel_path, pathlib.Path(path)
+                    )
+                    reads.append((0, _done([entry])))
+                batch = []  # type: List[Tuple[str, str, Optional[os.stat_result]]]
+                batch_bytes = 0
+                for i, (path, rel_path, st) in enumerate(files):
+                    batch.append((path, prefix + rel_path, st))
+                    batch_bytes += st.st_size if st else 0
+                    if i + 1 < len(files) and batch_bytes < READ_BATCH_BYTES:
+                        continue
+                    while reads and (pending_bytes > READ_AHEAD_BYTES or reads[0][1].done()):
+                        size, read = reads.popleft()
+                        pending_bytes -= size
+                        yield from read.result()
+                    reads.append((batch_bytes, pool.submit(_read_files, batch)))
+                    pending_bytes += batch_bytes
+                    batch, batch_bytes = [], 0
+            while reads:
+                yield from reads.popleft()[1].result()
+        finally:
+            for _, read in reads:
+                read.cancel()
+
+
+def _done(result: List[bindings.v1File]) -> futures.Future:
+    future = futures.Future()  # type: futures.Future
+    future.set_result(result)
+    return future
@@ -262,7 +262,9 @@ class Checkpoint:
             self._download_direct(checkpoint_storage, local_ckpt_dir)
 
         except (errors.NoDirectStorageAccess, FileNotFoundError):
-            if checkpoint_storage["type"] == "azure":
+            # The master serves the raw contents of storage, which for content-addressed
+            # storage are chunks and manifests rather than checkpoint files.
+            if checkpoint_storage["type"] == "azure" or checkpoint_storage.get("content_addressed"):
                 raise
 
             logger.info("Unable to download directly, proxying download through master")
@@ -278,7 +280,12 @@ class Checkpoint:
     def _download_direct(
         self, checkpoint_storage: Dict[str, Any], local_ckpt_dir: pathlib.Path
     ) -> None:
-        if checkpoint_storage["type"] == "shared_fs":
+        if checkpoint_storage.get("content_addressed"):
+            # Files must be reassembled from their chunks, whatever the storage type.
+            local_ckpt_dir.mkdir(parents=True, exist_ok=True)
+            manager = storage.build(checkpoint_storage, container_path=None)
+            manager.download(self.uuid, str(local_ckpt_dir))
+        elif checkpoint_storage["type"] == "shared_fs":
             src_ckpt_dir = self._find_shared_fs_path(checkpoint_storage)
             shutil.copytree(str(src_ckpt_dir), str(local_ckpt_dir), dirs_exist_ok=True)
         elif checkpoint_storage["type"] == "directory":
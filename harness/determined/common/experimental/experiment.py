@@ -517,6 +517,7 @@ class Experiment:
         resps = api.read_paginated(
             get_with_offset=get_with_offset,
             pages=api.PageOpts.single if max_results else api.PageOpts.all,
+            prefetch=4,
         )
 
         return [
@@ -248,6 +248,7 @@ class Trial:
         resps = api.read_paginated(
             get_with_offset=get_trial_checkpoints,
             pages=api.PageOpts.single if max_results else api.PageOpts.all,
+            prefetch=4,
         )
 
         return [
@@ -10,10 +10,12 @@ from determined.common.storage.gcs import GCSStorageManager
 from determined.common.storage.s3 import S3StorageManager
 from determined.common.storage.shared import SharedFSStorageManager
 from determined.common.storage.directory import DirectoryStorageManager
+from determined.common.storage.content_addressed import ContentAddressedStorageManager
 
 __all__ = [
     "AzureStorageManager",
     "CloudStorageManager",
+    "ContentAddressedStorageManager",
     "DirectoryStorageManager",
     "GCSStorageManager",
     "S3StorageManager",
@@ -58,6 +60,7 @@ def build(config: Dict[str, Any], container_path: Optional[str]) -> StorageManag
     config.pop("save_experiment_best", None)
     config.pop("save_trial_best", None)
     config.pop("save_trial_latest", None)
+    content_addressed = config.pop("content_addressed", False)
 
     # For shared_fs maintain backwards compatibility by folding old keys into
     # storage_path.
@@ -79,12 +82,16 @@ def build(config: Dict[str, Any], container_path: Optional[str]) -> StorageManag
     config.pop("checkpoint_path", None)
 
     try:
-        return subclass.from_config(config, container_path)
+        manager = subclass.from_config(config, container_path)
     except TypeError as e:
         raise TypeError(
             "Failed to instantiate {} checkpoint storage: {}".format(identifier, str(e))
         )
 
+    if content_addressed:
+        return ContentAddressedStorageManager(manager)
+    return manager
+
 
 def validate_manager(manager: StorageManager) -> None:
     """
@@ -1,7 +1,7 @@
 import logging
 import os
 import tempfile
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from determined import errors
 from determined.common import storage, util
@@ -17,7 +17,9 @@ class AzureStorageManager(storage.CloudStorageManager):
     Store and load checkpoints from Azure Blob Storage.
 
     Checkpoints are stored as a collection of Block Blobs,
-    with each block blob corresponding to one checkpoint resource.
+    with each block blob corresponding to one checkpoint resource.  Downloads are spread across
+    several threads, and large blobs are fetched as concurrent ranged requests, with at most
+    ``max_concurrency`` requests in flight.
     """
 
     def __init__(
@@ -27,12 +29,20 @@ class AzureStorageManager(storage.CloudStorageManager):
         account_url: Optional[str] = None,
         credential: Optional[str] = None,
         temp_dir: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
     ) -> None:
-        super().__init__(temp_dir if temp_dir is not None else tempfile.gettempdir())
+        super().__init__(
+            temp_dir if temp_dir is not None else tempfile.gettempdir(), max_concurrency
+        )
         from determined.common.storage import azure_client
 
         self.client = azure_client.AzureStorageClient(
-            container, connection_string, account_url, credential
+            container,
+            connection_string,
+            account_url,
+            credential,
+            # One connection per concurrent request, plus one for listing blobs.
+            max_connections=self.max_concurrency + 1,
         )
         self.container = container if not container.endswith("/") else container[:-1]
 
@@ -68,31 +78,39 @@ class AzureStorageManager(storage.CloudStorageManager):
     ) -> None:
         dst = os.fspath(dst)
         logger.info(f"Downloading {src} from Azure Blob Storage")
-        found = False
-        for blob in self.client.list_files(self.container, file_prefix=src):
-            found = True
-            relname = os.path.relpath(blob, src)
-            if blob.endswith("/"):
-                relname = os.path.join(relname, "")
-            if selector is not None and not selector(relname):
-                continue
-            _dst = os.path.join(dst, relname)
-            dst_dir = os.path.dirname(_dst)
-            os.makedirs(dst_dir, exist_ok=True)
-
-            # Only create empty directory for keys that end with "/".
-            if blob.endswith("/"):
-                os.makedirs(_dst, exist_ok=True)
-                continue
 
-            # Use posixpath so that we always use forward slashes, even on Windows.
-            container_blob = posixpath.join(self.container, blob)
-            blob_dir, blob_base = posixpath.split(container_blob)
-            self.client.get(blob_dir, blob_base, _dst)
+        def list_blobs() -> Iterator[Tuple[str, str]]:
+            for blob in self.client.iter_files(self.container, file_prefix=src):
+                relname = os.path.relpath(blob, src)
+                if blob.endswith("/"):
+                    relname = os.path.join(relname, "")
+                yield relname, blob
+
+        found = self._download_concurrently(list_blobs(), dst, self._fetch, selector)
 
         if not found:
             raise errors.CheckpointNotFound(f"Did not find checkpoint {src} in Azure Blob Storage")
 
+    def _fetch(self, blob: str, _dst: str) -> None:
+        # Use posixpath so that we always use forward slashes, even on Windows.
+        container_blob = posixpath.join(self.container, blob)
+        blob_dir, blob_base = posixpath.split(container_blob)
+        self.client.get(blob_dir, blob_base, _dst, max_concurrency=self._part_concurrency)
+
+    @util.preserve_random_state
+    def _exists(self, src: str, paths: Set[str]) -> Set[str]:
+        def exists(path: str) -> bool:
+            container_blob = posixpath.join(self.container, src, path)
+            blob_dir, blob_base = posixpath.split(container_blob)
+            return bool(self.client.exists(blob_dir, blob_base))
+
+        return self._exists_concurrently(paths, exists)
+
+    @util.preserve_random_state
+    def _download_paths(self, src: str, dst: Union[str, os.PathLike], paths: Set[str]) -> None:
+        listing = ((path, posixpath.join(src, path)) for path in sorted(paths))
+        self._download_concurrently(listing, os.fspath(dst), self._fetch)
+
     @util.preserve_random_state
     def delete(self, tgt: str, globs: List[str]) -> Dict[str, int]:
         storage_prefix = tgt
@@ -1,6 +1,6 @@
 import logging
 import pathlib
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 from determined.common import util
 
@@ -20,14 +20,19 @@ class AzureStorageClient(object):
         connection_string: Optional[str] = None,
         account_url: Optional[str] = None,
         credential: Optional[str] = None,
+        max_connections: Optional[int] = None,
     ) -> None:
         import azure.core.exceptions
         from azure.storage import blob
 
+        kwargs = {}
+        if max_connections is not None:
+            kwargs["transport"] = self._make_transport(max_connections)
+
         if connection_string:
-            self.client = blob.BlobServiceClient.from_connection_string(connection_string)
+            self.client = blob.BlobServiceClient.from_connection_string(connection_string, **kwargs)
         elif account_url:
-            self.client = blob.BlobServiceClient(account_url, credential)
+            self.client = blob.BlobServiceClient(account_url, credential, **kwargs)
         else:
             raise ValueError("Either 'connection_string' or 'account_url' must be specified.")
 
@@ -51,6 +56,23 @@ class AzureStorageClient(object):
                 logger.error(f"Failed while trying to create container {container}.")
                 raise e
 
+    @staticmethod
+    def _make_transport(max_connections: int) -> Any:
+        """Build the default requests transport with a connection pool of the given size."""
+        import requests
+        from azure.core.pipeline import transport
+        from urllib3.util import retry
+
+        session = requests.Session()
+        # Match the adapter azure-core mounts itself: its retry policy, not urllib3's, retries.
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=max_connections,
+            max_retries=retry.Retry(total=False, redirect=False, raise_on_status=False),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return transport.RequestsTransport(session=session, session_owner=False)
+
     @util.preserve_random_state
     def put(self, container_name: str, blob_name: str, filename: Union[str, pathlib.Path]) -> None:
         """Upload a file to the specified blob in the specified container."""
@@ -58,12 +80,30 @@ class AzureStorageClient(object):
             self.client.get_blob_client(container_name, blob_name).upload_blob(file, overwrite=True)
 
     @util.preserve_random_state
-    def get(self, container_name: str, blob_name: str, filename: str) -> None:
-        """Download the specified blob in the specified container to a file."""
+    def put_data(self, container_name: str, blob_name: str, data: bytes) -> None:
+        """Upload data to the specified blob in the specified container."""
+        self.client.get_blob_client(container_name, blob_name).upload_blob(data, overwrite=True)
+
+    @util.preserve_random_state
+    def get(
+        self, container_name: str, blob_name: str, filename: str, max_concurrency: int = 1
+    ) -> None:
+        """Download the specified blob in the specified container to a file.
+
+        Blobs too large for a single request are fetched as up to max_concurrency concurrent
+        ranged requests.
+        """
         with open(filename, "wb") as file:
-            stream = self.client.get_blob_client(container_name, blob_name).download_blob()
+            stream = self.client.get_blob_client(container_name, blob_name).download_blob(
+                max_concurrency=max_concurrency
+            )
             stream.readinto(file)
 
+    @util.preserve_random_state
+    def exists(self, container_name: str, blob_name: str) -> bool:
+        """Returns whether the specified blob exists in the specified container."""
+        return bool(self.client.get_blob_client(container_name, blob_name).exists())
+
     @util.preserve_random_state
     def delete_files(self, container_name: str, files: List[str]) -> None:
         """Deletes the specified files from the specified container."""
@@ -83,3 +123,13 @@ class AzureStorageClient(object):
             for blob in container.list_blobs(name_starts_with=file_prefix)
         }
         return files
+
+    def iter_files(
+        self, container_name: str, file_prefix: Optional[Union[str, pathlib.Path]] = None
+    ) -> Iterator[str]:
+        """Lazily yields the names of files within the specified container that have the
+        specified file prefix, fetching further pages of the listing only as needed.
+        """
+        container = self.client.get_container_client(container_name)
+        for blob in container.list_blobs(name_starts_with=file_prefix):
+            yield blob["name"]
@@ -8,7 +8,7 @@ import tempfile
 import urllib
 from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Union
 
-from determined import util
+from determined import errors, util
 from determined.common import storage
 
 # Paths should be a set of paths relative to the checkpoint root that indicate what paths
@@ -142,6 +142,42 @@ class StorageManager(metaclass=abc.ABCMeta):
         """
         pass
 
+    def _exists(self, src: str, paths: Set[str]) -> Set[str]:
+        """
+        Return the subset of ``paths``, relative to ``src``, which are present in storage.
+
+        This base implementation lists everything under ``src``.  Subclasses which can look up
+        individual objects should override it.
+        """
+        found = set()
+
+        def selector(path: str) -> bool:
+            if path in paths:
+                found.add(path)
+            return False
+
+        scratch = tempfile.mkdtemp()
+        try:
+            self.download(src, scratch, selector)
+        except errors.CheckpointNotFound:
+            pass
+        finally:
+            util.rmtree_nfs_safe(scratch, ignore_errors=True)
+        return found
+
+    def _download_paths(self, src: str, dst: Union[str, os.PathLike], paths: Set[str]) -> None:
+        """
+        Download exactly the files in ``paths``, relative to ``src``, into ``dst``.
+
+        This base implementation lists everything under ``src``.  Subclasses which can fetch
+        individual objects should override it.
+        """
+        dst = os.fspath(dst)
+        self.download(src, dst, paths.__contains__)
+        missing = [p for p in paths if not os.path.exists(os.path.join(dst, p))]
+        if missing:
+            raise errors.CheckpointNotFound(f"Did not find {missing[0]} in {src}")
+
     @staticmethod
     def _list_directory(root: Union[str, os.PathLike]) -> Dict[str, int]:
         """
@@ -1,13 +1,30 @@
+import concurrent.futures
 import contextlib
+import math
 import os
 import pathlib
-from typing import Iterator, Optional, Set, Union
+from typing import Callable, Iterable, Iterator, Optional, Set, Tuple, TypeVar, Union
 
 from determined import util
 from determined.common import storage
 
+DEFAULT_MAX_CONCURRENCY = 8
+
+T = TypeVar("T")
+
 
 class CloudStorageManager(storage.StorageManager):
+    def __init__(self, base_path: str, max_concurrency: Optional[int] = None) -> None:
+        super().__init__(base_path)
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, not {max_concurrency}")
+        self.max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        # Split the request budget between workers transferring separate objects and the ranged
+        # or multipart requests each worker may issue for one large object, so that no more than
+        # max_concurrency requests are ever in flight.
+        self._part_concurrency = math.isqrt(self.max_concurrency)
+        self._object_concurrency = self.max_concurrency // self._part_concurrency
+
     @contextlib.contextmanager
     def restore_path(
         self, src: str, selector: Optional[storage.Selector] = None
@@ -35,3 +52,74 @@ class CloudStorageManager(storage.StorageManager):
 
     def store_path_is_direct_access(self) -> bool:
         return False
+
+    def _exists_concurrently(self, paths: Set[str], exists: Callable[[str], bool]) -> Set[str]:
+        """
+        Return the subset of ``paths`` for which ``exists(path)`` is True, checking each path on a
+        pool of worker threads.
+        """
+        ordered = sorted(paths)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="storage-exists"
+        ) as pool:
+            return {p for p, found in zip(ordered, pool.map(exists, ordered)) if found}
+
+    def _download_concurrently(
+        self,
+        listing: Iterable[Tuple[str, T]],
+        dst: str,
+        fetch: Callable[[T, str], None],
+        selector: Optional[storage.Selector] = None,
+    ) -> bool:
+        """
+        Download objects with a pool of worker threads.
+
+        ``listing`` yields ``(relname, obj)`` pairs, where relname is the path relative to the
+        checkpoint root (ending in "/" for directory markers) and obj is passed to
+        ``fetch(obj, local_path)`` on a worker thread.  Fetches are submitted while the listing is
+        still being consumed, so paginated listings overlap with downloads.  Returns True if the
+        listing yielded anything at all.
+        """
+        found = False
+        created_dirs: Set[str] = set()
+        # Bound the number of queued fetches so a huge listing does not sit in memory.
+        max_pending = 2 * self._object_concurrency
+        pending: Set[concurrent.futures.Future] = set()
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._object_concurrency, thread_name_prefix="storage-download"
+        ) as pool:
+            try:
+                for relname, obj in listing:
+                    found = True
+                    if selector is not None and not selector(relname):
+                        continue
+
+                    _dst = os.path.join(dst, relname)
+                    # Only create empty directory for keys that end with "/".
+                    # See `upload` method of the subclasses for more context.
+                    is_dir = relname.endswith("/")
+                    dst_dir = os.path.normpath(_dst if is_dir else os.path.dirname(_dst))
+                    if dst_dir not in created_dirs:
+                        os.makedirs(dst_dir, exist_ok=True)
+                        created_dirs.add(dst_dir)
+                    if is_dir:
+                        continue
+
+                    if len(pending) >= max_pending:
+                        done, pending = concurrent.futures.wait(
+                            pending, return_when=concurrent.futures.FIRST_COMPLETED
+                        )
+                        for future in done:
+                            future.result()
+                    pending.add(pool.submit(fetch, obj, _dst))
+
+                for future in concurrent.futures.as_completed(pending):
+                    future.result()
+            except BaseException:
+                # Don't start any more downloads; the ones in flight are allowed to finish.
+                for future in pending:
+                    future.cancel()
+                raise
+
+        return found
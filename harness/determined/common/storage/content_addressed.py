@@ -0,0 +1,416 @@
+"""
+Content-addressed checkpoint storage.
+
+Checkpoint files are split into fixed-size chunks which are stored exactly once, named by their
+SHA-256 digest, in a chunk store shared by every checkpoint.  Each upload records which chunks
+make up which files in a manifest:
+
+    _manifests/<storage_id>/manifest.<upload_id>.json
+    _chunks/<digest[:2]>/<digest>
+
+Consecutive checkpoints of a model whose weights are mostly unchanged (frozen backbones, adapters,
+optimizer state of frozen parameters) then only upload the chunks that actually changed.
+
+Every upload writes its own manifest, so multiple ranks may upload shards of the same checkpoint.
+Chunks are reference counted by mark-and-sweep: deleting a checkpoint removes or rewrites its
+manifests, then every chunk not referenced by any remaining manifest is deleted.
+
+A sweep must never run while an upload is deciding which chunks it can reuse, so both take locks:
+
+    _locks/upload.<timestamp>.<lock_id>/lock.json
+    _locks/gc.<timestamp>.<lock_id>/lock.json
+
+An upload writes its lock, then waits for any garbage collection lock to disappear.  Garbage
+collection writes its lock, then gives up if any upload lock exists.  Whichever writes its lock
+last sees the other, so at most one of the two proceeds.  Locks older than ``LOCK_TIMEOUT`` were
+left behind by crashed processes and are ignored.
+
+Checkpoints stored before content addressing was enabled have no manifests; they are downloaded
+and deleted as plain files.
+"""
+import concurrent.futures
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import re
+import socket
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from determined import errors, util
+from determined.common import storage
+
+logger = logging.getLogger("determined.common.storage.content_addressed")
+
+MANIFESTS_DIR = "_manifests"
+CHUNKS_DIR = "_chunks"
+LOCKS_DIR = "_locks"
+MANIFEST_VERSION = 1
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+# Chunks are staged on local disk in batches of about this many bytes when uploading or
+# downloading.
+STAGING_BATCH_BYTES = 1024 * 1024 * 1024
+LOCK_TIMEOUT = 24 * 60 * 60
+LOCK_POLL_INTERVAL = 10.0
+
+_MANIFEST_RE = re.compile(r"^manifest\.[0-9a-f]+\.json$")
+
+Manifest = Dict[str, Any]
+
+
+def _chunk_path(digest: str) -> str:
+    return f"{digest[:2]}/{digest}"
+
+
+class ContentAddressedStorageManager(storage.CloudStorageManager):
+    """
+    Store checkpoints as deduplicated chunks in another storage manager.
+
+    Any storage backend can be wrapped; it only needs to support the basic upload, download and
+    delete operations.  Checkpoints written this way can only be read back through this class.
+    """
+
+    def __init__(
+        self,
+        inner: storage.StorageManager,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        temp_dir: Optional[str] = None,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, not {chunk_size}")
+        if temp_dir is None:
+            # Cloud managers already have a local scratch directory; a shared_fs base path is
+            # the storage itself and must not be used for scratch files.
+            if isinstance(inner, storage.CloudStorageManager):
+                temp_dir = inner._base_path
+            else:
+                temp_dir = tempfile.gettempdir()
+        max_concurrency = getattr(inner, "max_concurrency", None)
+        super().__init__(temp_dir, max_concurrency)
+        self.inner = inner
+        self.chunk_size = chunk_size
+        self._defer_collection = False
+
+    def _mkdtemp(self) -> str:
+        os.makedirs(self._base_path, exist_ok=True)
+        return tempfile.mkdtemp(dir=self._base_path)
+
+    def _hash_file(self, path: str) -> List[str]:
+        digests = []
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                digests.append(hashlib.sha256(chunk).hexdigest())
+        return digests
+
+    def _list(self, src: str) -> Set[str]:
+        """
+        Return the path of every file under ``src``.
+
+        StorageManager has no listing primitive, so this runs a download whose selector records
+        every path and selects none of them.
+        """
+        paths = set()
+
+        def selector(path: str) -> bool:
+            if not path.endswith("/"):
+                paths.add(path)
+            return False
+
+        scratch = self._mkdtemp()
+        try:
+            self.inner.download(src, scratch, selector)
+        except errors.CheckpointNotFound:
+            pass
+        finally:
+            util.rmtree_nfs_safe(scratch, ignore_errors=True)
+        return paths
+
+    def _list_chunks(self) -> Set[str]:
+        """
+        Return the digests of every chunk in the chunk store.
+        """
+        return {os.path.basename(path) for path in self._list(CHUNKS_DIR)}
+
+    def _read_manifests(self, src: str) -> Dict[str, Manifest]:
+        """
+        Return every manifest under ``src``, keyed by its path relative to ``src``.
+        """
+
+        def selector(path: str) -> bool:
+            return bool(_MANIFEST_RE.match(os.path.basename(path))) and ".." not in path
+
+        scratch = self._mkdtemp()
+        try:
+            try:
+                self.inner.download(src, scratch, selector)
+            except errors.CheckpointNotFound:
+                return {}
+            manifests = {}
+            for path in self._list_directory(scratch):
+                if path.endswith("/"):
+                    continue
+                with open(os.path.join(scratch, path)) as f:
+                    manifests[path] = json.load(f)
+            return manifests
+        finally:
+            util.rmtree_nfs_safe(scratch, ignore_errors=True)
+
+    def _write_json(self, dst: str, contents: Dict[str, Any]) -> None:
+        staging = self._mkdtemp()
+        try:
+            for name, content in contents.items():
+                path = os.path.join(staging, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w") as f:
+                    json.dump(content, f)
+            self.inner.upload(staging, dst, set(contents))
+        finally:
+            util.rmtree_nfs_safe(staging, ignore_errors=True)
+
+    def _list_locks(self, kind: str) -> List[str]:
+        """
+        Return the names of the live locks of one kind, deleting any stale ones.
+        """
+        live, stale = [], []
+        for name in {path.split("/")[0] for path in self._list(LOCKS_DIR)}:
+            lock_kind, _, rest = name.partition(".")
+            if lock_kind != kind:
+                continue
+            timestamp = rest.partition(".")[0]
+            if timestamp.isdigit() and time.time() - int(timestamp) < LOCK_TIMEOUT:
+                live.append(name)
+            else:
+                stale.append(name)
+        if stale:
+            logger.warning(f"Removing stale content-addressed storage locks: {stale}")
+            for name in stale:
+                self.inner.delete(f"{LOCKS_DIR}/{name}", ["**/*"])
+        return live
+
+    @contextlib.contextmanager
+    def _lock(self, kind: str) -> Iterator[None]:
+        # Each lock is a directory of its own, so deleting one never touches another that is
+        # being written concurrently.
+        name = f"{kind}.{int(time.time())}.{uuid.uuid4().hex}"
+        self._write_json(
+            f"{LOCKS_DIR}/{name}", {"lock.json": {"host": socket.gethostname(), "pid": os.getpid()}}
+        )
+        try:
+            yield
+        finally:
+            self.inner.delete(f"{LOCKS_DIR}/{name}", ["**/*"])
+
+    def upload(
+        self, src: Union[str, os.PathLike], dst: str, paths: Optional[storage.Paths] = None
+    ) -> None:
+        src = os.fspath(src)
+        if paths is None:
+            paths = set(self._list_directory(src))
+
+        dirs = sorted(p for p in paths if p.endswith("/"))
+        files = sorted(p for p in paths if not p.endswith("/"))
+
+        # hashlib releases the GIL for large buffers, so files are hashed in parallel.
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="checkpoint-hash"
+        ) as pool:
+            file_digests = dict(
+                zip(files, pool.map(lambda p: self._hash_file(os.path.join(src, p)), files))
+            )
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "chunk_size": self.chunk_size,
+            "dirs": dirs,
+            "files": {
+                p: {"size": os.path.getsize(os.path.join(src, p)), "chunks": file_digests[p]}
+                for p in files
+            },
+        }
+
+        with self._lock("upload"):
+            while self._list_locks("gc"):
+                logger.info("Waiting for garbage collection of unreferenced chunks to finish")
+                time.sleep(LOCK_POLL_INTERVAL)
+
+            wanted = {_chunk_path(d) for digests in file_digests.values() for d in digests}
+            existing = self.inner._exists(CHUNKS_DIR, wanted)
+            missing: Dict[str, Tuple[str, int]] = {}
+            for p in files:
+                for i, digest in enumerate(file_digests[p]):
+                    if _chunk_path(digest) not in existing and digest not in missing:
+                        missing[digest] = (p, i)
+
+            uploaded_bytes = 0
+            batch: List[str] = []
+            batch_bytes = 0
+            staging = self._mkdtemp()
+            try:
+                for digest, (p, i) in missing.items():
+                    with open(os.path.join(src, p), "rb") as f:
+                        f.seek(i * self.chunk_size)
+                        chunk = f.read(self.chunk_size)
+                    path = os.path.join(staging, _chunk_path(digest))
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, "wb") as f:
+                        f.write(chunk)
+                    batch.append(_chunk_path(digest))
+                    batch_bytes += len(chunk)
+                    if batch_bytes >= STAGING_BATCH_BYTES:
+                        self.inner.upload(staging, CHUNKS_DIR, set(batch))
+                        util.rmtree_nfs_safe(staging, ignore_errors=True)
+                        os.makedirs(staging)
+                        uploaded_bytes += batch_bytes
+                        batch, batch_bytes = [], 0
+                if batch:
+                    self.inner.upload(staging, CHUNKS_DIR, set(batch))
+                    uploaded_bytes += batch_bytes
+            finally:
+                util.rmtree_nfs_safe(staging, ignore_errors=True)
+
+            # Write the manifest last, so that it never references chunks which are not stored.
+            self._write_json(
+                f"{MANIFESTS_DIR}/{dst}", {f"manifest.{uuid.uuid4().hex}.json": manifest}
+            )
+
+        total = sum(len(digests) for digests in file_digests.values())
+        logger.info(
+            f"Uploaded {len(missing)} of {total} chunks ({uploaded_bytes / 1e6:.1f} MB) for {dst}"
+        )
+
+    def download(
+        self,
+        src: str,
+        dst: Union[str, os.PathLike],
+        selector: Optional[storage.Selector] = None,
+    ) -> None:
+        dst = os.fspath(dst)
+        manifests = self._read_manifests(f"{MANIFESTS_DIR}/{src}")
+        if not manifests:
+            self.inner.download(src, dst, selector)
+            return
+
+        dirs: Set[str] = set()
+        # Every place each chunk belongs, as (path, offset) pairs.  A chunk repeated within or
+        # across files is only downloaded once.
+        targets: Dict[str, List[Tuple[str, int]]] = {}
+        chunk_sizes: Dict[str, int] = {}
+        for manifest in manifests.values():
+            dirs.update(d for d in manifest["dirs"] if selector is None or selector(d))
+            for p, entry in manifest["files"].items():
+                if selector is not None and not selector(p):
+                    continue
+                path = os.path.join(dst, p)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.truncate(entry["size"])
+                for i, digest in enumerate(entry["chunks"]):
+                    targets.setdefault(digest, []).append((path, i * manifest["chunk_size"]))
+                    chunk_sizes[digest] = manifest["chunk_size"]
+
+        for d in dirs:
+            os.makedirs(os.path.join(dst, d), exist_ok=True)
+
+        # Chunks are written straight into place, so only one batch of them is ever staged.
+        batches: List[List[str]] = [[]]
+        batch_bytes = 0
+        for digest in targets:
+            if batch_bytes >= STAGING_BATCH_BYTES:
+                batches.append([])
+                batch_bytes = 0
+            batches[-1].append(digest)
+            batch_bytes += chunk_sizes[digest]
+
+        staging = self._mkdtemp()
+        try:
+            for batch in batches:
+                if not batch:
+                    continue
+                self.inner._download_paths(CHUNKS_DIR, staging, {_chunk_path(d) for d in batch})
+                for digest in batch:
+                    chunk_path = os.path.join(staging, _chunk_path(digest))
+                    with open(chunk_path, "rb") as f:
+                        chunk = f.read()
+                    for path, offset in targets[digest]:
+                        with open(path, "r+b") as out:
+                            out.seek(offset)
+                            out.write(chunk)
+                    os.remove(chunk_path)
+        finally:
+            util.rmtree_nfs_safe(staging, ignore_errors=True)
+
+    def delete(self, tgt: str, globs: List[str]) -> Dict[str, int]:
+        manifests = self._read_manifests(f"{MANIFESTS_DIR}/{tgt}")
+        if not manifests:
+            return self.inner.delete(tgt, globs)
+
+        resources: Dict[str, int] = {}
+        for manifest in manifests.values():
+            resources.update({d: 0 for d in manifest["dirs"]})
+            resources.update({p: entry["size"] for p, entry in manifest["files"].items()})
+
+        if "**/*" in globs:
+            remaining: Dict[str, int] = {}
+        else:
+            remaining = self._apply_globs_to_resources(resources, "", globs)
+
+        if not remaining:
+            self.inner.delete(f"{MANIFESTS_DIR}/{tgt}", ["**/*"])
+        elif len(remaining) < len(resources):
+            for manifest in manifests.values():
+                manifest["dirs"] = [d for d in manifest["dirs"] if d in remaining]
+                manifest["files"] = {
+                    p: entry for p, entry in manifest["files"].items() if p in remaining
+                }
+            self._write_json(f"{MANIFESTS_DIR}/{tgt}", manifests)
+
+        if not self._defer_collection:
+            self.collect_garbage()
+        return remaining
+
+    def collect_garbage(self) -> int:
+        """
+        Delete every chunk that is not referenced by any manifest and return how many were deleted.
+
+        Nothing is deleted while any upload is in progress; the unreferenced chunks are left for a
+        later collection instead.
+        """
+        with self._lock("gc"):
+            uploads = self._list_locks("upload")
+            if uploads:
+                logger.info(
+                    f"Skipping garbage collection of unreferenced chunks while {len(uploads)} "
+                    "uploads are in progress"
+                )
+                return 0
+
+            stored = self._list_chunks()
+            referenced: Set[str] = set()
+            for manifest in self._read_manifests(MANIFESTS_DIR).values():
+                for entry in manifest["files"].values():
+                    referenced.update(entry["chunks"])
+
+            garbage = sorted(stored - referenced)
+            if garbage:
+                self.inner.delete(CHUNKS_DIR, [_chunk_path(d) for d in garbage])
+            logger.info(f"Deleted {len(garbage)} unreferenced chunks of {len(stored)}")
+            return len(garbage)
+
+    @contextlib.contextmanager
+    def deferred_garbage_collection(self) -> Iterator[None]:
+        """
+        Collect unreferenced chunks once on exit, rather than after every delete() call inside.
+        """
+        self._defer_collection = True
+        try:
+            yield
+        finally:
+            self._defer_collection = False
+        self.collect_garbage()
@@ -1,8 +1,9 @@
 import logging
 import os
 import tempfile
-from typing import Dict, List, Optional, Union, no_type_check
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union, no_type_check
 
+import requests.adapters
 import requests.exceptions
 import urllib3.exceptions
 
@@ -11,6 +12,10 @@ from determined.common import storage, util
 
 logger = logging.getLogger("determined.common.storage.gcs")
 
+# Blobs larger than this are downloaded as concurrent ranged requests.
+RANGED_DOWNLOAD_THRESHOLD = 64 * 1024 * 1024
+RANGED_DOWNLOAD_CHUNK_SIZE = 32 * 1024 * 1024
+
 
 class GCSStorageManager(storage.CloudStorageManager):
     """
@@ -22,8 +27,9 @@ class GCSStorageManager(storage.CloudStorageManager):
 
     Batching is supported by the GCS API for deletion, however it is not used because
     of observed request failures. Batching is not used for uploading
-    or downloading files, because the GCS API does not support it. Upload/download
-    performance could be improved by using multiple clients in a multithreaded fashion.
+    or downloading files, because the GCS API does not support it. Instead, downloads are
+    spread across several threads, and large blobs are fetched as concurrent ranged requests,
+    with at most ``max_concurrency`` requests in flight.
 
     Authentication is currently only supported via the "Application
     Default Credentials" method in GCP [1]. Typical configuration:
@@ -37,8 +43,11 @@ class GCSStorageManager(storage.CloudStorageManager):
         bucket: str,
         prefix: Optional[str] = None,
         temp_dir: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
     ) -> None:
-        super().__init__(temp_dir if temp_dir is not None else tempfile.gettempdir())
+        super().__init__(
+            temp_dir if temp_dir is not None else tempfile.gettempdir(), max_concurrency
+        )
         import google.cloud.storage
         from google.auth import exceptions as auth_exceptions
 
@@ -48,6 +57,13 @@ class GCSStorageManager(storage.CloudStorageManager):
         except auth_exceptions.GoogleAuthError as e:
             raise errors.NoDirectStorageAccess("Unable to access cloud checkpoint storage") from e
 
+        # Every download thread shares the client's session; make room in its connection pool for
+        # all concurrent requests, plus one for listing blobs.
+        self.client._http.mount(
+            "https://",
+            requests.adapters.HTTPAdapter(pool_maxsize=self.max_concurrency + 1),
+        )
+
         self.bucket = self.client.bucket(bucket)
         self.prefix = storage.normalize_prefix(prefix)
 
@@ -102,34 +118,19 @@ class GCSStorageManager(storage.CloudStorageManager):
         dst = os.fspath(dst)
         path = self.get_storage_prefix(src)
         logger.info(f"Downloading {path} from GCS")
-        found = False
 
         # Listing blobs with prefix set and no delimiter is equivalent to a recursive listing.  If
         # you include a `delimiter="/"` you will get only the file-like blobs inside of a
         # directory-like blob.
-        try:
+        def list_blobs() -> Iterator[Tuple[str, Any]]:
             for blob in self.bucket.list_blobs(prefix=path):
-                found = True
                 relname = os.path.relpath(blob.name, path)
                 if blob.name.endswith("/"):
                     relname = os.path.join(relname, "")
-                if selector is not None and not selector(relname):
-                    continue
-                _dst = os.path.join(dst, relname)
-                dst_dir = os.path.dirname(_dst)
-                if not os.path.exists(dst_dir):
-                    os.makedirs(dst_dir, exist_ok=True)
-
-                # Only create empty directory for keys that end with "/".
-                # See `upload` method for more context.
-                if blob.name.endswith("/"):
-                    os.makedirs(_dst, exist_ok=True)
-                    continue
-
-                logger.debug(f"Downloading from GCS: {blob.name}")
-
-                blob.download_to_filename(_dst)
+                yield relname, blob
 
+        try:
+            found = self._download_concurrently(list_blobs(), dst, self._fetch, selector)
         except (
             auth_exceptions.GoogleAuthError,
             api_exceptions.Unauthorized,
@@ -140,6 +141,42 @@ class GCSStorageManager(storage.CloudStorageManager):
         if not found:
             raise errors.CheckpointNotFound(f"Did not find checkpoint {path} in GCS")
 
+    def _fetch(self, blob: Any, _dst: str) -> None:
+        logger.debug(f"Downloading from GCS: {blob.name}")
+
+        if blob.size is not None and blob.size > RANGED_DOWNLOAD_THRESHOLD:
+            try:
+                from google.cloud.storage import transfer_manager
+
+                download_chunks = transfer_manager.download_chunks_concurrently
+            except (ImportError, AttributeError):
+                # Older releases of google-cloud-storage do not support ranged downloads.
+                pass
+            else:
+                download_chunks(
+                    blob,
+                    _dst,
+                    chunk_size=RANGED_DOWNLOAD_CHUNK_SIZE,
+                    worker_type=transfer_manager.THREAD,
+                    max_workers=self._part_concurrency,
+                )
+                return
+
+        blob.download_to_filename(_dst)
+
+    @util.preserve_random_state
+    def _exists(self, src: str, paths: Set[str]) -> Set[str]:
+        prefix = self.get_storage_prefix(src)
+        return self._exists_concurrently(
+            paths, lambda path: bool(self.bucket.blob(f"{prefix}/{path}").exists())
+        )
+
+    @util.preserve_random_state
+    def _download_paths(self, src: str, dst: Union[str, os.PathLike], paths: Set[str]) -> None:
+        prefix = self.get_storage_prefix(src)
+        listing = ((path, self.bucket.blob(f"{prefix}/{path}")) for path in sorted(paths))
+        self._download_concurrently(listing, os.fspath(dst), self._fetch)
+
     @util.preserve_random_state
     def delete(self, storage_id: str, globs: List[str]) -> Dict[str, int]:
         prefix = self.get_storage_prefix(storage_id)
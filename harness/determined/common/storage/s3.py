@@ -1,7 +1,9 @@
+import concurrent.futures
 import logging
 import os
 import tempfile
-from typing import Dict, List, Optional, Union
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import requests
 
@@ -10,10 +12,16 @@ from determined.common import storage, util
 
 logger = logging.getLogger("determined.common.storage.s3")
 
+DEFAULT_MULTIPART_CHUNKSIZE = 64 * 1024 * 1024
+
 
 class S3StorageManager(storage.CloudStorageManager):
     """
     Store and load checkpoints from S3.
+
+    Uploads and downloads are spread across a pool of threads.  Files larger than
+    ``multipart_chunksize`` bytes are transferred as multipart uploads or ranged downloads, with
+    parts of that size.  At most ``max_concurrency`` requests are in flight at once.
     """
 
     def __init__(
@@ -24,9 +32,15 @@ class S3StorageManager(storage.CloudStorageManager):
         endpoint_url: Optional[str] = None,
         prefix: Optional[str] = None,
         temp_dir: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        multipart_chunksize: Optional[int] = None,
     ) -> None:
-        super().__init__(temp_dir if temp_dir is not None else tempfile.gettempdir())
+        super().__init__(
+            temp_dir if temp_dir is not None else tempfile.gettempdir(), max_concurrency
+        )
         import boto3
+        from boto3.s3 import transfer
+        from botocore import config
 
         from determined.common.storage import boto3_credential_manager
 
@@ -37,8 +51,24 @@ class S3StorageManager(storage.CloudStorageManager):
             endpoint_url=endpoint_url,
             aws_access_key_id=access_key,
             aws_secret_access_key=secret_key,
+            # One connection per concurrent transfer request, plus one for listing objects.
+            config=config.Config(max_pool_connections=self.max_concurrency + 1),
         )
         self.bucket = self.s3.Bucket(self.bucket_name)
+        # boto3 resources are not thread-safe, but clients are; worker threads use the client.
+        self.client = self.s3.meta.client
+
+        if multipart_chunksize is not None and multipart_chunksize < 5 * 1024 * 1024:
+            # S3 rejects multipart uploads with parts smaller than 5MiB.
+            raise ValueError(
+                f"multipart_chunksize must be at least 5MiB, not {multipart_chunksize} bytes"
+            )
+        chunksize = multipart_chunksize or DEFAULT_MULTIPART_CHUNKSIZE
+        self._transfer_config = transfer.TransferConfig(
+            multipart_threshold=chunksize,
+            multipart_chunksize=chunksize,
+            max_concurrency=self._part_concurrency,
+        )
 
         self.prefix = storage.normalize_prefix(prefix)
 
@@ -69,25 +99,53 @@ class S3StorageManager(storage.CloudStorageManager):
         prefix = self.get_storage_prefix(dst)
         logger.info(f"Uploading to s3: prefix={prefix}")
         upload_paths = paths if paths is not None else self._list_directory(src)
-        for rel_path in sorted(upload_paths):
-            key_name = f"{prefix}/{rel_path}"
-            logger.debug(f"Uploading {rel_path} to s3://{self.bucket_name}/{key_name}")
-
-            if rel_path.endswith("/"):
-                # Create empty S3 keys for each subdirectory to mimic what the S3 console does to
-                # represent empty directories.
-                if not self._use_minio_workaround:
-                    self.bucket.put_object(Key=key_name, Body=b"")
-                else:
-                    # boto3 will puke on the following MinIO response if you ever create a
-                    # directory by uploading an empty blob.  Uploading a normal file in the
-                    # directory and then deleting it seems to cause MinIO to prune the empty
-                    # directory.  The AWS authentication scheme is complex and not worth the
-                    # effort for supporting empty directories, so... just ignore empty directories.
-                    pass
+
+        start = time.time()
+        total_bytes = 0
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._object_concurrency, thread_name_prefix="s3-upload"
+        ) as pool:
+            futures = [
+                pool.submit(self._upload_one, src, prefix, rel_path)
+                for rel_path in sorted(upload_paths)
+            ]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    total_bytes += future.result()
+            except BaseException:
+                # Don't start any more uploads; the ones in flight are allowed to finish.
+                for future in futures:
+                    future.cancel()
+                raise
+
+        elapsed = max(time.time() - start, 1e-6)
+        logger.info(
+            f"Uploaded {len(futures)} objects ({total_bytes / 1e6:.1f} MB) to s3 in "
+            f"{elapsed:.1f}s ({total_bytes / 1e6 / elapsed:.1f} MB/s)"
+        )
+
+    def _upload_one(self, src: str, prefix: str, rel_path: str) -> int:
+        """Upload a single path and return the number of bytes uploaded."""
+        key_name = f"{prefix}/{rel_path}"
+        logger.debug(f"Uploading {rel_path} to s3://{self.bucket_name}/{key_name}")
+
+        if rel_path.endswith("/"):
+            # Create empty S3 keys for each subdirectory to mimic what the S3 console does to
+            # represent empty directories.
+            if not self._use_minio_workaround:
+                self.client.put_object(Bucket=self.bucket_name, Key=key_name, Body=b"")
             else:
-                abs_path = os.path.join(src, rel_path)
-                self.bucket.upload_file(abs_path, key_name)
+                # boto3 will puke on the following MinIO response if you ever create a
+                # directory by uploading an empty blob.  Uploading a normal file in the
+                # directory and then deleting it seems to cause MinIO to prune the empty
+                # directory.  The AWS authentication scheme is complex and not worth the
+                # effort for supporting empty directories, so... just ignore empty directories.
+                pass
+            return 0
+
+        abs_path = os.path.join(src, rel_path)
+        self.client.upload_file(abs_path, self.bucket_name, key_name, Config=self._transfer_config)
+        return os.path.getsize(abs_path)
 
     @util.preserve_random_state
     def download(
@@ -101,31 +159,16 @@ class S3StorageManager(storage.CloudStorageManager):
         dst = os.fspath(dst)
         prefix = self.get_storage_prefix(src)
         logger.info(f"Downloading {prefix} from S3")
-        found = False
 
-        try:
+        def list_objects() -> Iterator[Tuple[str, str]]:
             for obj in self.bucket.objects.filter(Prefix=prefix):
-                found = True
                 relname = os.path.relpath(obj.key, prefix)
                 if obj.key.endswith("/"):
                     relname = os.path.join(relname, "")
+                yield relname, obj.key
 
-                if selector is not None and not selector(relname):
-                    continue
-                _dst = os.path.join(dst, relname)
-                dst_dir = os.path.dirname(_dst)
-                os.makedirs(dst_dir, exist_ok=True)
-
-                logger.debug(f"Downloading s3://{self.bucket_name}/{obj.key} to {_dst}")
-
-                # Only create empty directory for keys that end with "/".
-                # See `upload` method for more context.
-                if obj.key.endswith("/"):
-                    os.makedirs(_dst, exist_ok=True)
-                    continue
-
-                self.bucket.download_file(obj.key, _dst)
-
+        try:
+            found = self._download_concurrently(list_objects(), dst, self._fetch, selector)
         except botocore.exceptions.ClientError as e:
             if e.response["Error"]["Code"] == "AccessDenied":
                 raise errors.NoDirectStorageAccess(
@@ -139,6 +182,33 @@ class S3StorageManager(storage.CloudStorageManager):
         if not found:
             raise errors.CheckpointNotFound(f"Did not find {prefix} in S3")
 
+    def _fetch(self, key: str, _dst: str) -> None:
+        logger.debug(f"Downloading s3://{self.bucket_name}/{key} to {_dst}")
+        self.client.download_file(self.bucket_name, key, _dst, Config=self._transfer_config)
+
+    @util.preserve_random_state
+    def _exists(self, src: str, paths: Set[str]) -> Set[str]:
+        import botocore
+
+        prefix = self.get_storage_prefix(src)
+
+        def exists(path: str) -> bool:
+            try:
+                self.client.head_object(Bucket=self.bucket_name, Key=f"{prefix}/{path}")
+            except botocore.exceptions.ClientError as e:
+                if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                    return False
+                raise
+            return True
+
+        return self._exists_concurrently(paths, exists)
+
+    @util.preserve_random_state
+    def _download_paths(self, src: str, dst: Union[str, os.PathLike], paths: Set[str]) -> None:
+        prefix = self.get_storage_prefix(src)
+        listing = ((path, f"{prefix}/{path}") for path in sorted(paths))
+        self._download_concurrently(listing, os.fspath(dst), self._fetch)
+
     @util.preserve_random_state
     def delete(self, tgt: str, globs: List[str]) -> Dict[str, int]:
         prefix = self.get_storage_prefix(tgt)
@@ -1,3 +1,4 @@
+import concurrent.futures
 import contextlib
 import glob
 import logging
@@ -5,7 +6,7 @@ import os
 import pathlib
 import shutil
 import urllib
-from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from determined import errors, util
 from determined.common import check, storage
@@ -13,9 +14,56 @@ from determined.common import check, storage
 logger = logging.getLogger("determined.common.storage.shared")
 
 
+try:
+    import fcntl
+except ImportError:  # Windows.
+    fcntl = None  # type: ignore
+
+# ioctl(2) request which makes a file share the extents of another on copy-on-write filesystems.
+_FICLONE = 0x40049409
+
+# Number of files copied at once; parallel copies keep network filesystems busy.
+COPY_CONCURRENCY = 8
+
+
+def _reflink(fsrc: int, fdst: int) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(fdst, _FICLONE, fsrc)
+    except OSError:
+        return False
+    return True
+
+
+def _copy_file(src: str, dst: str) -> None:
+    """
+    Copy a file's contents and metadata like shutil.copy2, but without passing the contents
+    through userspace where possible: first as a reflink on copy-on-write filesystems, then with
+    copy_file_range(2), which NFSv4.2 and Lustre servers can perform without the client reading
+    the data.  Anything else falls back to shutil.copyfile.
+    """
+    try:
+        if not hasattr(os, "copy_file_range"):
+            raise OSError("copy_file_range is not supported on this platform")
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            if not _reflink(fsrc.fileno(), fdst.fileno()):
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+    except OSError:
+        # Cross-device copies on older kernels, filesystems without support, and so on.
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
 # Based on shutil.copytree and shutil._copytree (for Python 3.8). Compared to the original
 # implementation this code delays creating new directories during traversal, such that dir
 # is created only when (1) selector(dir)==True or (2) selector(dir/subdir/path)==True.
+# Files are not copied during traversal; they are collected and then copied in parallel.
 # The code is simplified to rely on default values for:
 # symlinks=False,
 # ignore=None,
@@ -30,8 +78,10 @@ def _copytree(
     dst: str,
     selector: Optional[Callable[[str], bool]],
     src_root: str,
-) -> str:
-    errors = []
+    copies: List[Tuple[str, str]],
+    copied_dirs: List[Tuple[str, str]],
+    errors: List[Tuple[str, str, str]],
+) -> None:
     have_copied = False
     for srcobj in entries:
         srcname = os.path.join(src, srcobj.name)
@@ -46,11 +96,17 @@ def _copytree(
                 if selector is None or selector(src_relpath + "/"):
                     os.makedirs(dstname, exist_ok=True)
                     have_copied = True
-                copytree(
-                    srcobj,
+                with os.scandir(srcobj) as itr:
+                    sub_entries = list(itr)
+                _copytree(
+                    sub_entries,
+                    srcname,
                     dstname,
                     selector,
                     src_root,
+                    copies,
+                    copied_dirs,
+                    errors,
                 )
             else:
                 # If selector is None all files are copied; if selector is not None
@@ -60,23 +116,11 @@ def _copytree(
                 if selector is None or selector(src_relpath):
                     have_copied = True
                     os.makedirs(dst, exist_ok=True)
-                    shutil.copy2(srcobj, dstname)
-        # catch the Error from the recursive copytree so that we can
-        # continue with other files
-        except shutil.Error as err:
-            errors.extend(err.args[0])
+                    copies.append((srcname, dstname))
         except OSError as why:
             errors.append((srcname, dstname, str(why)))
     if have_copied:
-        try:
-            shutil.copystat(src, dst)
-        except OSError as why:
-            # Copying file access times may fail on Windows
-            if getattr(why, "winerror", None) is None:
-                errors.append((src, dst, str(why)))
-    if errors:
-        raise shutil.Error(errors)
-    return dst
+        copied_dirs.append((src, dst))
 
 
 def copytree(
@@ -84,19 +128,51 @@ def copytree(
     dst: str,
     selector: Optional[Callable[[str], bool]] = None,
     src_root: Optional[str] = None,
+    max_workers: int = COPY_CONCURRENCY,
 ) -> str:
     if src_root is None:
         src_root = src
     with os.scandir(src) as itr:
         entries = list(itr)
-    return _copytree(
+
+    copies: List[Tuple[str, str]] = []
+    copied_dirs: List[Tuple[str, str]] = []
+    errors: List[Tuple[str, str, str]] = []
+    _copytree(
         entries=entries,
         src=src,
         dst=dst,
         selector=selector,
         src_root=src_root,
+        copies=copies,
+        copied_dirs=copied_dirs,
+        errors=errors,
     )
 
+    def copy(srcname: str, dstname: str) -> Optional[Tuple[str, str, str]]:
+        try:
+            _copy_file(srcname, dstname)
+        except OSError as why:
+            return (srcname, dstname, str(why))
+        return None
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="shared-fs-copy"
+    ) as pool:
+        errors.extend(e for e in pool.map(lambda c: copy(*c), copies) if e is not None)
+
+    # Copying files into a directory changes its timestamps, so directories are done last.
+    for srcname, dstname in copied_dirs:
+        try:
+            shutil.copystat(srcname, dstname)
+        except OSError as why:
+            # Copying file access times may fail on Windows
+            if getattr(why, "winerror", None) is None:
+                errors.append((srcname, dstname, str(why)))
+    if errors:
+        raise shutil.Error(errors)
+    return dst
+
 
 def _shortcut_to_config(shortcut: str, on_cluster: bool = True) -> Dict[str, Any]:
     p: urllib.parse.ParseResult = urllib.parse.urlparse(shortcut)
@@ -285,3 +361,19 @@ class SharedFSStorageManager(storage.StorageManager):
             raise errors.CheckpointNotFound(
                 f"Did not find checkpoint {src} in shared_fs storage"
             ) from None
+
+    def _exists(self, src: str, paths: Set[str]) -> Set[str]:
+        src = os.path.join(self._base_path, src)
+        return {p for p in paths if os.path.exists(os.path.join(src, p))}
+
+    def _download_paths(self, src: str, dst: Union[str, os.PathLike], paths: Set[str]) -> None:
+        dst = os.fspath(dst)
+        src = os.path.join(self._base_path, src)
+        for path in paths:
+            os.makedirs(os.path.dirname(os.path.join(dst, path)), exist_ok=True)
+            try:
+                _copy_file(os.path.join(src, path), os.path.join(dst, path))
+            except FileNotFoundError:
+                raise errors.CheckpointNotFound(
+                    f"Did not find {path} in {src} in shared_fs storage"
+                ) from None
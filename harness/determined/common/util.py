@@ -8,6 +8,7 @@ import platform
 import random
 import re
 import sys
+import threading
 import time
 import warnings
 from typing import (
@@ -88,10 +89,17 @@ def debug_mode() -> bool:
 
 
 def preserve_random_state(fn: Callable) -> Callable:
-    """A decorator to run a function with a fork of the random state."""
+    """A decorator to run a function with a fork of the random state.
+
+    Only the main thread forks the random state.  Restoring it from a background thread (such as
+    an asynchronous checkpoint upload) would rewind whatever progress the main thread made in the
+    meantime.
+    """
 
     @functools.wraps(fn)
     def wrapped(*arg: Any, **kwarg: Any) -> Any:
+        if threading.current_thread() is not threading.main_thread():
+            return fn(*arg, **kwarg)
         state = random.getstate()
         try:
             return fn(*arg, **kwarg)
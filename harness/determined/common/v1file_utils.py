@@ -1,7 +1,8 @@
 import base64
+import os
 import pathlib
 import tarfile
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from determined.common.api import bindings
 
@@ -28,10 +29,13 @@ def v1File_to_dict(f: bindings.v1File) -> Dict[str, Any]:
     return d
 
 
-def v1File_from_local_file(archive_path: str, path: pathlib.Path) -> bindings.v1File:
+def v1File_from_local_file(
+    archive_path: str, path: pathlib.Path, st: Optional[os.stat_result] = None
+) -> bindings.v1File:
     with path.open("rb") as f:
         content = base64.b64encode(f.read()).decode("utf8")
-    st = path.stat()
+    if st is None:
+        st = path.stat()
     return bindings.v1File(
         path=archive_path,
         type=ord(tarfile.REGTYPE),
@@ -1,3 +1,4 @@
+import concurrent.futures
 import contextlib
 import datetime
 import enum
@@ -6,15 +7,55 @@ import json
 import logging
 import os
 import pathlib
+import socket
+import threading
 import uuid
-from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    overload,
+)
 
 from determined import core, tensorboard
 from determined.common import api, storage
 from determined.common.api import bindings
+from determined.common.storage import shared
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 logger = logging.getLogger("determined.core")
 
+# Conflicting checkpoint files are hashed in blocks of this size, never read whole into memory.
+_HASH_BLOCK_SIZE = 4 * 1024 * 1024
+_MAX_HASH_THREADS = 8
+
+
+def _hash_file(path: str, fast: bool = False) -> str:
+    """
+    Hash a file in fixed-size blocks, with xxh3 if ``fast`` is set or md5 otherwise.
+    """
+    h = xxhash.xxh3_128() if fast else hashlib.md5()
+    buf = bytearray(_HASH_BLOCK_SIZE)
+    view = memoryview(buf)
+    with open(path, "rb") as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+    return str(h.hexdigest())
+
 
 class DownloadMode(enum.Enum):
     """
@@ -168,6 +209,64 @@ def merge_resources(
     return merged, conflicts
 
 
+class _AsyncUploader:
+    """
+    Runs checkpoint uploads on a single background thread, in the order they were submitted.
+
+    At most ``max_in_flight`` uploads may be queued or running at once; ``submit()`` blocks until a
+    slot frees up, which bounds the disk space consumed by staged checkpoints.
+
+    The first failed upload is re-raised from the next call to ``submit()`` or ``close()``, so a
+    failure is never silently dropped even if nobody waits on its future.
+    """
+
+    def __init__(self, max_in_flight: int) -> None:
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, not {max_in_flight}")
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="checkpoint-upload"
+        )
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._error = None  # type: Optional[BaseException]
+
+    def _raise_error(self) -> None:
+        with self._lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise RuntimeError("an asynchronous checkpoint upload failed") from error
+
+    def submit(self, storage_id: str, fn: Callable[[], None]) -> "concurrent.futures.Future[str]":
+        def run() -> str:
+            fn()
+            return storage_id
+
+        def done(future: "concurrent.futures.Future[str]") -> None:
+            self._slots.release()
+            if not future.cancelled() and future.exception() is not None:
+                logger.error(
+                    f"asynchronous upload of checkpoint {storage_id} failed",
+                    exc_info=future.exception(),
+                )
+                with self._lock:
+                    if self._error is None:
+                        self._error = future.exception()
+
+        self._raise_error()
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(run)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(done)
+        return future
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._raise_error()
+
+
 class CheckpointContext:
     """
     ``CheckpointContext`` gives access to checkpoint-related features of a Determined cluster.
@@ -183,6 +282,7 @@ class CheckpointContext:
         tbd_sync_mode: core.TensorboardMode,
         tensorboard_manager: Optional[tensorboard.TensorboardManager],
         storage_backend_id: Optional[int],
+        max_async_uploads: int = 2,
     ) -> None:
         self._dist = dist
         self._storage_manager = storage_manager
@@ -194,7 +294,11 @@ class CheckpointContext:
         if tbd_sync_mode != core.TensorboardMode.MANUAL and tensorboard_manager is None:
             raise ValueError("either set TensorboardMode.MANUAL, or pass a tensorboard manager.")
         self._tensorboard_manager = tensorboard_manager
+        self._max_async_uploads = max_async_uploads
+        self._async_uploader = None  # type: Optional[_AsyncUploader]
+        self.last_async_upload = None  # type: Optional[concurrent.futures.Future[str]]
 
+    @overload
     def upload(
         self,
         ckpt_dir: Optional[Union[str, os.PathLike]],
@@ -202,7 +306,31 @@ class CheckpointContext:
         *,
         shard: bool = False,
         selector: Optional[Callable[[str], bool]] = None,
+        async_: Literal[False] = False,
     ) -> str:
+        ...
+
+    @overload
+    def upload(
+        self,
+        ckpt_dir: Optional[Union[str, os.PathLike]],
+        metadata: Optional[Dict[str, Any]] = None,
+        *,
+        shard: bool = False,
+        selector: Optional[Callable[[str], bool]] = None,
+        async_: Literal[True],
+    ) -> "concurrent.futures.Future[str]":
+        ...
+
+    def upload(
+        self,
+        ckpt_dir: Optional[Union[str, os.PathLike]],
+        metadata: Optional[Dict[str, Any]] = None,
+        *,
+        shard: bool = False,
+        selector: Optional[Callable[[str], bool]] = None,
+        async_: bool = False,
+    ) -> Union[str, "concurrent.futures.Future[str]"]:
         """
         ``upload()`` chooses a random ``storage_id``, then uploads the contents of ``ckpt_dir`` to
         checkpoint storage into a directory by the name of the ``storage_id``.  The name of the
@@ -218,7 +346,19 @@ class CheckpointContext:
         Each worker may optionally provide a ``selector`` that accepts a path
         relative to the checkpoint root, and returns True for paths that should be uploaded.
 
-        Returns:  The ``storage_id`` for this checkpoint.
+        When ``async_=True`` (only supported with ``shard=False``), the contents of ``ckpt_dir``
+        are first copied to a staging directory, after which ``upload()`` returns immediately and
+        the upload happens on a background thread.  The checkpoint is reported to the master only
+        once the upload completes.  ``ckpt_dir`` may be modified or deleted as soon as
+        ``upload()`` returns.  If too many uploads are already in progress, ``upload()`` blocks
+        until one of them finishes.  If an earlier asynchronous upload failed, its error is raised
+        from the next ``upload()`` or ``store_path()`` call, or when the ``core.Context`` closes.
+        Background uploads do not preserve the global ``random`` state, which some storage
+        clients advance; seed any random state you need to reproduce before calling ``upload()``.
+
+        Returns:  The ``storage_id`` for this checkpoint, or when ``async_=True``, a
+        ``concurrent.futures.Future`` which resolves to the ``storage_id`` after the upload
+        completes.
 
         Example:
 
@@ -244,8 +384,12 @@ class CheckpointContext:
                     "cannot call .upload(ckpt_dir=None, shard=False), which would result in doing "
                     "nothing at all"
                 )
+            if async_:
+                return self._upload_single_async(ckpt_dir, metadata, selector=selector)
             return self._upload_single(ckpt_dir, metadata, selector=selector)
         else:
+            if async_:
+                raise ValueError("cannot call .upload(shard=True, async_=True)")
             storage_id = None
             if self._dist.rank == 0:
                 storage_id = str(uuid.uuid4())
@@ -279,6 +423,55 @@ class CheckpointContext:
         self._report_checkpoint(storage_id, resources, metadata)
         return storage_id
 
+    def _upload_single_async(
+        self,
+        ckpt_dir: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        *,
+        selector: Optional[Callable[[str], bool]] = None,
+    ) -> "concurrent.futures.Future[str]":
+        logger.debug(
+            f"Asynchronously uploading content from checkpoint directory {ckpt_dir} to storage "
+            f"(metadata={metadata})"
+        )
+        self._validate_metadata(metadata)
+        storage_id = str(uuid.uuid4())
+        # Write metadata first so we get it in resources.
+        self._write_metadata_file(ckpt_dir, metadata or {})
+        resources = self._storage_manager._list_directory(ckpt_dir)
+
+        paths = None
+        if selector is not None:
+            resources = {key: resources[key] for key in resources if selector(key)}
+            paths = set(resources)
+
+        # Snapshot the checkpoint into the same staging directory that store_path() would use, so
+        # the caller is free to reuse ckpt_dir while the upload is in progress.
+        staging_dir = self._storage_manager.pre_store_path(storage_id)
+        shared.copytree(
+            ckpt_dir, os.fspath(staging_dir), selector=None if paths is None else paths.__contains__
+        )
+
+        def upload() -> None:
+            self._storage_manager.post_store_path(src=staging_dir, dst=storage_id, paths=paths)
+            self._report_checkpoint(storage_id, resources, metadata)
+
+        return self._submit_async_upload(storage_id, upload)
+
+    def _submit_async_upload(
+        self, storage_id: str, fn: Callable[[], None]
+    ) -> "concurrent.futures.Future[str]":
+        if self._async_uploader is None:
+            self._async_uploader = _AsyncUploader(self._max_async_uploads)
+        self.last_async_upload = self._async_uploader.submit(storage_id, fn)
+        return self.last_async_upload
+
+    def _close(self) -> None:
+        """Wait for any asynchronous uploads to finish, raising if any of them failed."""
+        uploader, self._async_uploader = self._async_uploader, None
+        if uploader is not None:
+            uploader.close()
+
     def _upload_sharded(
         self,
         ckpt_dir: Optional[str],
@@ -355,31 +548,59 @@ class CheckpointContext:
     def _resolve_conflicts(
         self, resources: Dict[str, int], conflicts: Dict[str, List[int]], ckpt_dir: Optional[str]
     ) -> Dict[str, int]:
-        all_conflicts = conflicts.copy()
+        mine = sorted(fname for fname, ranks in conflicts.items() if self._dist.rank in ranks)
 
-        # Make sure each rank processes files in the same order.
-        for fname in sorted(conflicts):
-            ranks = conflicts[fname]
-            if self._dist.rank in ranks:
-                assert ckpt_dir
-                fpath = os.path.join(ckpt_dir, fname)
-                if os.path.isdir(fpath):
-                    # If rankA uploads a directory and rankB uploads a file with the same name,
-                    # there is an unresolvable conflict. Emit a non-md5sum, non-None object
-                    # to guarantee the fname is kept in the all_conflicts list.
-                    md5 = "this is a directory"
-                else:
-                    with open(fpath, "rb") as f:
-                        md5 = hashlib.md5(f.read()).hexdigest()
-                md5_ranks = self._dist.allgather(md5)
+        # First pass: cheap stat fingerprints.  Files of different sizes conflict without being
+        # read, and ranks seeing the very same file (e.g. on a shared filesystem) need no hashing.
+        fingerprints: Dict[str, Optional[Tuple]] = {}
+        for fname in mine:
+            assert ckpt_dir
+            fpath = os.path.join(ckpt_dir, fname)
+            if os.path.isdir(fpath):
+                # If rankA uploads a directory and rankB uploads a file with the same name,
+                # there is an unresolvable conflict.
+                fingerprints[fname] = None
             else:
-                md5_ranks = self._dist.allgather(None)
-
-            md5_ranks_filtered = {x for x in md5_ranks if x is not None}
-
-            if len(md5_ranks_filtered) == 1:
-                # All files have the same md5 checksum, which means there is no conflict.
-                all_conflicts.pop(fname)
+                st = os.stat(fpath)
+                fingerprints[fname] = (
+                    st.st_size,
+                    socket.gethostname(),
+                    st.st_dev,
+                    st.st_ino,
+                    st.st_mtime_ns,
+                )
+        all_fingerprints = self._dist.allgather((fingerprints, xxhash is not None))
+        # Only use the fast hash if every rank has it, so that all digests are comparable.
+        fast = all(has_xxhash for _, has_xxhash in all_fingerprints)
+
+        all_conflicts = {}
+        to_hash = set()
+        for fname, ranks in conflicts.items():
+            fps = [all_fingerprints[rank][0][fname] for rank in ranks]
+            if any(fp is None for fp in fps) or len({fp[0] for fp in fps if fp}) > 1:
+                all_conflicts[fname] = ranks
+            elif len(set(fps)) > 1:
+                to_hash.add(fname)
+
+        # Second pass: hash the remaining files and gather only their digests.  Every rank computes
+        # the same to_hash, so they all agree on whether this allgather happens.
+        if to_hash:
+            my_to_hash = [fname for fname in mine if fname in to_hash]
+            digests = {}
+            if my_to_hash:
+                assert ckpt_dir
+                paths = [os.path.join(ckpt_dir, fname) for fname in my_to_hash]
+                with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=min(len(my_to_hash), _MAX_HASH_THREADS),
+                    thread_name_prefix="checkpoint-hash",
+                ) as pool:
+                    hashed = pool.map(lambda path: _hash_file(path, fast), paths)
+                    digests = dict(zip(my_to_hash, hashed))
+            all_digests = self._dist.allgather(digests)
+            for fname in to_hash:
+                ranks = conflicts[fname]
+                if len({all_digests[rank][fname] for rank in ranks}) > 1:
+                    all_conflicts[fname] = ranks
 
         if len(all_conflicts) > 0:
             self._raise_conflict_error(all_conflicts, "files")
@@ -473,7 +694,11 @@ class CheckpointContext:
 
     @contextlib.contextmanager
     def store_path(
-        self, metadata: Optional[Dict[str, Any]] = None, *, shard: bool = False
+        self,
+        metadata: Optional[Dict[str, Any]] = None,
+        *,
+        shard: bool = False,
+        async_: bool = False,
     ) -> Iterator[Tuple[pathlib.Path, str]]:
         """
         ``store_path()`` is a context manager which chooses a random path and prepares a directory
@@ -492,6 +717,14 @@ class CheckpointContext:
         When ``shard=True``, ``store_path()`` becomes a synchronization point between workers, so
         all workers must call store_path(), even workers which will not write any checkpoint files.
 
+        When ``async_=True`` (only supported with ``shard=False``), exiting the context manager
+        does not wait for the upload; it happens on a background thread instead, and the checkpoint
+        is reported to the master once the upload completes.  The saved files must not be modified
+        after the context manager exits.  If too many uploads are already in progress, exiting the
+        context manager blocks until one of them finishes.  The ``Future`` of the upload, which
+        resolves to its ``storage_id``, is available as ``last_async_upload`` after the context
+        manager exits.  Errors and random state behave as described for ``upload()``.
+
         Example:
 
         .. code::
@@ -503,12 +736,14 @@ class CheckpointContext:
                print(f"done uploading checkpoint {storage_id}")
         """
         if not shard:
-            return self._store_path_single(metadata)
+            return self._store_path_single(metadata, async_=async_)
         else:
+            if async_:
+                raise ValueError("cannot call .store_path(shard=True, async_=True)")
             return self._store_path_sharded(metadata)
 
     def _store_path_single(
-        self, metadata: Optional[Dict[str, Any]] = None
+        self, metadata: Optional[Dict[str, Any]] = None, *, async_: bool = False
     ) -> Iterator[Tuple[pathlib.Path, str]]:
         logger.debug(f"Getting path for storage (metadata={metadata})")
         if self._dist.rank != 0:
@@ -518,6 +753,20 @@ class CheckpointContext:
             )
 
         storage_id = str(uuid.uuid4())
+        if async_:
+            self._validate_metadata(metadata)
+            path = self._storage_manager.pre_store_path(storage_id)
+            yield path, storage_id
+            self._write_metadata_file(os.fspath(path), metadata or {})
+            resources = self._storage_manager._list_directory(path)
+
+            def upload() -> None:
+                self._storage_manager.post_store_path(src=path, dst=storage_id)
+                self._report_checkpoint(storage_id, resources, metadata)
+
+            self._submit_async_upload(storage_id, upload)
+            return
+
         with self._storage_manager.store_path(storage_id) as path:
             yield path, storage_id
             self._write_metadata_file(os.fspath(path), metadata or {})
@@ -706,6 +955,13 @@ class CheckpointContext:
         with metadata_path.open("w") as f:
             json.dump(metadata, f, indent=2)
 
+    def _validate_metadata(self, metadata: Optional[Dict[str, Any]]) -> None:
+        if "steps_completed" not in (metadata or {}):
+            raise ValueError(
+                "metadata for reported checkpoints, in the current implementation, requires a "
+                "'steps_completed' item, which has not been provided"
+            )
+
     def _report_checkpoint(
         self,
         storage_id: str,
@@ -717,12 +973,7 @@ class CheckpointContext:
         """
         resources = resources or {}
         metadata = metadata or {}
-
-        if "steps_completed" not in metadata:
-            raise ValueError(
-                "metadata for reported checkpoints, in the current implementation, requires a "
-                "'steps_completed' item, which has not been provided"
-            )
+        self._validate_metadata(metadata)
 
         ckpt = bindings.v1Checkpoint(
             allocationId=self._allocation_id,
@@ -749,9 +1000,17 @@ class DummyCheckpointContext(CheckpointContext):
         self,
         dist: core.DistributedContext,
         storage_manager: storage.StorageManager,
+        max_async_uploads: int = 2,
     ) -> None:
         self._dist = dist
         self._storage_manager = storage_manager
+        self._max_async_uploads = max_async_uploads
+        self._async_uploader = None
+        self.last_async_upload = None
+
+    def _validate_metadata(self, metadata: Optional[Dict[str, Any]]) -> None:
+        # Off-cluster checkpoints are never reported, so any metadata is fine.
+        pass
 
     def _report_checkpoint(
         self,
@@ -120,18 +120,23 @@ class Context:
         exc_val: Optional[BaseException] = None,
         exc_tb: Optional[types.TracebackType] = None,
     ) -> None:
-        self.preempt.close()
-        self.distributed.close()
-        self._metrics.close()
-        self.profiler._close()
-        if self._tensorboard_manager is not None:
-            self._tensorboard_manager.close()
-        if self._heartbeat is not None:
-            self._heartbeat.close(exc_type, exc_val, exc_tb)
-        if self._log_shipper is not None:
-            self._log_shipper.close(exc_type, exc_val, exc_tb)
-        if self._session is not None:
-            self._session.close()
+        # Finish any asynchronous checkpoint uploads while the session is still usable.  A failed
+        # upload is raised only after everything else has been closed.
+        try:
+            self.checkpoint._close()
+        finally:
+            self.preempt.close()
+            self.distributed.close()
+            self._metrics.close()
+            self.profiler._close()
+            if self._tensorboard_manager is not None:
+                self._tensorboard_manager.close()
+            if self._heartbeat is not None:
+                self._heartbeat.close(exc_type, exc_val, exc_tb)
+            if self._log_shipper is not None:
+                self._log_shipper.close(exc_type, exc_val, exc_tb)
+            if self._session is not None:
+                self._session.close()
 
     def __exit__(
         self,
@@ -191,6 +196,7 @@ def _dummy_init(
     checkpoint_storage: Optional[Union[str, Dict[str, Any]]] = None,
     tensorboard_path: Optional[pathlib.Path] = None,
     preempt_mode: core.PreemptMode = core.PreemptMode.WorkersAskChief,
+    max_async_uploads: int = 2,
 ) -> Context:
     """
     Build a core.Context suitable for running off-cluster.  This is normally called by init()
@@ -206,7 +212,7 @@ def _dummy_init(
         base_path = appdirs.user_data_dir("determined")
         logger.info(f"no storage_manager provided; storing checkpoints in {base_path}")
         storage_manager = storage.SharedFSStorageManager(base_path)
-    checkpoint = core.DummyCheckpointContext(distributed, storage_manager)
+    checkpoint = core.DummyCheckpointContext(distributed, storage_manager, max_async_uploads)
 
     train = core.DummyTrainContext(tensorboard_path)
     searcher = core.DummySearcherContext(distributed)
@@ -234,6 +240,7 @@ def init(
     checkpoint_storage: Optional[Union[str, Dict[str, Any]]] = None,
     preempt_mode: core.PreemptMode = core.PreemptMode.WorkersAskChief,
     tensorboard_mode: core.TensorboardMode = core.TensorboardMode.AUTO,
+    max_async_uploads: int = 2,
 ) -> Context:
     """
     ``core.init()`` builds a :class:`core.Context <determined.core.Context>` for use with the Core
@@ -263,12 +270,17 @@ def init(
         tensorboard_mode (``core.TensorboardMode``, optional): Define how Tensorboard
             metrics and profiling data are retained. See
             :class:`~determined.core.TensorboardMode`` for more detail. Defaults to ``AUTO``.
+        max_async_uploads (``int``, optional): The number of checkpoint uploads started with
+            ``async_=True`` which may be queued or in progress at once; further asynchronous
+            uploads block until one finishes.  Each one holds a staged copy of its checkpoint on
+            local disk.  Defaults to 2.
     """
     info = det.get_cluster_info()
     if info is None:
         return _dummy_init(
             distributed=distributed,
             checkpoint_storage=checkpoint_storage,
+            max_async_uploads=max_async_uploads,
         )
 
     # We are on the cluster.
@@ -362,6 +374,7 @@ def init(
             tensorboard_mode,
             tensorboard_manager,
             run_prepare_response.storageId,
+            max_async_uploads,
         )
 
         preempt = core.PreemptContext(session, info.allocation_id, distributed, preempt_mode)
@@ -378,7 +391,7 @@ def init(
             base_path = appdirs.user_data_dir("determined")
             logger.info(f"no storage_manager provided; storing checkpoints in {base_path}")
             storage_manager = storage.SharedFSStorageManager(base_path)
-        checkpoint = core.DummyCheckpointContext(distributed, storage_manager)
+        checkpoint = core.DummyCheckpointContext(distributed, storage_manager, max_async_uploads)
         preempt = core.DummyPreemptContext(distributed, preempt_mode)
 
     _install_stacktrace_on_sigusr1()
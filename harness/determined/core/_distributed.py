@@ -28,6 +28,11 @@ class DistributedContext:
     Additionally, any time that cross_size > 1, you must also provide:
      - chief_ip: the ip address to reach the chief worker (where rank==0)
 
+    When there are multiple workers on each of multiple machines, ``.gather()`` and
+    ``.allgather()`` first gather to the local chief of each machine, so the chief only receives
+    one message per machine rather than one per worker.  Pass ``hierarchical_gather=False`` to have
+    every worker send directly to the chief instead.
+
     .. note::
 
        DistributedContext has ``.allgather()``, ``.gather()``, and ``.broadcast()`` methods, which
@@ -50,6 +55,7 @@ class DistributedContext:
         pull_port: int = constants.INTER_TRAIN_PROCESS_COMM_PORT_2,
         port_offset: int = 0,
         force_tcp: bool = False,
+        hierarchical_gather: bool = True,
     ) -> None:
         rank_args = (rank, size, local_rank, local_size, cross_rank, cross_size)
         if sum(x is not None for x in rank_args) not in (0, 6):
@@ -86,7 +92,12 @@ class DistributedContext:
 
         self._closed = False
 
+        # Flat gathers are always used while setting up the local chiefs.
+        self._hierarchical_gather = False
         self._init_ipc(force_tcp)
+        self._hierarchical_gather = (
+            hierarchical_gather and self.local_size > 1 and self.cross_size > 1
+        )
 
     def _init_ipc(self, force_tcp: bool) -> None:
         if self.size < 2:
@@ -355,6 +366,13 @@ class DistributedContext:
         """
         if self.size < 2:
             return [stuff]
+        if self._hierarchical_gather:
+            all_stuff = self._gather_hierarchical(stuff)
+            if self._is_chief:
+                self._chief_zmq.broadcast(None)
+            else:
+                _ = self._worker_zmq.recv()
+            return all_stuff
         logger.debug(f"Worker {self.get_rank()} beginning zmq gather.")
         if self._is_chief:
             worker_stuff_ranked = self._chief_zmq.gather()
@@ -395,6 +413,29 @@ class DistributedContext:
         logger.debug(f"Worker {self.get_rank()} finished zmq gather local.")
         return out
 
+    def _gather_hierarchical(self, stuff: Any) -> Optional[List]:
+        """
+        Gather ``stuff`` to each local chief, then from the local chiefs to the chief.  The chief
+        returns a list of all stuff, and everyone else returns ``None``.  Callers must follow up
+        with a global broadcast, which keeps workers from sending for a later gather too early.
+        """
+        logger.debug(f"Worker {self.get_rank()} beginning hierarchical zmq gather.")
+        local_stuff = self.gather_local((self.get_rank(), stuff))
+        out = None
+        if self._is_chief:
+            assert local_stuff is not None
+            ranked = list(local_stuff)
+            # One message from each other machine's local chief.
+            for machine_stuff in self._chief_zmq.gather(self.cross_size - 1):
+                ranked.extend(machine_stuff)
+            out = [value for _, value in sorted(ranked, key=lambda x: x[0])]
+        elif self._is_local_chief:
+            self._worker_zmq.send(local_stuff)
+        else:
+            self._worker_zmq.skip_send()
+        logger.debug(f"Worker {self.get_rank()} finished hierarchical zmq gather.")
+        return out
+
     def allgather(self, stuff: Any) -> List:
         """
         Gather ``stuff`` to the chief and broadcast all of it back to the workers.
@@ -404,6 +445,14 @@ class DistributedContext:
         """
         if self.size < 2:
             return [stuff]
+        if self._hierarchical_gather:
+            gathered = self._gather_hierarchical(stuff)
+            if self._is_chief:
+                self._chief_zmq.broadcast(gathered)
+            else:
+                gathered = self._worker_zmq.recv()
+            assert gathered is not None
+            return gathered
         logger.debug(f"Worker {self.get_rank()} beginning zmq allgather.")
         if self._is_chief:
             worker_stuff_ranked = self._chief_zmq.gather()
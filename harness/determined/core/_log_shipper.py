@@ -1,12 +1,12 @@
-import collections
 import datetime
+import gzip
+import json
 import logging
-import queue
 import sys
 import threading
 import time
 import types
-from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Union
+from typing import Any, Callable, Dict, List, Optional, TextIO
 
 from determined import core
 from determined.common import api
@@ -65,6 +65,7 @@ class _Interceptor:
         self._handler = handler
 
     def write(self, data: str) -> int:
+        # The handler must never block, or a slow master would stall whatever is printing.
         self._handler(data)
         return self._original_io.write(data)
 
@@ -78,31 +79,58 @@ class _Interceptor:
 SHIPPER_FLUSH_INTERVAL = 1
 SHIPPER_FAILURE_BACKOFF_SECONDS = 1
 LOG_BATCH_MAX_SIZE = 1000
-SHIP_QUEUE_MAX_SIZE = 3 * LOG_BATCH_MAX_SIZE
+LOG_BATCH_MAX_BYTES = 1024 * 1024
+# Output beyond this many unshipped bytes is dropped rather than buffered.
+SHIP_BUFFER_MAX_BYTES = 16 * LOG_BATCH_MAX_BYTES
 
 
-class _ShutdownMessage:
-    pass
-
+class _LogSender(threading.Thread):
+    """
+    Ship intercepted output to the master in the background.
 
-_QueueElement = Union[str, _ShutdownMessage]
+    ``write()`` only appends to an in-memory buffer, so it never blocks the writer.  Every
+    ``SHIPPER_FLUSH_INTERVAL`` seconds, or sooner once a full batch of bytes is waiting, the
+    buffered output is split into lines and posted in gzip-compressed batches of at most
+    ``LOG_BATCH_MAX_SIZE`` lines and about ``LOG_BATCH_MAX_BYTES`` bytes.
 
+    When the master cannot keep up, output is dropped once ``SHIP_BUFFER_MAX_BYTES`` are waiting,
+    and batches which fail to ship are dropped after one retry.  Drops are counted, and a line
+    reporting them is shipped in place of the lost output.
+    """
 
-class _LogSender(threading.Thread):
     def __init__(self, session: api.Session, logs_metadata: Dict) -> None:
-        self._queue = queue.Queue(maxsize=SHIP_QUEUE_MAX_SIZE)  # type: queue.Queue[_QueueElement]
-        self._logs = collections.deque()  # type: collections.deque[str]
         self._session = session
         self._logs_metadata = logs_metadata
         self._buf = ""
+        self._gzip = True
+
+        self._lock = threading.Lock()
+        self._pending = []  # type: List[str]
+        self._pending_bytes = 0
+        self._wakeup = threading.Event()
+        self._closing = False
+
+        self.dropped_bytes = 0
+        self.shipped_lines = 0
+        self.shipped_batches = 0
+        self.failed_batches = 0
+        self._reported_dropped_bytes = 0
 
         super().__init__(daemon=True, name="LogSenderThread")
 
     def write(self, data: str) -> None:
-        self._queue.put(data)
+        with self._lock:
+            if self._pending_bytes + len(data) > SHIP_BUFFER_MAX_BYTES:
+                self.dropped_bytes += len(data)
+                return
+            self._pending.append(data)
+            self._pending_bytes += len(data)
+            if self._pending_bytes >= LOG_BATCH_MAX_BYTES:
+                self._wakeup.set()
 
     def close(self) -> None:
-        self._queue.put(_ShutdownMessage())
+        self._closing = True
+        self._wakeup.set()
         self.join(1)
         if self.is_alive():
             logger.info("Waiting for LogSender...")
@@ -111,59 +139,83 @@ class _LogSender(threading.Thread):
                 logger.warn("Failed to complete LogSender cleanup")
             else:
                 logger.info("LogSender cleanup completed")
-
-    def _pop_until_deadline(self, deadline: float) -> Iterator[_QueueElement]:
-        while True:
-            timeout = deadline - time.time()
-            if timeout <= 0:
-                break
-
-            try:
-                yield self._queue.get(timeout=timeout)
-            except queue.Empty:
-                break
+        if self.dropped_bytes or self.failed_batches:
+            logger.warning(
+                f"{self.dropped_bytes} bytes of output and {self.failed_batches} batches of log "
+                "lines could not be shipped to the master"
+            )
 
     def run(self) -> None:
         while True:
-            deadline = time.time() + SHIPPER_FLUSH_INTERVAL
-            for m in self._pop_until_deadline(deadline):
-                if isinstance(m, _ShutdownMessage):
-                    self.ship()
-                    return
-
-                self._logs.append(m)
-                if len(self._logs) >= LOG_BATCH_MAX_SIZE:
-                    self.ship()
-
+            self._wakeup.wait(SHIPPER_FLUSH_INTERVAL)
+            self._wakeup.clear()
+            closing = self._closing
             self.ship()
+            if closing:
+                return
 
     def ship(self) -> None:
-        if len(self._logs) == 0:
-            return
-
-        msgs = []
-
-        while len(self._logs):
-            data = self._logs.popleft()
-            self._buf += data
-            while "\n" in self._buf:
-                idx = self._buf.index("\n") + 1
-                line = self._buf[:idx]
-                self._buf = self._buf[idx:]
-
-                msg = dict(self._logs_metadata)
-                msg["log"] = line
-                msgs.append(msg)
-
-            if len(msgs) > LOG_BATCH_MAX_SIZE:
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._pending_bytes = 0
+            dropped = self.dropped_bytes - self._reported_dropped_bytes
+            self._reported_dropped_bytes = self.dropped_bytes
+
+        self._buf += "".join(pending)
+        lines = self._buf.split("\n")
+        # Hold on to any incomplete last line until the rest of it is written.
+        self._buf = lines.pop()
+        lines = [line + "\n" for line in lines]
+        if dropped:
+            lines.append(
+                f"[determined] {dropped} bytes of output were dropped because logs could not be "
+                "shipped quickly enough\n"
+            )
+
+        msgs = []  # type: List[Dict[str, str]]
+        batch_bytes = 0
+        for line in lines:
+            msg = dict(self._logs_metadata)
+            msg["log"] = line
+            msgs.append(msg)
+            batch_bytes += len(line)
+            if len(msgs) >= LOG_BATCH_MAX_SIZE or batch_bytes >= LOG_BATCH_MAX_BYTES:
                 self._ship(msgs)
-                msgs = []
+                msgs, batch_bytes = [], 0
 
         if len(msgs) > 0:
             self._ship(msgs)
 
     def _ship(self, msgs: List[Dict]) -> None:
-        self._session.post("task-logs", json=msgs)
+        body = json.dumps(msgs).encode("utf8")
+        for attempt in range(2):
+            try:
+                self._post(body)
+            except Exception:
+                if attempt == 0:
+                    time.sleep(SHIPPER_FAILURE_BACKOFF_SECONDS)
+                    continue
+                self.failed_batches += 1
+                return
+            self.shipped_lines += len(msgs)
+            self.shipped_batches += 1
+            return
+
+    def _post(self, body: bytes) -> None:
+        if self._gzip:
+            try:
+                self._session.post(
+                    "task-logs",
+                    data=gzip.compress(body, compresslevel=1),
+                    headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+                )
+                return
+            except api.errors.APIException as e:
+                if e.status_code not in (400, 415):
+                    raise
+                # Masters which predate compressed request bodies reject them.
+                self._gzip = False
+        self._session.post("task-logs", data=body, headers={"Content-Type": "application/json"})
 
 
 class _UnmanagedTrialLogShipper(_LogShipper):
@@ -2,7 +2,8 @@ import datetime
 import logging
 import queue
 import threading
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from determined.common import api
 from determined.common.api import bindings
@@ -14,7 +15,13 @@ class _MetricsContext:
     """Gives access to metrics reporting during trial tasks.
 
     Metrics reported to ``_MetricsContext`` are published to a queue, which is consumed by a
-    background thread that reports them to the master.
+    background thread that reports them to the master.  Consecutive reports for the same group and
+    step which are waiting in the queue are combined into a single request.
+
+    Arguments:
+        flush_interval: seconds the background thread waits for more reports to combine with one
+            it has received before reporting it.  By default, reports are sent as soon as possible
+            and are only combined when they arrive faster than the master accepts them.
     """
 
     def __init__(
@@ -22,6 +29,7 @@ class _MetricsContext:
         session: api.Session,
         trial_id: int,
         run_id: int,
+        flush_interval: float = 0,
     ) -> None:
         self._session = session
         self._trial_id = trial_id
@@ -33,8 +41,14 @@ class _MetricsContext:
             trial_id=self._trial_id,
             run_id=self._run_id,
             error_queue=self._error_queue,
+            flush_interval=flush_interval,
         )
 
+    @property
+    def stats(self) -> "_MetricsStats":
+        """Counters describing how reports were shipped, and how long reporting was blocked."""
+        return self._shipper.stats
+
     def report(
         self,
         group: str,
@@ -108,6 +122,28 @@ class _TrialMetrics:
         self.batch_metrics = batch_metrics
         self.report_time = report_time
 
+    def coalesce(self, other: "_TrialMetrics") -> bool:
+        """Merge a later report for the same group and step into this one, if possible."""
+        if (other.group, other.steps_completed) != (self.group, self.steps_completed):
+            return False
+        # Later values win, as they would if the master received the reports separately.
+        self.metrics = {**self.metrics, **other.metrics}
+        if other.batch_metrics is not None:
+            self.batch_metrics = (self.batch_metrics or []) + other.batch_metrics
+        self.report_time = other.report_time or self.report_time
+        return True
+
+
+class _MetricsStats:
+    def __init__(self) -> None:
+        # Reports published by the user, and requests actually sent to the master.
+        self.reports = 0
+        self.requests = 0
+        # Reports which had to wait for room in the full queue, and for how long in total.
+        self.blocked_reports = 0
+        self.blocked_seconds = 0.0
+        self.max_queue_size = 0
+
 
 class _Shipper(threading.Thread):
     METRICS_QUEUE_MAXSIZE = 1000
@@ -118,12 +154,15 @@ class _Shipper(threading.Thread):
         trial_id: int,
         run_id: int,
         error_queue: queue.Queue,
+        flush_interval: float = 0,
     ) -> None:
         self._queue: queue.Queue = queue.Queue(maxsize=self.METRICS_QUEUE_MAXSIZE)
         self._error_queue = error_queue
         self._session = session
         self._trial_id = trial_id
         self._run_id = run_id
+        self._flush_interval = flush_interval
+        self.stats = _MetricsStats()
 
         super().__init__(daemon=True, name="MetricsShipperThread")
 
@@ -135,41 +174,73 @@ class _Shipper(threading.Thread):
         batch_metrics: Optional[List[Dict[str, Any]]] = None,
         report_time: Optional[datetime.datetime] = None,
     ) -> None:
-        self._queue.put(
-            _TrialMetrics(
-                group=group,
-                steps_completed=steps_completed,
-                metrics=metrics,
-                batch_metrics=batch_metrics,
-                report_time=report_time,
-            )
+        msg = _TrialMetrics(
+            group=group,
+            steps_completed=steps_completed,
+            metrics=metrics,
+            batch_metrics=batch_metrics,
+            report_time=report_time,
         )
+        self.stats.reports += 1
+        try:
+            self._queue.put_nowait(msg)
+        except queue.Full:
+            self.stats.blocked_reports += 1
+            start = time.monotonic()
+            self._queue.put(msg)
+            self.stats.blocked_seconds += time.monotonic() - start
+        self.stats.max_queue_size = max(self.stats.max_queue_size, self._queue.qsize())
 
     def run(self) -> None:
         """Start the thread and ship metrics in queue to master."""
         try:
             while True:
-                msg = self._queue.get()
-                if msg is None:
+                msgs, done = self._get_batch()
+                for msg in msgs:
+                    self._post_metrics(
+                        group=msg.group,
+                        metrics=msg.metrics,
+                        batch_metrics=msg.batch_metrics,
+                        steps_completed=msg.steps_completed,
+                        report_time=msg.report_time,
+                    )
+                    self.stats.requests += 1
+                if done:
                     # Received shutdown message, exit.
                     return
-                self._post_metrics(
-                    group=msg.group,
-                    metrics=msg.metrics,
-                    batch_metrics=msg.batch_metrics,
-                    steps_completed=msg.steps_completed,
-                    report_time=msg.report_time,
-                )
         except Exception as e:
             self._error_queue.put(e)
 
+    def _get_batch(self) -> Tuple[List[_TrialMetrics], bool]:
+        """
+        Wait for a report, then collect whatever else is queued or arrives within the flush
+        interval, combining consecutive reports where possible.
+        """
+        msgs: List[_TrialMetrics] = []
+        deadline = None
+        while True:
+            try:
+                if deadline is None:
+                    msg = self._queue.get()
+                    deadline = time.monotonic() + self._flush_interval
+                else:
+                    msg = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                return msgs, False
+            if msg is None:
+                return msgs, True
+            if not msgs or not msgs[-1].coalesce(msg):
+                msgs.append(msg)
+            if len(msgs) >= self.METRICS_QUEUE_MAXSIZE:
+                return msgs, False
+
     def stop(self) -> None:
         self._queue.put(None)
 
     def _post_metrics(
         self,
         group: str,
-        steps_completed: int,
+        steps_completed: Optional[int],
         metrics: Dict[str, Any],
         batch_metrics: Optional[List[Dict[str, Any]]] = None,
         report_time: Optional[datetime.datetime] = None,
@@ -190,6 +261,10 @@ class _DummyMetricsContext(_MetricsContext):
     def __init__(self) -> None:
         pass
 
+    @property
+    def stats(self) -> _MetricsStats:
+        return _MetricsStats()
+
     def report(
         self,
         group: str,
@@ -3,6 +3,7 @@ The entrypoint for the GC checkpoints job container.
 """
 
 import argparse
+import contextlib
 import json
 import logging
 import os
@@ -56,15 +57,20 @@ def delete_checkpoints(
     logger.info(f"Deleting {len(to_delete)} checkpoints")
 
     storage_id_to_resources: Dict[str, Dict[str, int]] = {}
-    for storage_id in to_delete:
-        if not dry_run:
-            logger.info(f"Deleting checkpoint {storage_id}")
-            try:
-                storage_id_to_resources[storage_id] = manager.delete(storage_id, globs)
-            except errors.CheckpointNotFound as e:
-                logger.warn(e)
-        else:
-            logger.info(f"Dry run: deleting checkpoint {storage_id}")
+    with contextlib.ExitStack() as stack:
+        if isinstance(manager, storage.ContentAddressedStorageManager) and not dry_run:
+            # Chunks may be shared between checkpoints; sweep unreferenced chunks only once,
+            # after every checkpoint has been deleted.
+            stack.enter_context(manager.deferred_garbage_collection())
+        for storage_id in to_delete:
+            if not dry_run:
+                logger.info(f"Deleting checkpoint {storage_id}")
+                try:
+                    storage_id_to_resources[storage_id] = manager.delete(storage_id, globs)
+                except errors.CheckpointNotFound as e:
+                    logger.warn(e)
+            else:
+                logger.info(f"Dry run: deleting checkpoint {storage_id}")
 
     return storage_id_to_resources
 
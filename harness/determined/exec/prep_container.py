@@ -1,11 +1,14 @@
 import argparse
 import base64
+import hashlib
 import io
 import json
 import logging
 import os
+import shutil
 import socket
 import tarfile
+import tempfile
 import uuid
 import warnings
 from typing import List, Optional
@@ -20,24 +23,77 @@ from determined.common.api import authentication, bindings, certs
 
 logger = logging.getLogger("determined")
 
+# Set to a directory shared by the containers on an agent to extract each context directory there
+# once, keyed by its digest.
+CONTEXT_CACHE_DIR_ENV = "DET_CONTEXT_CACHE_DIR"
+CONTEXT_DIGEST_CHUNK_SIZE = 1024 * 1024
+
 
 def is_trial(info: det.ClusterInfo) -> bool:
     return info.task_type == "TRIAL"
 
 
+def _context_digest(b64_tgz: str) -> str:
+    digest = hashlib.sha256()
+    for i in range(0, len(b64_tgz), CONTEXT_DIGEST_CHUNK_SIZE):
+        digest.update(b64_tgz[i : i + CONTEXT_DIGEST_CHUNK_SIZE].encode("ascii"))
+    return digest.hexdigest()
+
+
+def _extract_context_directory(b64_tgz: str, path: str) -> None:
+    tgz = base64.b64decode(b64_tgz)
+    with tarfile.open(fileobj=io.BytesIO(tgz), mode="r:gz") as context_directory:
+        # Ensure all members of the tarball resolve to subdirectories.
+        for name in context_directory.getnames():
+            if os.path.relpath(name).startswith("../"):
+                raise ValueError(f"'{name}' in tarball would expand to a parent directory")
+        context_directory.extractall(path=path)
+
+
+def _cached_context_directory(b64_tgz: str, cache_dir: str) -> str:
+    """
+    Return the directory in cache_dir where the context directory is extracted, extracting it
+    first if no other container has yet.
+    """
+    cached = os.path.join(cache_dir, _context_digest(b64_tgz))
+    if os.path.isdir(cached):
+        logger.debug(f"Using the context directory already extracted at {cached}")
+        return cached
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=cache_dir, prefix=".extract-")
+    try:
+        _extract_context_directory(b64_tgz, tmp)
+        os.rename(tmp, cached)
+    except OSError:
+        # Another container extracted the same context directory first.
+        if not os.path.isdir(cached):
+            raise
+    finally:
+        if os.path.exists(tmp):
+            shutil.rmtree(tmp)
+    return cached
+
+
 def download_context_directory(sess: api.Session, info: det.ClusterInfo) -> None:
     b64_tgz = bindings.get_GetTaskContextDirectory(sess, taskId=info.task_id).b64Tgz
     if len(b64_tgz) == 0:
         return  # Non trials can have empty model defs.
 
-    tgz = base64.b64decode(b64_tgz)
-    with tarfile.open(fileobj=io.BytesIO(tgz), mode="r:gz") as context_directory:
-        # Ensure all members of the tarball resolve to subdirectories.
-        for path in context_directory.getnames():
-            if os.path.relpath(path).startswith("../"):
-                raise ValueError(f"'{path}' in tarball would expand to a parent directory")
-        context_directory.extractall(path=constants.MANAGED_TRAINING_MODEL_COPY)
-        context_directory.extractall(path=".")
+    # Decompress the context directory only once, then copy it where it is needed.  If a cache
+    # directory is configured, and shared between containers on the same agent, containers
+    # started with the same context directory only decompress it once between them.
+    cache_dir = os.environ.get(CONTEXT_CACHE_DIR_ENV)
+    if cache_dir:
+        extracted = _cached_context_directory(b64_tgz, cache_dir)
+        shutil.copytree(
+            extracted, constants.MANAGED_TRAINING_MODEL_COPY, symlinks=True, dirs_exist_ok=True
+        )
+    else:
+        extracted = constants.MANAGED_TRAINING_MODEL_COPY
+        _extract_context_directory(b64_tgz, extracted)
+    if os.path.realpath(extracted) != os.path.realpath("."):
+        shutil.copytree(extracted, ".", symlinks=True, dirs_exist_ok=True)
 
     # pre-0.18.3 code wrote tensorboard stuff under /tmp/tensorboard
     if is_trial(info):
@@ -7,7 +7,8 @@ import sys
 import tempfile
 import threading
 import time
-from typing import Any, Callable, Dict, List
+from concurrent import futures
+from typing import Any, Callable, Dict, List, Tuple
 
 import boto3
 import requests
@@ -24,7 +25,8 @@ MAX_WAIT_TIME = 600  # How many seconds to wait for the first metric file to dow
 TB_RESPONSE_WAIT_TIME = 300  # How many seconds to wait for TensorBoard to initially start up
 WORK_QUEUE_MAX_SIZE = 20  # Size of the threading work queue for fetching
 FULL_ITERATION_SLEEP_TIME = 20  # How long to wait between a full iteration run (in seconds)
-NUM_FETCH_THREADS = 5  # Number of fetching threads to run concurrently
+NUM_FETCH_THREADS = 5  # Default number of fetching threads to run concurrently
+MAX_LISTING_BACKOFF = 8  # Most full iterations to skip listing a storage path with no changes
 READY_SIGNAL_DELAY = 7  # How many seconds to wait before sending the ready signal
 
 logger = logging.getLogger("determined")
@@ -112,6 +114,7 @@ def start_tensorboard(
     tb_version: str,
     storage_paths: List[str],
     add_tb_args: List[str],
+    num_fetch_threads: int = NUM_FETCH_THREADS,
 ) -> int:
     """Start Tensorboard and look for new files."""
     with tempfile.TemporaryDirectory() as local_dir:
@@ -132,7 +135,10 @@ def start_tensorboard(
         work_queue: queue.Queue = queue.Queue(maxsize=WORK_QUEUE_MAX_SIZE)
 
         iteration_thread = TBFetchIterationThread(
-            fetcher=fetcher, work_queue=work_queue, daemon=True
+            fetcher=fetcher,
+            work_queue=work_queue,
+            num_list_threads=num_fetch_threads,
+            daemon=True,
         )
         fetch_threads = [
             TBFetchThread(
@@ -141,7 +147,7 @@ def start_tensorboard(
                 new_file_callback=tb_fetch_manager.on_file_fetched,
                 daemon=True,
             )
-            for _ in range(NUM_FETCH_THREADS)
+            for _ in range(num_fetch_threads)
         ]
 
         with det.util.forward_signals(tensorboard_process):
@@ -220,35 +226,90 @@ class TBFetchManager:
 class TBFetchIterationThread(threading.Thread):
     """Thread to continuously iterate over the fetchers files and add them to a threading.Queue
 
+    Each iteration lists the storage paths concurrently, then queues the files of the most recently
+    updated storage paths first, so that the newest runs are the first to show up in TensorBoard.
+    A storage path which has not changed for a while is listed less and less often, up to once
+    every MAX_LISTING_BACKOFF iterations, so that the runs which finished long ago do not slow
+    down listing the ones still being written.
+
     Note: We are making the assumption that there will only be one of these running per process.
     If we add more, then the base fetcher will need to support locking around the _file_records
     dictionary. Defined in <ROOT>/harness/determined/tensorboard/fetchers/base.py
+    The listing threads started by this thread never list the same storage path at once, so they
+    never update the same records.
     """
 
     def __init__(
         self,
         fetcher: fetchers.Fetcher,
         work_queue: queue.Queue,
+        num_list_threads: int = NUM_FETCH_THREADS,
         *args: Any,
         **kwargs: Any,
     ) -> None:
         self._fetcher = fetcher
         self._work_queue = work_queue
+        self._num_list_threads = num_list_threads
+        # Consecutive listings of each storage path which found nothing new, and how many more
+        # iterations to skip it for.
+        self._idle_listings = {path: 0 for path in fetcher.storage_paths}
+        self._skip_iterations = {path: 0 for path in fetcher.storage_paths}
         super().__init__(*args, **kwargs)
 
     def run(self) -> None:
-        while True:
-            try:
-                for filepath in self._fetcher.list_all_generator():
-                    self._work_queue.put(filepath, block=True)
-            except Exception as e:
-                logger.warning(
-                    f"Failure listing TensorBoard files from {self._fetcher}. Error: {e}"
-                    f" (retrying in {FULL_ITERATION_SLEEP_TIME}s)...",
-                    exc_info=True,
-                )
-            finally:
-                time.sleep(FULL_ITERATION_SLEEP_TIME)
+        with futures.ThreadPoolExecutor(self._num_list_threads) as pool:
+            while True:
+                try:
+                    for filepath in self._iterate(pool):
+                        self._work_queue.put(filepath, block=True)
+                except Exception as e:
+                    logger.warning(
+                        f"Failure listing TensorBoard files from {self._fetcher}. Error: {e}"
+                        f" (retrying in {FULL_ITERATION_SLEEP_TIME}s)...",
+                        exc_info=True,
+                    )
+                finally:
+                    time.sleep(FULL_ITERATION_SLEEP_TIME)
+
+    def _iterate(self, pool: futures.Executor) -> List[str]:
+        """List the storage paths due for listing and return their new files, newest run first."""
+        storage_paths = []
+        for storage_path in self._fetcher.storage_paths:
+            if self._skip_iterations[storage_path] > 0:
+                self._skip_iterations[storage_path] -= 1
+            else:
+                storage_paths.append(storage_path)
+
+        runs = []  # type: List[Tuple[Any, List[str]]]
+        for storage_path, filepaths in zip(storage_paths, pool.map(self._list, storage_paths)):
+            if filepaths:
+                self._idle_listings[storage_path] = 0
+                newest = max(self._fetcher._file_records[filepath] for filepath in filepaths)
+                # Sorting puts each file ahead of the segments appended to it.
+                runs.append((newest, sorted(filepaths)))
+            else:
+                self._idle_listings[storage_path] += 1
+            self._skip_iterations[storage_path] = min(
+                2 ** self._idle_listings[storage_path] - 1, MAX_LISTING_BACKOFF
+            )
+
+        runs.sort(key=lambda run: run[0], reverse=True)
+        return [filepath for _, filepaths in runs for filepath in filepaths]
+
+    def _list(self, storage_path: str) -> List[str]:
+        # Files are recorded as fetched as soon as they are listed, so keep whatever was listed
+        # before a failure.
+        filepaths = []
+        try:
+            for filepath in self._fetcher._list(storage_path):
+                filepaths.append(filepath)
+        except Exception as e:
+            logger.warning(
+                f"Failure listing TensorBoard files in {storage_path}. Error: {e}"
+                f" (retrying in {FULL_ITERATION_SLEEP_TIME}s)...",
+                exc_info=True,
+            )
+        return filepaths
 
 
 class TBFetchThread(threading.Thread):
@@ -288,6 +349,7 @@ if __name__ == "__main__":
     storage_config_path = sys.argv[2]
     storage_paths = sys.argv[3].split(",")
     additional_tb_args = sys.argv[4:]
+    num_fetch_threads = int(os.environ.get("DET_TENSORBOARD_FETCH_THREADS", NUM_FETCH_THREADS))
 
     config = {}  # type: Dict[str, Any]
     with open(storage_config_path) as config_file:
@@ -299,8 +361,11 @@ if __name__ == "__main__":
         f"\tstorage_config_path: {storage_config_path}\n"
         f"\tstorage_paths: {storage_paths}\n"
         f"\tadditional_tb_args: {additional_tb_args}\n"
+        f"\tnum_fetch_threads: {num_fetch_threads}\n"
         f"\tstorage_config: {storage_config}"
     )
 
-    ret = start_tensorboard(storage_config, tb_version, storage_paths, additional_tb_args)
+    ret = start_tensorboard(
+        storage_config, tb_version, storage_paths, additional_tb_args, num_fetch_threads
+    )
     sys.exit(ret)
@@ -1,5 +1,6 @@
 import logging
 import os
+import pickle
 import selectors
 import signal
 import socket
@@ -31,6 +32,46 @@ class _SerialMessage:
         self.payload = payload
 
 
+# Out-of-band buffers at least this large are sent from the memory of the object they belong to,
+# rather than being copied into a message first.
+_ZERO_COPY_MIN_BYTES = 64 * 1024
+
+
+def _send_pyobj(socket: Any, obj: Any) -> None:
+    """
+    Like socket.send_pyobj(), except that buffers which support pickle protocol 5's out-of-band
+    data, like the data of NumPy arrays, are not copied into the pickle.  Instead, they follow it
+    as extra frames of a multipart message.
+    """
+    import zmq
+
+    buffers = []  # type: List[pickle.PickleBuffer]
+    frames = [memoryview(pickle.dumps(obj, protocol=5, buffer_callback=buffers.append))]
+    frames.extend(buf.raw() for buf in buffers)
+
+    trackers = []
+    for i, frame in enumerate(frames):
+        flags = zmq.SNDMORE if i < len(frames) - 1 else 0
+        if frame.nbytes < _ZERO_COPY_MIN_BYTES:
+            socket.send(frame, flags)
+            continue
+        trackers.append(socket.send(frame, flags, copy=False, track=True))
+
+    # ZMQ sends zero-copy frames in the background.  Wait until it is done with them, so that the
+    # caller is free to modify obj once we return.
+    for tracker in trackers:
+        tracker.wait()
+
+
+def _recv_pyobj(socket: Any) -> Any:
+    """
+    Receive a message sent by _send_pyobj().  Out-of-band buffers are unpickled in place, so they
+    are backed by the memory ZMQ received them into rather than by a copy.
+    """
+    frames = socket.recv_multipart(copy=False)
+    return pickle.loads(frames[0].buffer, buffers=[frame.buffer for frame in frames[1:]])
+
+
 class ZMQBroadcastServer:
     """
     Similar to ZMQServer except with broadcast/gather semantics on exactly two ports.
@@ -106,18 +147,18 @@ class ZMQBroadcastServer:
         connections_made = 0
         while connections_made < self._num_connections:
             # Send a Hello.
-            self._pub_socket.send_pyobj(_HelloMessage())
+            _send_pyobj(self._pub_socket, _HelloMessage())
 
             # Check for an incoming connection.
             if self._pull_socket.poll(50) == 0:
                 continue
 
-            obj = self._pull_socket.recv_pyobj()
+            obj = _recv_pyobj(self._pull_socket)
             if not isinstance(obj, _HelloMessage):
                 raise RuntimeError(f"got non-_HelloMessage: {type(obj).__name__}")
             connections_made += 1
 
-        self._pub_socket.send_pyobj(_FinalHelloMessage())
+        _send_pyobj(self._pub_socket, _FinalHelloMessage())
 
     def __enter__(self) -> "ZMQBroadcastServer":
         return self
@@ -144,11 +185,17 @@ class ZMQBroadcastServer:
         Broadcast a message object to each connection.
         """
 
-        self._pub_socket.send_pyobj(_SerialMessage(self._send_serial, obj))
+        _send_pyobj(self._pub_socket, _SerialMessage(self._send_serial, obj))
         self._send_serial += 1
 
-    def gather(self) -> List[Any]:
-        out = [self._recv_one() for _ in range(self._num_connections)]
+    def gather(self, num_connections: Optional[int] = None) -> List[Any]:
+        """
+        Receive one message from each connection, or from only ``num_connections`` of them when the
+        rest are sitting out this gather (see ZMQBroadcastClient.skip_send()).
+        """
+        if num_connections is None:
+            num_connections = self._num_connections
+        out = [self._recv_one() for _ in range(num_connections)]
 
         self._recv_serial += 1
 
@@ -159,7 +206,7 @@ class ZMQBroadcastServer:
         Receive one _SerialMessage from the socket and confirm that it is in-order.
         """
 
-        obj = self._pull_socket.recv_pyobj()
+        obj = _recv_pyobj(self._pull_socket)
 
         if not isinstance(obj, _SerialMessage):
             raise RuntimeError(f"non-_SerialMessage: {type(obj).__name__}")
@@ -199,16 +246,16 @@ class ZMQBroadcastClient:
         """
 
         # Get the first HelloMessage to guarantee our SUB socket is connected.
-        obj = self._sub_socket.recv_pyobj()
+        obj = _recv_pyobj(self._sub_socket)
         if not isinstance(obj, _HelloMessage):
             raise RuntimeError(f"got non-_HelloMessage: {type(obj).__name__}")
 
         # Send our own _HelloMessage.
-        self._push_socket.send_pyobj(_HelloMessage())
+        _send_pyobj(self._push_socket, _HelloMessage())
 
         while True:
             # Discard all further Hellos until the FinalHello.
-            obj = self._sub_socket.recv_pyobj()
+            obj = _recv_pyobj(self._sub_socket)
             if isinstance(obj, _FinalHelloMessage):
                 break
             if not isinstance(obj, _HelloMessage):
@@ -227,10 +274,17 @@ class ZMQBroadcastClient:
     def send(self, obj: Any) -> None:
         message = _SerialMessage(self._send_serial, obj)
         self._send_serial += 1
-        self._push_socket.send_pyobj(message)
+        _send_pyobj(self._push_socket, message)
+
+    def skip_send(self) -> None:
+        """
+        Take no part in a gather which the server is collecting from other clients, while staying
+        in sync with the server's serial numbers for future gathers.
+        """
+        self._send_serial += 1
 
     def recv(self) -> Any:
-        obj = self._sub_socket.recv_pyobj()
+        obj = _recv_pyobj(self._sub_socket)
 
         if not isinstance(obj, _SerialMessage):
             raise RuntimeError(f"non-_SerialMessage: {type(obj).__name__}")
@@ -2,9 +2,12 @@ import abc
 import collections
 import multiprocessing
 import multiprocessing.queues
+import os
 import queue
 import threading
-from typing import Any, Deque, Dict, Iterator, Optional, Type, Union
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 import numpy as np
 import tensorflow as tf
@@ -14,6 +17,16 @@ from determined.common import check
 Queue = Union[queue.Queue, multiprocessing.Queue]
 Worker = Union[threading.Thread, multiprocessing.Process]
 
+# Batches whose arrays take fewer bytes than this are pickled rather than placed in shared memory.
+SHARED_MEMORY_MIN_BYTES = 64 * 1024
+# Offsets of arrays placed in shared memory are aligned to this many bytes.
+SHARED_MEMORY_ALIGNMENT = 64
+# How much larger than the largest batch seen so far to make each shared memory slot.
+SHARED_MEMORY_HEADROOM = 1.25
+# How many shared memory slots there may be beyond max_queue_size, for batches which the trainer
+# is still holding on to.
+SHARED_MEMORY_SPARE_SLOTS = 2
+
 
 class _Sampler:
     """
@@ -172,6 +185,131 @@ def _worker(sequence: tf.keras.utils.Sequence, queries: Queue, answers: Queue) -
         answers.put(None)
 
 
+class _SlotArray:
+    """Where a worker placed an array in a shared memory slot."""
+
+    __slots__ = ("offset", "shape", "dtype")
+
+    def __init__(self, offset: int, shape: Tuple[int, ...], dtype: np.dtype) -> None:
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+
+def _map_structure(obj: Any, fn: Callable[[Any], Any]) -> Any:
+    """Apply fn to everything in the (possibly nested) tuples, lists, and dicts of a batch."""
+    if isinstance(obj, dict):
+        return type(obj)((k, _map_structure(v, fn)) for k, v in obj.items())
+    if isinstance(obj, tuple) and hasattr(obj, "_fields"):
+        return type(obj)(*(_map_structure(v, fn) for v in obj))
+    if isinstance(obj, (tuple, list)):
+        return type(obj)(_map_structure(v, fn) for v in obj)
+    return fn(obj)
+
+
+def _aligned(nbytes: int) -> int:
+    return -(-nbytes // SHARED_MEMORY_ALIGNMENT) * SHARED_MEMORY_ALIGNMENT
+
+
+def _is_shareable(obj: Any) -> bool:
+    return isinstance(obj, np.ndarray) and not obj.dtype.hasobject
+
+
+def _pack(data: Any, slot: Optional[shared_memory.SharedMemory]) -> Tuple[bool, Any, int]:
+    """
+    Copy the arrays of a batch into a shared memory slot, if they fit.  Return whether they did,
+    the batch with its arrays replaced by _SlotArrays if they did, and how many bytes they take.
+    """
+    needed = 0
+
+    def measure(obj: Any) -> Any:
+        nonlocal needed
+        if _is_shareable(obj):
+            needed += _aligned(obj.nbytes)
+        return obj
+
+    _map_structure(data, measure)
+    if slot is None or needed > slot.size:
+        return False, data, needed
+
+    offset = 0
+
+    def place(obj: Any) -> Any:
+        nonlocal offset
+        if not _is_shareable(obj):
+            return obj
+        dst = np.ndarray(obj.shape, obj.dtype, buffer=slot.buf, offset=offset)  # type: np.ndarray
+        np.copyto(dst, obj)
+        placed = _SlotArray(offset, obj.shape, obj.dtype)
+        offset += _aligned(obj.nbytes)
+        return placed
+
+    return True, _map_structure(data, place), needed
+
+
+def _unpack(data: Any, slot: shared_memory.SharedMemory) -> Tuple[Any, np.ndarray]:
+    """
+    Replace the _SlotArrays of a batch with views of the shared memory slot.  Also return the
+    array which all the views are views of, which lives for as long as any of them does.
+    """
+    base = np.frombuffer(slot.buf, dtype=np.uint8)
+
+    def view(obj: Any) -> Any:
+        if not isinstance(obj, _SlotArray):
+            return obj
+        nbytes = int(np.prod(obj.shape)) * obj.dtype.itemsize
+        return base[obj.offset : obj.offset + nbytes].view(obj.dtype).reshape(obj.shape)
+
+    return _map_structure(data, view), base
+
+
+def _shared_memory_available() -> Optional[int]:
+    try:
+        st = os.statvfs("/dev/shm")
+    except OSError:
+        return None
+    return st.f_bavail * st.f_frsize
+
+
+def _shared_memory_worker(
+    sequence: tf.keras.utils.Sequence, queries: Queue, answers: Queue
+) -> None:
+    """
+    _shared_memory_worker is the _worker of a _MultiprocessingEnqueuer.  Each query also names a
+    shared memory slot, or None, and the arrays of the batch are copied there rather than pickled
+    through the answers queue when they fit.
+
+    Parameters:
+        sequence: the user-provided Keras Sequence.
+        queries: a queue of tuples of (indices, order, slot) that need to be read from the
+            sequence, where slot is a tuple of (slot index, shared memory name) or None.
+        answers: a queue of tuples of ((in_slot, data, nbytes), order) that workers fill with
+            data from the sequence; see _pack.
+    """
+    attached = {}  # type: Dict[int, shared_memory.SharedMemory]
+    try:
+        while True:
+            query = queries.get()
+            if query is None:
+                return
+            i, order, slot_info = query
+            slot = None
+            if slot_info is not None:
+                slot_idx, name = slot_info
+                slot = attached.get(slot_idx)
+                if slot is None or slot.name != name:
+                    if slot is not None:
+                        # The trainer replaced this slot with a larger one.
+                        slot.close()
+                    slot = attached[slot_idx] = shared_memory.SharedMemory(name)
+            data = sequence[i]
+            answers.put((_pack(data, slot), order))
+    finally:
+        for slot in attached.values():
+            slot.close()
+        answers.put(None)
+
+
 class _ParallelEnqueuer(_Enqueuer):
     """
     _ParallelEnqueuer defines the semantics for either a threading-based or multiprocessing-based
@@ -221,7 +359,9 @@ class _ParallelEnqueuer(_Enqueuer):
         self.answers = self.queue_class()()
 
         self.workers = [
-            self.worker_class()(target=_worker, args=(self.sequence, self.queries, self.answers))
+            self.worker_class()(
+                target=self.worker_target(), args=(self.sequence, self.queries, self.answers)
+            )
             for _ in range(workers)
         ]
 
@@ -258,7 +398,7 @@ class _ParallelEnqueuer(_Enqueuer):
             except StopIteration:
                 self.index_iter = None
                 return
-            puttable = (i, self.order)
+            puttable = self.make_query(i, self.order)
             self.queries.put(puttable)
             self.requested.append(self.order)
             self.order += 1
@@ -288,6 +428,12 @@ class _ParallelEnqueuer(_Enqueuer):
     def worker_class(self) -> Type[Worker]:
         pass
 
+    def worker_target(self) -> Callable:
+        return _worker
+
+    def make_query(self, i: int, order: int) -> Any:
+        return (i, order)
+
     @abc.abstractmethod
     def get_answer(self) -> Any:
         pass
@@ -307,7 +453,31 @@ class _ThreadingEnqueuer(_ParallelEnqueuer):
 
 
 class _MultiprocessingEnqueuer(_ParallelEnqueuer):
-    """multiprocessing.Process-specific implementation details."""
+    """
+    multiprocessing.Process-specific implementation details.
+
+    Rather than being pickled through the answers queue, the arrays of each batch are copied into
+    a shared memory slot which the trainer hands to the worker along with the query, and which the
+    trainer reads them from without copying.  A slot is reused once every array read from it has
+    been garbage collected.  Slots are sized after the largest batch seen so far, so the first
+    batches, and any batch which does not fit or finds every slot in use, are pickled as usual.
+    """
+
+    def __init__(
+        self,
+        sequence: tf.keras.utils.Sequence,
+        sampler: _Sampler,
+        repeat: bool,
+        workers: int,
+        max_queue_size: int,
+    ):
+        super().__init__(sequence, sampler, repeat, workers, max_queue_size)
+        num_slots = self.max_queue_size + SHARED_MEMORY_SPARE_SLOTS
+        self.slots = [None] * num_slots  # type: List[Optional[shared_memory.SharedMemory]]
+        # Slots are freed by garbage collection, which may happen on any thread.
+        self.free_slots = collections.deque(range(num_slots))  # type: Deque[int]
+        self.slot_size = 0
+        self.request_slots = {}  # type: Dict[int, Optional[int]]
 
     def queue_class(self) -> Type[Queue]:
         return multiprocessing.Queue
@@ -315,7 +485,76 @@ class _MultiprocessingEnqueuer(_ParallelEnqueuer):
     def worker_class(self) -> Type[Worker]:
         return multiprocessing.Process
 
+    def worker_target(self) -> Callable:
+        return _shared_memory_worker
+
+    def start(self) -> None:
+        # Workers must share the trainer's resource tracker.  One of their own would unlink the
+        # slots they attached to as soon as they exit.
+        resource_tracker.ensure_running()
+        super().start()
+
+    def stop(self) -> None:
+        super().stop()
+        for i, slot in enumerate(self.slots):
+            if slot is None:
+                continue
+            try:
+                slot.close()
+            except BufferError:
+                # Arrays read from the slot are still in use; the memory is released along with
+                # them once it is unlinked.
+                pass
+            slot.unlink()
+            self.slots[i] = None
+
+    def make_query(self, i: int, order: int) -> Any:
+        slot_idx = self.take_slot()
+        self.request_slots[order] = slot_idx
+        if slot_idx is None:
+            return (i, order, None)
+        slot = self.slots[slot_idx]
+        assert slot is not None
+        return (i, order, (slot_idx, slot.name))
+
+    def take_slot(self) -> Optional[int]:
+        if self.slot_size < SHARED_MEMORY_MIN_BYTES or not self.free_slots:
+            return None
+        slot_idx = self.free_slots.popleft()
+        slot = self.slots[slot_idx]
+        if slot is not None and slot.size >= self.slot_size:
+            return slot_idx
+        if slot is not None:
+            slot.close()
+            slot.unlink()
+            self.slots[slot_idx] = None
+        # Running out of shared memory would crash whichever process wrote to it.
+        available = _shared_memory_available()
+        if available is not None and available < 2 * self.slot_size:
+            self.free_slots.append(slot_idx)
+            return None
+        self.slots[slot_idx] = shared_memory.SharedMemory(create=True, size=self.slot_size)
+        return slot_idx
+
     def get_answer(self) -> Any:
+        answer = self.get_packed_answer()
+        if answer is None:
+            return None
+        (in_slot, data, nbytes), order = answer
+        slot_idx = self.request_slots.pop(order)
+        if nbytes > self.slot_size:
+            self.slot_size = _aligned(int(nbytes * SHARED_MEMORY_HEADROOM))
+        if slot_idx is None:
+            return data, order
+        slot = self.slots[slot_idx]
+        if not in_slot or slot is None:
+            self.free_slots.append(slot_idx)
+            return data, order
+        data, base = _unpack(data, slot)
+        weakref.finalize(base, self.free_slots.append, slot_idx)
+        return data, order
+
+    def get_packed_answer(self) -> Any:
         """Periodically conduct a health check while waiting on workers"""
         while True:
             try:
@@ -16,7 +16,6 @@ import argparse
 import contextlib
 import io
 import os
-import re
 import subprocess
 import sys
 import threading
@@ -25,7 +24,8 @@ from typing import BinaryIO, Iterator, List
 import determined as det
 from determined import constants
 
-lineend = re.compile(rb"[\r\n]")
+# How much output to read at a time.
+READ_BLOCK_SIZE = 64 * 1024
 
 
 # Duplicated in ship_logs.py.  If you find a bug here, fix it there too.
@@ -48,51 +48,35 @@ def read_newlines_or_carriage_returns(fd: io.RawIOBase) -> Iterator[str]:
     """
     # Ship lines of length of DEFAULT_BUFFER_SIZE, including the terminating newline.
     limit = io.DEFAULT_BUFFER_SIZE - 1
-    nread = 0
-    chunks: List[bytes] = []
-
-    def oneline() -> str:
-        nonlocal nread
-        nonlocal chunks
-        out = b"".join(chunks).decode("utf8")
-        chunks = []
-        nread = 0
-        return out
+    # The start of a line whose end has not been read yet.
+    partial = b""
 
     while True:
-        buf = fd.read(limit - nread)
+        # Each read returns whatever output is available, up to READ_BLOCK_SIZE.
+        buf = fd.read(READ_BLOCK_SIZE)
         if not buf:
             # EOF.
             break
 
-        # Extract all the lines from this buffer.
-        while buf:
-            m = lineend.search(buf)
-            if m is None:
-                # No line break here; just append to chunks.
-                chunks.append(buf)
-                nread += len(buf)
-                break
-
-            # Line break found!
-            start, end = m.span()
-            chunks.append(buf[:start])
-            # Even if we matched a '\r', emit a '\n'.
-            chunks.append(b"\n")
-            yield oneline()
-            # keep checking the rest of buf
-            buf = buf[end:]
+        # Split all the lines out of this buffer at once.  Even if we matched a '\r', emit a '\n'.
+        lines = (partial + buf).replace(b"\r", b"\n").split(b"\n")
+        partial = lines.pop()
+        for line in lines:
+            if len(line) <= limit:
+                yield line.decode("utf8") + "\n"
+                continue
+            for start in range(0, len(line), limit):
+                yield line[start : start + limit].decode("utf8") + "\n"
 
         # Detect if we reached our buffer limit.
-        if nread >= limit:
+        while len(partial) >= limit:
             # Pretend we got a line anyway.
-            chunks.append(b"\n")
-            yield oneline()
+            yield partial[:limit].decode("utf8") + "\n"
+            partial = partial[limit:]
 
     # One last line, maybe.
-    if chunks:
-        chunks.append(b"\n")
-        yield oneline()
+    if partial:
+        yield partial.decode("utf8") + "\n"
 
 
 def forward_stream(src_stream: io.RawIOBase, dst_stream: BinaryIO, rank: str) -> None:
@@ -3,6 +3,8 @@ from determined.pytorch._data import (
     DataLoader,
     TorchData,
     _Data,
+    _DevicePrefetcher,
+    _ToDevicePlan,
     adapt_batch_sampler,
     data_length,
     to_device,
@@ -23,6 +25,7 @@ from determined.pytorch._metric_utils import (
     _reduce_metrics,
     _convert_metrics_to_numpy,
     _log_tb_metrics,
+    _transfer_metrics_to_host,
 )
 from determined.pytorch._trainer_utils import (
     Batch,
@@ -1,3 +1,4 @@
+import itertools
 import logging
 from typing import (
     Any,
@@ -8,6 +9,7 @@ from typing import (
     Optional,
     Sequence,
     Set,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -371,8 +373,330 @@ def to_device(
     elif hasattr(data, "to") and callable(data.to):  # type: ignore
         return data.to(device)  # type: ignore
 
+    _warn_cannot_move(data, warned_types)
+    return data  # type:ignore
+
+
+class _LayoutMismatch(Exception):
+    pass
+
+
+_Flatten = Callable[[Any, List[Any]], None]
+_Unflatten = Callable[[Iterator[Any]], Any]
+
+
+def _is_container(data: Any) -> bool:
+    return isinstance(data, (dict, list, tuple))
+
+
+def _compile_layout(data: Any) -> Tuple[_Flatten, _Unflatten]:
+    """
+    Build a pair of functions which take apart anything laid out like data into a flat list of
+    leaves, and put such a list of leaves back together.  Like to_device(), dicts, lists, and
+    tuples are containers, and anything else is a leaf.
+    """
+    if isinstance(data, dict):
+        return _compile_dict_layout(data)
+    if isinstance(data, (list, tuple)):
+        return _compile_seq_layout(data)
+
+    leaf_type = type(data)
+
+    def flatten_leaf(x: Any, out: List[Any]) -> None:
+        if type(x) is not leaf_type:
+            raise _LayoutMismatch()
+        out.append(x)
+
+    def unflatten_leaf(leaves: Iterator[Any]) -> Any:
+        return next(leaves)
+
+    return flatten_leaf, unflatten_leaf
+
+
+def _compile_dict_layout(data: Dict[Any, Any]) -> Tuple[_Flatten, _Unflatten]:
+    data_type = type(data)
+    keys = tuple(data)
+
+    if not any(_is_container(v) for v in data.values()):
+        # The common case of a dict of tensors takes one pass over its values, rather than a call
+        # per value.
+        leaf_types = [type(v) for v in data.values()]
+
+        def flatten_leaves(d: Any, out: List[Any]) -> None:
+            if type(d) is not data_type or len(d) != len(keys):
+                raise _LayoutMismatch()
+            try:
+                values = [d[k] for k in keys]
+            except KeyError:
+                raise _LayoutMismatch()
+            if [type(v) for v in values] != leaf_types:
+                raise _LayoutMismatch()
+            out.extend(values)
+
+        def unflatten_leaves(leaves: Iterator[Any]) -> Any:
+            return dict(zip(keys, itertools.islice(leaves, len(keys))))
+
+        return flatten_leaves, unflatten_leaves
+
+    children = [(k, _compile_layout(data[k])) for k in keys]
+    flatteners = tuple((k, flatten) for k, (flatten, _) in children)
+    unflatteners = tuple((k, unflatten) for k, (_, unflatten) in children)
+
+    def flatten_dict(d: Any, out: List[Any]) -> None:
+        if type(d) is not data_type or len(d) != len(keys):
+            raise _LayoutMismatch()
+        try:
+            for k, flatten in flatteners:
+                flatten(d[k], out)
+        except KeyError:
+            raise _LayoutMismatch()
+
+    def unflatten_dict(leaves: Iterator[Any]) -> Any:
+        return {k: unflatten(leaves) for k, unflatten in unflatteners}
+
+    return flatten_dict, unflatten_dict
+
+
+def _compile_seq_layout(data: Union[List[Any], Tuple[Any, ...]]) -> Tuple[_Flatten, _Unflatten]:
+    data_type = type(data)
+    result_type = list if isinstance(data, list) else tuple  # type: Callable[[Iterator], Any]
+    length = len(data)
+
+    if not any(_is_container(d) for d in data):
+        leaf_types = [type(d) for d in data]
+
+        def flatten_leaves(s: Any, out: List[Any]) -> None:
+            if type(s) is not data_type or [type(d) for d in s] != leaf_types:
+                raise _LayoutMismatch()
+            out.extend(s)
+
+        def unflatten_leaves(leaves: Iterator[Any]) -> Any:
+            return result_type(itertools.islice(leaves, length))
+
+        return flatten_leaves, unflatten_leaves
+
+    children = [_compile_layout(d) for d in data]
+    flatteners = tuple(flatten for flatten, _ in children)
+    unflatteners = tuple(unflatten for _, unflatten in children)
+
+    def flatten_seq(s: Any, out: List[Any]) -> None:
+        if type(s) is not data_type or len(s) != length:
+            raise _LayoutMismatch()
+        for d, flatten in zip(s, flatteners):
+            flatten(d, out)
+
+    def unflatten_seq(leaves: Iterator[Any]) -> Any:
+        return result_type(unflatten(leaves) for unflatten in unflatteners)
+
+    return flatten_seq, unflatten_seq
+
+
+class _BatchLayout:
+    """
+    The nesting of the dicts, lists, and tuples in a batch, recorded from one batch so that later
+    batches which are laid out the same way can be taken apart into their leaves and put back
+    together without inspecting each of their containers again.
+    """
+
+    def __init__(self, data: Any) -> None:
+        self._flatten, self._unflatten = _compile_layout(data)
+
+    def flatten(self, data: Any) -> Optional[List[Any]]:
+        """Return the leaves of data, or None if data is not laid out like the recorded batch."""
+        leaves = []  # type: List[Any]
+        try:
+            self._flatten(data, leaves)
+        except _LayoutMismatch:
+            return None
+        return leaves
+
+    def unflatten(self, leaves: List[Any]) -> Any:
+        return self._unflatten(iter(leaves))
+
+
+class _ToDevicePlan:
+    """
+    to_device(), compiled for batches laid out like the batch the plan is built from.
+
+    Which leaves are tensors, arrays, or other objects with a to() method is decided once, when the
+    plan is built, as are the warnings about leaves which cannot be moved.  Moving a batch is then
+    a single pass over its leaves.
+
+    With coalesce=True, host tensors of the same dtype are copied into one buffer, which is moved
+    to the device in a single transfer and split back into views of that buffer.  This trades a
+    host-side copy for far fewer transfers when batches hold many small tensors.
+    """
+
+    def __init__(self, data: Any, warned_types: Set[Type], coalesce: bool = False) -> None:
+        self._layout = _BatchLayout(data)
+        self._warned_types = warned_types
+        self._coalesce = coalesce
+
+        self._tensors = []  # type: List[int]
+        self._arrays = []  # type: List[int]
+        self._others = []  # type: List[int]
+        for i, leaf in enumerate(cast(List[Any], self._layout.flatten(data))):
+            if isinstance(leaf, torch.Tensor):
+                self._tensors.append(i)
+            elif isinstance(leaf, np.ndarray):
+                self._arrays.append(i)
+            elif hasattr(leaf, "to") and callable(leaf.to):
+                self._others.append(i)
+            else:
+                _warn_cannot_move(leaf, warned_types)
+
+    def move(
+        self, data: Any, device: torch.device, pin: bool = False
+    ) -> Optional[Tuple[Any, List[torch.Tensor]]]:
+        """
+        Return data moved to device along with its tensors, or None if data is not laid out like
+        the batch the plan was built from.  With pin=True, host tensors are pinned first and
+        copied asynchronously.
+        """
+        leaves = self._layout.flatten(data)
+        if leaves is None:
+            return None
+
+        tensors = self._tensors
+        if self._arrays:
+            tensors = list(tensors)
+            for i in self._arrays:
+                array = leaves[i]
+                if array.dtype.kind in "fciub":
+                    leaves[i] = torch.from_numpy(array)
+                    tensors.append(i)
+                else:
+                    _warn_cannot_move(array, self._warned_types)
+
+        uncoalesced = tensors
+        if self._coalesce and len(tensors) > 1 and device.type != "cpu":
+            uncoalesced = self._move_coalesced(leaves, tensors, device, pin)
+        for i in uncoalesced:
+            leaf = leaves[i]
+            if pin and leaf.device.type == "cpu" and not leaf.is_pinned():
+                leaf = leaf.pin_memory()
+            leaves[i] = leaf.to(device, non_blocking=pin)
+        for i in self._others:
+            leaves[i] = leaves[i].to(device)
+
+        return self._layout.unflatten(leaves), [leaves[i] for i in tensors]
+
+    def _move_coalesced(
+        self, leaves: List[Any], tensors: List[int], device: torch.device, pin: bool
+    ) -> List[int]:
+        """
+        Move the host tensors among leaves in one transfer per dtype, and return the indices of the
+        tensors which are left to move one at a time.
+        """
+        groups = {}  # type: Dict[torch.dtype, List[int]]
+        rest = []
+        for i in tensors:
+            leaf = leaves[i]
+            if leaf.device.type == "cpu" and leaf.device != device and not leaf.requires_grad:
+                groups.setdefault(leaf.dtype, []).append(i)
+            else:
+                rest.append(i)
+
+        for group in groups.values():
+            if len(group) == 1:
+                rest.extend(group)
+                continue
+            buffer = torch.cat([leaves[i].reshape(-1) for i in group])
+            if pin:
+                buffer = buffer.pin_memory()
+            sizes = [leaves[i].numel() for i in group]
+            parts = buffer.to(device, non_blocking=pin).split(sizes)  # type: ignore
+            for i, part in zip(group, parts):
+                leaves[i] = part.view(leaves[i].shape)
+        return rest
+
+
+def _warn_cannot_move(data: Any, warned_types: Set[Type]) -> None:
     if type(data) not in warned_types:
         warned_types.add(type(data))
         logger.warning(f"Was not able to move data item of type '{type(data).__name__}' to device.")
 
-    return data  # type:ignore
+
+class _DevicePrefetcher:
+    """
+    Iterate over the batches of a data loader iterator, moved to a device one batch ahead.
+
+    As soon as a batch is handed out, the next batch is read and its tensors are pinned and copied
+    to the device on a side CUDA stream, so that the copy overlaps with whatever the caller does
+    with the batch which was handed out.  On any other device, batches take the same path but are
+    copied synchronously.
+
+    Batches are moved with a _ToDevicePlan built from the first batch, and rebuilt whenever a batch
+    is laid out differently from the one before.
+    """
+
+    def __init__(
+        self,
+        iterator: Iterator[Any],
+        device: Union[str, torch.device],
+        warned_types: Optional[Set[Type]] = None,
+        coalesce: bool = False,
+    ) -> None:
+        self._iterator = iterator
+        self._device = torch.device(device)
+        self._warned_types = warned_types if warned_types is not None else set()
+        self._coalesce = coalesce
+        self._plan = None  # type: Optional[_ToDevicePlan]
+        self._stream = None  # type: Optional[torch.cuda.Stream]
+        if self._device.type == "cuda":
+            self._stream = torch.cuda.Stream(self._device)  # type: ignore
+
+        # The next batch, already on its way to the device, along with its tensors.  The first
+        # batch is not read until it is asked for.
+        self._next = None  # type: Optional[Tuple[Any, List[torch.Tensor]]]
+        self._error = None  # type: Optional[BaseException]
+        self._started = False
+
+    def __iter__(self) -> "_DevicePrefetcher":
+        return self
+
+    def __next__(self) -> Any:
+        if not self._started:
+            self._started = True
+            self._prefetch()
+        if self._next is None:
+            error, self._error = self._error, None
+            if error is not None:
+                raise error
+            raise StopIteration
+
+        batch, tensors = self._next
+        if self._stream is not None:
+            current = torch.cuda.current_stream(self._device)
+            current.wait_stream(self._stream)  # type: ignore
+            for tensor in tensors:
+                # The tensors were allocated on the side stream; keep their memory from being
+                # reused until the work queued on the current stream is done with them.
+                tensor.record_stream(current)
+        self._prefetch()
+        return batch
+
+    def _prefetch(self) -> None:
+        self._next = None
+        try:
+            batch = next(self._iterator)
+        except StopIteration:
+            return
+        except Exception as e:
+            # Hand out the batch that is already on the device before raising.
+            self._error = e
+            return
+
+        if self._stream is None:
+            self._next = self._to_device(batch)
+            return
+        with torch.cuda.stream(self._stream):
+            self._next = self._to_device(batch)
+
+    def _to_device(self, batch: Any) -> Tuple[Any, List[torch.Tensor]]:
+        pin = self._stream is not None
+        moved = self._plan.move(batch, self._device, pin) if self._plan is not None else None
+        if moved is None:
+            self._plan = _ToDevicePlan(batch, self._warned_types, self._coalesce)
+            moved = cast(Tuple[Any, List[torch.Tensor]], self._plan.move(batch, self._device, pin))
+        return moved
@@ -20,6 +20,9 @@ class PyTorchExperimentalContext:
         self._auto_amp = False
         self._data_repro_checks_disabled = False
         self._auto_to_device = True
+        self._defer_metrics_transfer = False
+        self._prefetch_to_device = False
+        self._coalesce_to_device = False
 
     def use_amp(self) -> None:
         """
@@ -84,3 +87,47 @@ class PyTorchExperimentalContext:
         """
         self._auto_to_device = False
         logger.info("disabled automatically moving data to device")
+
+    def defer_metrics_transfer(self) -> None:
+        """
+        Keep the metrics returned by ``train_batch`` on device until they are reported, instead of
+        copying them to the CPU after every batch.
+
+        Copying a metric off of a GPU waits for all of the work queued on the GPU to finish, so
+        doing it every batch stalls the training loop once per batch.  With this option, the
+        metrics of every batch in a reporting period are copied together when the period ends.
+
+        The tensors returned by ``train_batch`` are held until then, so do not modify them in place
+        in later batches.
+        """
+        self._defer_metrics_transfer = True
+        logger.info("deferring transfer of training metrics to host")
+
+    def prefetch_to_device(self) -> None:
+        """
+        Move each training batch to the device while the previous batch trains, instead of at the
+        start of its own ``train_batch`` call.
+
+        The training data loader is read one batch ahead.  On a GPU, the tensors of that batch are
+        copied to pinned memory and then to the device on a separate CUDA stream, so that the copy
+        overlaps with training on the previous batch.  Returning a ``DataLoader`` created with
+        ``pin_memory=True`` saves the copy to pinned memory.  On a CPU, batches are still read one
+        batch ahead but are otherwise handled as usual.
+
+        This has no effect if :meth:`disable_auto_to_device` was called.
+        """
+        self._prefetch_to_device = True
+        logger.info("prefetching training batches to device")
+
+    def coalesce_to_device(self) -> None:
+        """
+        Move the tensors of each batch to the device in one transfer per dtype, instead of one
+        transfer per tensor.
+
+        The tensors of the same dtype are copied into one buffer on the host, and after the buffer
+        is moved, the tensors of the batch on the device are views into it.  This saves time when
+        batches hold many small tensors, such as dicts of token features, at the cost of an extra
+        copy on the host.  Do not resize the tensors of a batch in place with this option.
+        """
+        self._coalesce_to_device = True
+        logger.info("coalescing transfers of batches to device")
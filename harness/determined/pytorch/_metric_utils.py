@@ -1,3 +1,4 @@
+import itertools
 import logging
 from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
@@ -30,36 +31,87 @@ def _average_training_metrics(
     combined_timeseries: Dict[str, Any], combined_num_batches: List[int]
 ) -> List[Dict[str, Any]]:
     """Average combined training metrics across GPUs"""
-    # If the value for a metric is a single-element array, the averaging process will
-    # change that into just the element. We record what metrics are single-element arrays
-    # so we can wrap them in an array later (for perfect compatibility with non-averaging
-    # codepath).
-    array_metrics = []
-    for metric_name in combined_timeseries.keys():
-        process_batches = combined_timeseries[metric_name]
-        if isinstance(process_batches[0][0], np.ndarray):
-            array_metrics.append(metric_name)
-
     num_batches = combined_num_batches[0]  # num_batches matches across data parallel ranks.
-    num_processes = len(combined_num_batches)
     averaged_metrics_timeseries = {}  # type: Dict[str, List]
 
-    for metric_name in combined_timeseries.keys():
-        averaged_metrics_timeseries[metric_name] = []
-        for batch_idx in range(num_batches):
-            batch = [
-                combined_timeseries[metric_name][process_idx][batch_idx]
-                for process_idx in range(num_processes)
-            ]
-
-            np_batch = np.array(batch)
-            batch_avg = np.mean(np_batch[np_batch != None])  # noqa: E711
-            if metric_name in array_metrics:
-                batch_avg = np.array(batch_avg)
-            averaged_metrics_timeseries[metric_name].append(batch_avg)
+    for metric_name, process_batches in combined_timeseries.items():
+        # If the value for a metric is a single-element array, the averaging process will
+        # change that into just the element. We record what metrics are single-element arrays
+        # so we can wrap them in an array later (for perfect compatibility with non-averaging
+        # codepath).
+        is_array = isinstance(process_batches[0][0], np.ndarray)
+        columns = _average_metric_columns(process_batches, num_batches)
+        if columns is not None:
+            batch_avgs = list(columns)
+        else:
+            batch_avgs = _average_metric_by_batch(
+                [batches[:num_batches] for batches in process_batches]
+            )
+        if is_array:
+            batch_avgs = [np.array(batch_avg) for batch_avg in batch_avgs]
+        averaged_metrics_timeseries[metric_name] = batch_avgs
     return util._dict_to_list(averaged_metrics_timeseries)
 
 
+def _average_metric_columns(
+    process_batches: List[List[Any]], num_batches: int
+) -> Optional[np.ndarray]:
+    """
+    Average one metric across processes with a single reduction, by stacking every process's
+    timeseries into one (processes, batches, ...) array.  Processes which did not report a value
+    for a batch report None, which is masked out.
+
+    Returns None for values which do not stack into a numeric array, such as non-numeric metrics
+    or arrays whose shapes differ between batches.
+    """
+    first = process_batches[0][0]
+    stacked = None  # type: Optional[np.ndarray]
+    if isinstance(first, (np.ndarray, np.generic)) and first.shape == ():
+        # Metrics converted from tensors are all 0-d arrays of one dtype, which can be read
+        # straight into a typed array without inspecting every value.
+        try:
+            stacked = np.fromiter(
+                itertools.chain.from_iterable(
+                    itertools.islice(batches, num_batches) for batches in process_batches
+                ),
+                dtype=first.dtype,
+                count=len(process_batches) * num_batches,
+            ).reshape(len(process_batches), num_batches)
+        except (TypeError, ValueError):
+            pass
+    if stacked is None:
+        try:
+            stacked = np.array([batches[:num_batches] for batches in process_batches])
+        except ValueError:
+            return None
+
+    if stacked.dtype == object:
+        if stacked.ndim != 2:
+            return None
+        mask = stacked == None  # noqa: E711
+        try:
+            values = np.where(mask, 0, stacked).astype(np.float64)
+        except (TypeError, ValueError):
+            return None
+        # Batches which no process reported average to NaN.
+        with np.errstate(invalid="ignore"):
+            return cast(np.ndarray, values.sum(axis=0) / (~mask).sum(axis=0))
+
+    if not np.issubdtype(stacked.dtype, np.number) and stacked.dtype != np.bool_:
+        return None
+    # Array-valued metrics are averaged over all of their elements, as well as over processes.
+    axes = tuple(axis for axis in range(stacked.ndim) if axis != 1)
+    return cast(np.ndarray, np.mean(stacked, axis=axes))
+
+
+def _average_metric_by_batch(process_batches: List[List[Any]]) -> List[Any]:
+    batch_avgs = []
+    for batch_idx in range(len(process_batches[0])):
+        np_batch = np.array([batches[batch_idx] for batches in process_batches])
+        batch_avgs.append(np.mean(np_batch[np_batch != None]))  # noqa: E711
+    return batch_avgs
+
+
 def _combine_metrics_across_processes(
     context: det.core.DistributedContext, metrics: Dict[str, Any], num_batches: int
 ) -> Tuple[Optional[Dict[str, Any]], Optional[List[int]]]:
@@ -134,6 +186,49 @@ def _convert_metrics_to_numpy(metrics: Dict[str, Any]) -> Dict[str, Any]:
     return metrics
 
 
+def _transfer_metrics_to_host(per_batch_metrics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert per-batch metrics which were left on device to NumPy, with one stacked copy per metric
+    rather than one copy, and one device synchronization, per metric per batch.
+    """
+    hosts = {}  # type: Dict[str, torch.Tensor]
+    devices = set()
+    for name in {name for batch in per_batch_metrics for name in batch}:
+        tensors = [batch.get(name) for batch in per_batch_metrics]
+        first = tensors[0]
+        if not isinstance(first, torch.Tensor) or not all(
+            isinstance(t, torch.Tensor)
+            and (t.shape, t.dtype, t.device) == (first.shape, first.dtype, first.device)
+            for t in tensors
+        ):
+            continue
+        stacked = torch.stack(cast(List[torch.Tensor], tensors))
+        if stacked.is_cuda:
+            hosts[name] = torch.empty(stacked.shape, dtype=stacked.dtype, pin_memory=True)
+            hosts[name].copy_(stacked, non_blocking=True)
+            devices.add(stacked.device)
+        else:
+            hosts[name] = stacked
+
+    # Wait once for all of the copies to land in host memory.
+    for device in devices:
+        torch.cuda.synchronize(device)
+
+    host_metrics = {name: host.numpy() for name, host in hosts.items()}
+    out = []
+    for i, batch in enumerate(per_batch_metrics):
+        converted = {}
+        for name, value in batch.items():
+            if name in host_metrics:
+                # Index with an Ellipsis so that scalars stay 0-d arrays, like Tensor.numpy().
+                value = host_metrics[name][i, ...]
+            elif isinstance(value, torch.Tensor):
+                value = value.cpu().numpy()
+            converted[name] = value
+        out.append(converted)
+    return out
+
+
 def _reduce_metrics(
     context: det.core.DistributedContext,
     batch_metrics: List,
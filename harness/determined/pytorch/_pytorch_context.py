@@ -3,7 +3,19 @@ import logging
 import pathlib
 import time
 import warnings
-from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 import torch
 from torch import nn
@@ -33,6 +45,10 @@ except ImportError:  # pragma: no cover
     pass
 
 
+# How many batch layouts to_device() keeps compiled plans for.
+MAX_TO_DEVICE_PLANS = 4
+
+
 class PyTorchTrialContext(pytorch._PyTorchReducerContext):
     """Contains runtime information for any Determined workflow that uses the ``PyTorch`` API.
 
@@ -88,6 +104,8 @@ class PyTorchTrialContext(pytorch._PyTorchReducerContext):
 
         # Track which types we have issued warnings for in to_device().
         self._to_device_warned_types = set()  # type: Set[Type]
+        # Plans for the layouts most recently passed to to_device(), most recent first.
+        self._to_device_plans = []  # type: List[pytorch._ToDevicePlan]
 
         # The following attributes are initialized during the lifetime of
         # a PyTorchTrialContext.
@@ -500,7 +518,19 @@ class PyTorchTrialContext(pytorch._PyTorchReducerContext):
         allocated device. This method aims at providing a function for the data generated
         on the fly.
         """
-        return pytorch.to_device(data, self.device, self._to_device_warned_types)
+        for i, plan in enumerate(self._to_device_plans):
+            moved = plan.move(data, self.device)
+            if moved is not None:
+                if i:
+                    self._to_device_plans.insert(0, self._to_device_plans.pop(i))
+                return moved[0]  # type: ignore
+
+        plan = pytorch._ToDevicePlan(
+            data, self._to_device_warned_types, self.experimental._coalesce_to_device
+        )
+        self._to_device_plans.insert(0, plan)
+        del self._to_device_plans[MAX_TO_DEVICE_PLANS:]
+        return cast(Tuple[Any, List[torch.Tensor]], plan.move(data, self.device))[0]  # type: ignore
 
     def wrap_scaler(self, scaler: Any) -> Any:
         """
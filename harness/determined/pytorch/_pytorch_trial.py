@@ -95,6 +95,9 @@ class _PyTorchTrialController:
         self.global_batch_size = global_batch_size
         self.profiling_enabled = profiling_enabled
 
+        # Whether training batches arrive already moved to device, by _make_training_iterator().
+        self._prefetching = False
+
         self.callbacks = self.trial.build_callbacks()
         for callback in self.callbacks.values():
             if util.is_overridden(callback.on_checkpoint_end, pytorch.PyTorchCallback):
@@ -163,6 +166,9 @@ class _PyTorchTrialController:
         # torch.backends.cudnn.benchmark = False
 
     def _aggregate_training_metrics(self, training_metrics: List[Dict]) -> Dict:
+        if self.context.experimental._defer_metrics_transfer:
+            training_metrics = pytorch._transfer_metrics_to_host(training_metrics)
+
         # Aggregate and reduce training metrics from all the training processes.
         if self.context.distributed.size > 1:
             batch_metrics = pytorch._combine_and_average_training_metrics(
@@ -342,6 +348,24 @@ class _PyTorchTrialController:
                     )
                 self.validation_loader = validation_data
 
+    def _make_training_iterator(self) -> Iterator:
+        iterator = iter(self.training_loader)
+        if not self.context.experimental._prefetch_to_device:
+            return iterator
+        if not self.context.experimental._auto_to_device:
+            logger.warning(
+                "Not prefetching training batches to device, since automatically moving data to "
+                "device was disabled."
+            )
+            return iterator
+        self._prefetching = True
+        return pytorch._DevicePrefetcher(
+            iterator,
+            self.context.device,
+            self.context._to_device_warned_types,
+            self.context.experimental._coalesce_to_device,
+        )
+
     def _step_batch(self) -> None:
         assert self.state
         self.state.batches_trained += 1
@@ -425,7 +449,7 @@ class _PyTorchTrialController:
             #
             # We create it before loading state because we don't want the training_iterator
             # shuffling values after we load state.
-            self.training_iterator = iter(self.training_loader)
+            self.training_iterator = self._make_training_iterator()
             self.training_enumerator = enumerate(
                 dataloader_next(self.training_iterator), start=self.start_from_batch
             )
@@ -676,7 +700,7 @@ class _PyTorchTrialController:
 
         batch_start_time = time.time()
 
-        if self.context.experimental._auto_to_device:
+        if self.context.experimental._auto_to_device and not self._prefetching:
             batch = self.context.to_device(batch)  # type: ignore
 
         with contextlib.ExitStack() as exit_stack:
@@ -713,7 +737,11 @@ class _PyTorchTrialController:
             # `det.util.encode_json` handles them properly without
             # needing a dependency on PyTorch.
             if isinstance(metric, torch.Tensor):
-                metric = metric.cpu().detach().numpy()
+                if self.context.experimental._defer_metrics_transfer:
+                    # Left on device until _aggregate_training_metrics.
+                    metric = metric.detach()
+                else:
+                    metric = metric.cpu().detach().numpy()
             training_metrics[name] = metric
 
         batch_dur = time.time() - batch_start_time
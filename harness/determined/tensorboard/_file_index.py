@@ -0,0 +1,227 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import pathlib
+import stat
+import struct
+import sys
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger("determined.tensorboard")
+
+# inotify(7) event masks.
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# A directory listing is only trusted while the directory's mtime is unchanged if the listing was
+# taken at least this long after that mtime, since mtimes are too coarse to order changes within
+# the same tick.
+_MTIME_GRANULARITY_NS = 1_000_000_000
+
+
+class _InotifyWatcher:
+    """
+    A minimal ctypes wrapper around Linux's inotify, reporting which files and directories changed
+    in a set of watched directories.
+    """
+
+    _MASK = (
+        _IN_MODIFY
+        | _IN_ATTRIB
+        | _IN_CLOSE_WRITE
+        | _IN_CREATE
+        | _IN_MOVED_FROM
+        | _IN_MOVED_TO
+        | _IN_DELETE_SELF
+        | _IN_MOVE_SELF
+        | _IN_ONLYDIR
+    )
+
+    def __init__(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+        self._dirs = {}  # type: Dict[int, str]
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+    def watch(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self._MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_add_watch({path}): {os.strerror(err)}")
+        self._dirs[wd] = path
+
+    def read_changes(self) -> Optional[Tuple[Set[str], Set[str]]]:
+        """
+        Return the (files, directories) which changed or appeared since the last call, or None if
+        changes may have been missed and the watched tree must be scanned again.
+        """
+        files = set()  # type: Set[str]
+        dirs = set()  # type: Set[str]
+        complete = True
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+
+                if mask & _IN_IGNORED:
+                    # The directory was removed, or its watch otherwise went away.
+                    self._dirs.pop(wd, None)
+                    continue
+                if mask & (_IN_Q_OVERFLOW | _IN_MOVE_SELF) or (
+                    mask & _IN_MOVED_FROM and mask & _IN_ISDIR
+                ):
+                    # Events were dropped, or a watched directory now lives at a path we don't
+                    # know about.
+                    complete = False
+                    continue
+                parent = self._dirs.get(wd)
+                if parent is None or not name:
+                    continue
+                path = os.path.join(parent, name)
+                if not mask & _IN_ISDIR:
+                    files.add(path)
+                elif mask & (_IN_CREATE | _IN_MOVED_TO):
+                    dirs.add(path)
+        return (files, dirs) if complete else None
+
+
+class FileIndex:
+    """
+    FileIndex finds the files under a directory which have been modified since a given time,
+    without re-reading the whole tree on every call.
+
+    Each directory's listing is cached and is only read again once the directory's mtime changes,
+    so a scan costs a single stat() per directory and per file.  On Linux, the tree is also watched
+    with inotify, after which a call only stats the files which inotify reported as changed, as
+    long as ``since`` never moves backwards between calls.  Files which an earlier call already
+    returned are then only returned again if they have changed since.
+    """
+
+    def __init__(self, base_path: pathlib.Path, use_inotify: bool = True) -> None:
+        self._base_path = str(base_path)
+        # path -> (mtime_ns, listed_at_ns, subdirectories, files)
+        self._listings = {}  # type: Dict[str, Tuple[int, int, List[str], List[str]]]
+        self._use_inotify = use_inotify and sys.platform == "linux"
+        self._watcher = None  # type: Optional[_InotifyWatcher]
+        self._last_since = None  # type: Optional[float]
+
+    def close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
+    def modified_since(self, since: float) -> List[pathlib.Path]:
+        if not os.path.isdir(self._base_path):
+            self.close()
+            return []
+
+        changes = None
+        if self._watcher is not None and self._last_since is not None and since >= self._last_since:
+            changes = self._watcher.read_changes()
+        self._last_since = since
+
+        if changes is None:
+            self.close()
+            if self._use_inotify:
+                try:
+                    self._watcher = _InotifyWatcher()
+                except (AttributeError, OSError) as e:
+                    logger.debug(f"Not watching tensorboard files with inotify: {e}")
+                    self._use_inotify = False
+            return [pathlib.Path(p) for p in self._scan(self._base_path, since)]
+
+        files, dirs = changes
+        modified = {p for p in files if _is_modified_file(p, since)}
+        for path in dirs:
+            modified.update(self._scan(path, since))
+        return [pathlib.Path(p) for p in modified]
+
+    def _scan(self, root: str, since: float) -> List[str]:
+        out = []  # type: List[str]
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            if self._watcher is not None:
+                # Watch before listing, so nothing created in between goes unnoticed.
+                try:
+                    self._watcher.watch(path)
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    # Most likely, the inotify watch limit was reached.
+                    logger.warning(f"Not watching tensorboard files with inotify: {e}")
+                    self._use_inotify = False
+                    self.close()
+            listing = self._list_directory(path)
+            if listing is None:
+                continue
+            subdirs, files = listing
+            stack.extend(subdirs)
+            out.extend(p for p in files if _is_modified_file(p, since))
+        return out
+
+    def _list_directory(self, path: str) -> Optional[Tuple[List[str], List[str]]]:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            self._listings.pop(path, None)
+            return None
+
+        cached = self._listings.get(path)
+        if cached and cached[0] == mtime_ns and cached[1] - mtime_ns > _MTIME_GRANULARITY_NS:
+            return cached[2], cached[3]
+
+        listed_at_ns = time.time_ns()
+        subdirs, files = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    else:
+                        files.append(entry.path)
+        except (FileNotFoundError, NotADirectoryError):
+            self._listings.pop(path, None)
+            return None
+        if cached:
+            # Forget everything under directories which are gone.
+            removed = tuple(os.path.join(d, "") for d in set(cached[2]) - set(subdirs))
+            if removed:
+                for p in [p for p in self._listings if os.path.join(p, "").startswith(removed)]:
+                    del self._listings[p]
+        self._listings[path] = (mtime_ns, listed_at_ns, subdirs, files)
+        return subdirs, files
+
+
+def _is_modified_file(path: str, since: float) -> bool:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return False
+    return stat.S_ISREG(st.st_mode) and st.st_mtime > since
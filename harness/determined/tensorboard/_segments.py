@@ -0,0 +1,30 @@
+"""
+Naming for the segments of append-only files uploaded to object storage.
+
+A tfevents file is only ever appended to, so after it has been uploaded once, each later sync only
+uploads the bytes appended since, as a segment object named after the file and the byte range it
+covers.  Fetchers write each segment at its offset in their local copy of the file.
+"""
+import re
+from typing import Optional, Tuple
+
+_SEGMENT_PATTERN = re.compile(r"^(.*)\.segment-(\d{20})-(\d{20})$")
+
+
+def is_appendable(name: str) -> bool:
+    return "tfevents" in name
+
+
+def segment_name(name: str, start: int, end: int) -> str:
+    return f"{name}.segment-{start:020d}-{end:020d}"
+
+
+def parse_segment_name(name: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Return the name of the file a segment belongs to and the byte range it covers, or None if name
+    is not a segment.
+    """
+    match = _SEGMENT_PATTERN.match(name)
+    if match is None:
+        return None
+    return match.group(1), int(match.group(2)), int(match.group(3))
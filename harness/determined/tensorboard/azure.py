@@ -1,4 +1,5 @@
 import logging
+import pathlib
 from typing import Any, List, Optional
 
 from determined.tensorboard import base
@@ -33,16 +34,21 @@ class AzureTensorboardManager(base.TensorboardManager):
         path_info_list: List[base.PathUploadInfo],
     ) -> None:
         for path_info in path_info_list:
-            path = path_info.path
-            mangled_relative_path = path_info.mangled_relative_path
-            mangled_path = self.sync_path.joinpath(mangled_relative_path)
-
-            logger.debug(f"Uploading {path} to Azure: {self.container}/{mangled_path}")
-            self.client.put(
-                f"{self.container}/{mangled_path.parent}",
-                mangled_path.name,
-                path,
-            )
+            self._sync_file(path_info)
+
+    def _upload_file(self, path: pathlib.Path, mangled_path: pathlib.Path) -> None:
+        logger.debug(f"Uploading {path} to Azure: {self.container}/{mangled_path}")
+        self.client.put(
+            f"{self.container}/{mangled_path.parent}",
+            mangled_path.name,
+            path,
+        )
+
+    def _upload_bytes(self, data: bytes, mangled_path: pathlib.Path) -> None:
+        self.client.put_data(f"{self.container}/{mangled_path.parent}", mangled_path.name, data)
+
+    def _delete_files(self, mangled_paths: List[pathlib.Path]) -> None:
+        self.client.delete_files(self.container, [str(p) for p in mangled_paths])
 
     def delete(self) -> None:
         files = self.client.list_files(self.container, self.sync_path)
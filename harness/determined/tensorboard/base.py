@@ -5,10 +5,11 @@ import pathlib
 import queue
 import threading
 import time
-from typing import Any, Callable, List
+from typing import Any, Callable, Dict, List
 
 from determined import tensorboard
 from determined.common import util
+from determined.tensorboard import _file_index, _segments
 
 logger = logging.getLogger("determined.tensorboard")
 
@@ -19,6 +20,13 @@ class PathUploadInfo:
     mangled_relative_path: pathlib.Path
 
 
+@dataclasses.dataclass
+class _UploadedFile:
+    mangled_path: pathlib.Path
+    size: int
+    segments: List[pathlib.Path]
+
+
 class TensorboardManager(metaclass=abc.ABCMeta):
     """
     TensorboardManager stores tensorboard logs (tfevent files, .gz zipped archives,
@@ -29,6 +37,11 @@ class TensorboardManager(metaclass=abc.ABCMeta):
 
     Each supported persistent storage backend must define a subclass which
     implements the sync method.
+
+    Object storage backends may instead implement _upload_file, _upload_bytes, and _delete_files,
+    and sync each file with _sync_file.  With append_uploads, a tfevents file is then only uploaded
+    whole the first time it is synced; later syncs upload just the bytes appended since as segment
+    objects, which are compacted back into the whole file on close.
     """
 
     def __init__(
@@ -37,10 +50,17 @@ class TensorboardManager(metaclass=abc.ABCMeta):
         sync_path: pathlib.Path,
         async_upload: bool = True,
         sync_on_close: bool = True,
+        append_uploads: bool = True,
     ) -> None:
         self.base_path = base_path
         self.sync_path = sync_path
         self.last_sync = 0.0
+        self._file_index = _file_index.FileIndex(base_path)
+        # Checkpoints uploaded in the background also trigger syncs, so syncs may come from
+        # multiple threads.
+        self._sync_lock = threading.RLock()
+        self._append_uploads = append_uploads
+        self._uploaded = {}  # type: Dict[pathlib.Path, _UploadedFile]
 
         self.upload_thread = None
         if async_upload:
@@ -57,18 +77,12 @@ class TensorboardManager(metaclass=abc.ABCMeta):
         and all sub-directories that have been modified since a certain time.
 
         If many files have been created, the syscall to stat on each of them can be quite
-        expensive, taking on the order of 1ms for every 100 files. Each file gets stat'd every call
-        to this function, which can be a bottleneck late in training or in local training when many
-        files exist but few or none need to be re-synced.
+        expensive, taking on the order of 1ms for every 100 files.  The files are found with a
+        FileIndex, which avoids re-reading unchanged directories and, where inotify is available,
+        only stats the files which changed since the previous call.
         """
-
-        if not self.base_path.exists():
-            return []
-        return [
-            file
-            for file in self.base_path.rglob("*")
-            if file.stat().st_mtime > since and file.is_file() and selector(file)
-        ]
+        with self._sync_lock:
+            return [file for file in self._file_index.modified_since(since) if selector(file)]
 
     def to_sync(
         self,
@@ -87,16 +101,78 @@ class TensorboardManager(metaclass=abc.ABCMeta):
         """
         pass
 
+    def _upload_file(self, path: pathlib.Path, mangled_path: pathlib.Path) -> None:
+        raise NotImplementedError
+
+    def _upload_bytes(self, data: bytes, mangled_path: pathlib.Path) -> None:
+        raise NotImplementedError
+
+    def _delete_files(self, mangled_paths: List[pathlib.Path]) -> None:
+        raise NotImplementedError
+
+    def _sync_file(self, path_info: PathUploadInfo) -> None:
+        path = path_info.path
+        mangled_path = self.sync_path.joinpath(path_info.mangled_relative_path)
+        if not self._append_uploads or not _segments.is_appendable(path.name):
+            self._upload_file(path, mangled_path)
+            return
+
+        size = path.stat().st_size
+        uploaded = self._uploaded.get(path)
+        if uploaded is None or size < uploaded.size:
+            # The file is new, or was rewritten rather than appended to.  The size is taken before
+            # uploading, so the next segment may overlap the end of the upload, but never leave a
+            # gap after it.
+            self._upload_file(path, mangled_path)
+            if uploaded is not None and uploaded.segments:
+                self._delete_files(uploaded.segments)
+            self._uploaded[path] = _UploadedFile(mangled_path, size, [])
+            return
+
+        if size == uploaded.size:
+            return
+        with path.open("rb") as f:
+            f.seek(uploaded.size)
+            data = f.read(size - uploaded.size)
+        end = uploaded.size + len(data)
+        segment = mangled_path.with_name(
+            _segments.segment_name(mangled_path.name, uploaded.size, end)
+        )
+        logger.debug(f"Uploading bytes {uploaded.size}-{end} of {path} to {segment}")
+        self._upload_bytes(data, segment)
+        uploaded.segments.append(segment)
+        uploaded.size = end
+
+    def _compact(self) -> None:
+        """
+        Replace the segments of each file uploaded in pieces with a single upload of the whole file.
+        """
+        with self._sync_lock:
+            for path, uploaded in self._uploaded.items():
+                if not uploaded.segments:
+                    continue
+                try:
+                    size = path.stat().st_size
+                    self._upload_file(path, uploaded.mangled_path)
+                    self._delete_files(uploaded.segments)
+                except Exception as e:
+                    # The segments remain usable as they are.
+                    logger.warning(f"Failed to compact uploaded segments of {path}: {e}")
+                    continue
+                uploaded.size = size
+                uploaded.segments = []
+
     def sync(
         self,
         selector: Callable[[pathlib.Path], bool] = lambda _: True,
         mangler: Callable[[pathlib.Path, int], pathlib.Path] = lambda p, __: p,
         rank: int = 0,
     ) -> None:
-        # Only sync a maximum of once per second to play nice with cloud storage request quotas.
-        if time.time() - self.last_sync < 1:
-            return
-        self._sync(selector, mangler, rank)
+        with self._sync_lock:
+            # Only sync a maximum of once per second to play nice with cloud storage request quotas.
+            if time.time() - self.last_sync < 1:
+                return
+            self._sync(selector, mangler, rank)
 
     def _sync(
         self,
@@ -104,16 +180,19 @@ class TensorboardManager(metaclass=abc.ABCMeta):
         mangler: Callable[[pathlib.Path, int], pathlib.Path] = lambda p, __: p,
         rank: int = 0,
     ) -> None:
-        paths = self.to_sync(selector)
-        path_list = []
-        for path in paths:
-            relative_path = path.relative_to(self.base_path)
-            mangled_relative_path = mangler(relative_path, rank)
-            path_list.append(PathUploadInfo(path=path, mangled_relative_path=mangled_relative_path))
-        if self.upload_thread is not None and self.upload_thread.is_alive():
-            self.upload_thread.upload(path_list)
-        else:
-            util.preserve_random_state(self._sync_impl)(path_list)
+        with self._sync_lock:
+            paths = self.to_sync(selector)
+            path_list = []
+            for path in paths:
+                relative_path = path.relative_to(self.base_path)
+                mangled_relative_path = mangler(relative_path, rank)
+                path_list.append(
+                    PathUploadInfo(path=path, mangled_relative_path=mangled_relative_path)
+                )
+            if self.upload_thread is not None and self.upload_thread.is_alive():
+                self.upload_thread.upload(path_list)
+            else:
+                util.preserve_random_state(self._sync_impl)(path_list)
 
     @abc.abstractmethod
     def delete(self) -> None:
@@ -131,6 +210,9 @@ class TensorboardManager(metaclass=abc.ABCMeta):
             self._sync()
         if self.upload_thread is not None and self.upload_thread.is_alive():
             self.upload_thread.close()
+        self._compact()
+        with self._sync_lock:
+            self._file_index.close()
 
     def __enter__(self) -> "TensorboardManager":
         self.start()
@@ -1,7 +1,7 @@
 import datetime
 import logging
 import os
-from typing import Any, Callable, Dict, Generator, List
+from typing import Any, BinaryIO, Callable, Dict, Generator, List
 from urllib import parse
 
 from determined.tensorboard.fetchers import base
@@ -33,6 +33,7 @@ class AzureFetcher(base.Fetcher):
         self.local_dir = local_dir
         self.storage_paths = storage_paths
         self._file_records = {}  # type: Dict[str, datetime.datetime]
+        self._pending_segments = {}  # type: Dict[str, Dict[int, bytes]]
 
     def _list(self, storage_path: str) -> Generator[str, None, None]:
         logger.debug(
@@ -54,12 +55,12 @@ class AzureFetcher(base.Fetcher):
 
     def _fetch(self, filepath: str, new_file_callback: Callable) -> None:
         local_path = os.path.join(self.local_dir, self.container_name, filepath)
-        dir_path = os.path.dirname(local_path)
-        os.makedirs(dir_path, exist_ok=True)
 
-        with open(local_path, "wb") as local_file:
+        def download(local_file: BinaryIO) -> None:
             stream = self.client.get_blob_client(self.container_name, filepath).download_blob()
             stream.readinto(local_file)
 
+        self._save(local_path, download)
+
         logger.debug(f"Downloaded file to local: {local_path}")
         new_file_callback()
@@ -1,6 +1,15 @@
 import abc
 import datetime
-from typing import Any, Callable, Dict, Generator, List
+import io
+import os
+import tempfile
+import threading
+from typing import Any, BinaryIO, Callable, Dict, Generator, List
+
+from determined.tensorboard import _segments
+
+# Fetch threads save files concurrently.
+_save_lock = threading.Lock()
 
 
 class Fetcher(metaclass=abc.ABCMeta):
@@ -11,6 +20,8 @@ class Fetcher(metaclass=abc.ABCMeta):
 
     storage_paths: List[str]
     _file_records: Dict[str, datetime.datetime] = {}
+    # Segments which arrived before the part of the file preceding them, by local path.
+    _pending_segments: Dict[str, Dict[int, bytes]] = {}
 
     @abc.abstractmethod
     def __init__(self, storage_config: Dict[str, Any], storage_paths: List[str], local_dir: str):
@@ -44,3 +55,66 @@ class Fetcher(metaclass=abc.ABCMeta):
         for storage_path in self.storage_paths:
             for filepath in self._list(storage_path):
                 yield filepath
+
+    def _save(self, local_path: str, download: Callable[[BinaryIO], None]) -> None:
+        """Save a remote file to local_path, given a function which downloads it to a file object.
+
+        Segments of append-only files are written into the file they belong to, at their offset,
+        once every byte before that offset is present.  Whole files are downloaded beside
+        local_path and moved into place, so TensorBoard never reads a partially written copy.
+        """
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+
+        segment = _segments.parse_segment_name(local_path)
+        if segment is not None:
+            local_path, start, end = segment
+            with _save_lock:
+                if _local_size(local_path) >= end:
+                    # A later upload of the whole file already covered this segment.
+                    return
+            buf = io.BytesIO()
+            download(buf)
+            with _save_lock:
+                self._pending_segments.setdefault(local_path, {})[start] = buf.getvalue()
+                self._apply_pending_segments(local_path)
+            return
+
+        # The temporary file's name must not look like a tfevents file to TensorBoard.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(local_path), prefix=".fetch-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                download(f)
+            with _save_lock:
+                os.replace(tmp_path, local_path)
+                self._apply_pending_segments(local_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _apply_pending_segments(self, local_path: str) -> None:
+        pending = self._pending_segments.get(local_path)
+        if not pending:
+            return
+        size = _local_size(local_path)
+        if size < 0:
+            return
+        with open(local_path, "r+b") as f:
+            for start in sorted(pending):
+                if start > size:
+                    break
+                data = pending.pop(start)
+                if start + len(data) > size:
+                    # Segments may overlap what is already present, but only with the same bytes.
+                    f.seek(start)
+                    f.write(data)
+                    size = start + len(data)
+        if not pending:
+            del self._pending_segments[local_path]
+
+
+def _local_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return -1
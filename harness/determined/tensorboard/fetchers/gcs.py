@@ -1,6 +1,5 @@
 import datetime
 import logging
-import os
 import posixpath
 from typing import Any, Callable, Dict, Generator, List
 from urllib import parse
@@ -21,6 +20,7 @@ class GCSFetcher(base.Fetcher):
         self.local_dir = local_dir
         self.storage_paths = storage_paths
         self._file_records = {}  # type: Dict[str, datetime.datetime]
+        self._pending_segments = {}  # type: Dict[str, Dict[int, bytes]]
 
     def _list(self, storage_path: str) -> Generator[str, None, None]:
         logger.debug(
@@ -39,10 +39,8 @@ class GCSFetcher(base.Fetcher):
 
     def _fetch(self, filepath: str, new_file_callback: Callable) -> None:
         local_path = posixpath.join(self.local_dir, self.bucket_name, filepath)
-        dir_path = os.path.dirname(local_path)
-        os.makedirs(dir_path, exist_ok=True)
 
-        self.bucket.blob(filepath).download_to_filename(local_path)
+        self._save(local_path, self.bucket.blob(filepath).download_to_file)
 
         logger.debug(f"Downloaded GCS file to local: {local_path}")
         new_file_callback()
@@ -30,6 +30,7 @@ class S3Fetcher(base.Fetcher):
         self.local_dir = local_dir
         self.storage_paths = storage_paths
         self._file_records = {}  # type: Dict[str, datetime.datetime]
+        self._pending_segments = {}  # type: Dict[str, Dict[int, bytes]]
 
     def _list(self, storage_path: str) -> Generator[str, None, None]:
         logger.debug(
@@ -54,11 +55,11 @@ class S3Fetcher(base.Fetcher):
 
     def _fetch(self, filepath: str, new_file_callback: Callable) -> None:
         local_path = os.path.join(self.local_dir, self.bucket_name, filepath)
-        dir_path = os.path.dirname(local_path)
-        os.makedirs(dir_path, exist_ok=True)
 
-        with open(local_path, "wb") as local_file:
-            self.client.download_fileobj(self.bucket_name, filepath, local_file)
+        self._save(
+            local_path,
+            lambda local_file: self.client.download_fileobj(self.bucket_name, filepath, local_file),
+        )
 
         logger.debug(f"Downloaded s3 file to local: {local_path}")
         new_file_callback()
@@ -2,13 +2,14 @@ import datetime
 import logging
 import os
 import posixpath
-import shutil
-from typing import Any, Callable, Dict, Generator, List
+from typing import Any, BinaryIO, Callable, Dict, Generator, List
 
 from determined.tensorboard.fetchers import base
 
 logger = logging.getLogger("determined.tensorboard.shared")
 
+COPY_CHUNK_SIZE = 1024 * 1024
+
 
 class SharedFSFetcher(base.Fetcher):
     def __init__(self, storage_config: Dict[str, Any], storage_paths: List[str], local_dir: str):
@@ -17,6 +18,7 @@ class SharedFSFetcher(base.Fetcher):
         self.local_dir = local_dir
         self.storage_paths = storage_paths
         self._file_records = {}  # type: Dict[str, datetime.datetime]
+        self._pending_segments = {}  # type: Dict[str, Dict[int, bytes]]
 
     def _list(self, storage_path: str) -> Generator[str, None, None]:
         logger.debug(f"Finding files in storage_path: '{storage_path}'")
@@ -35,10 +37,12 @@ class SharedFSFetcher(base.Fetcher):
     def _fetch(self, filepath: str, new_file_callback: Callable) -> None:
         local_path = posixpath.join(self.local_dir, filepath.lstrip("/"))
 
-        dir_path = os.path.dirname(local_path)
-        os.makedirs(dir_path, exist_ok=True)
+        def copy(local_file: BinaryIO) -> None:
+            with open(filepath, "rb") as f:
+                for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b""):
+                    local_file.write(chunk)
 
-        shutil.copyfile(filepath, local_path)
+        self._save(local_path, copy)
 
         logger.debug(f"Transfered '{filepath}' to '{local_path}'")
         new_file_callback()
@@ -1,7 +1,7 @@
 import logging
 import os
 import pathlib
-from typing import Any, List, Optional, no_type_check
+from typing import Any, Callable, List, Optional, no_type_check
 
 from requests import exceptions as request_exceptions
 from urllib3 import exceptions as url_exceptions
@@ -34,30 +34,39 @@ class GCSTensorboardManager(base.TensorboardManager):
     def get_storage_prefix(self, storage_id: pathlib.Path) -> str:
         return os.path.join(self.prefix, storage_id)
 
-    @no_type_check
     def _sync_impl(self, path_info_list: List[base.PathUploadInfo]) -> None:
         for path_info in path_info_list:
-            path = path_info.path
-            mangled_relative_path = path_info.mangled_relative_path
-            mangled_path = self.sync_path.joinpath(mangled_relative_path)
-            to_path = self.get_storage_prefix(mangled_path)
-
-            from google.api_core import exceptions, retry
-
-            retry_network_errors = retry.Retry(
-                retry.if_exception_type(
-                    ConnectionError,
-                    exceptions.ServerError,
-                    exceptions.TooManyRequests,
-                    url_exceptions.ProtocolError,
-                    request_exceptions.ConnectionError,
-                )
+            self._sync_file(path_info)
+
+    @no_type_check
+    def _retry_network_errors(self, func: Callable) -> Callable:
+        from google.api_core import exceptions, retry
+
+        retry_network_errors = retry.Retry(
+            retry.if_exception_type(
+                ConnectionError,
+                exceptions.ServerError,
+                exceptions.TooManyRequests,
+                url_exceptions.ProtocolError,
+                request_exceptions.ConnectionError,
             )
+        )
+        return retry_network_errors(func)
+
+    def _upload_file(self, path: pathlib.Path, mangled_path: pathlib.Path) -> None:
+        to_path = self.get_storage_prefix(mangled_path)
+        blob = self.bucket.blob(to_path)
+
+        logger.debug(f"Uploading {path} to GCS: {to_path}")
+        self._retry_network_errors(blob.upload_from_filename)(str(path))
 
-            blob = self.bucket.blob(to_path)
+    def _upload_bytes(self, data: bytes, mangled_path: pathlib.Path) -> None:
+        blob = self.bucket.blob(self.get_storage_prefix(mangled_path))
+        self._retry_network_errors(blob.upload_from_string)(data)
 
-            logger.debug(f"Uploading {path} to GCS: {to_path}")
-            retry_network_errors(blob.upload_from_filename)(str(path))
+    def _delete_files(self, mangled_paths: List[pathlib.Path]) -> None:
+        blobs = [self.bucket.blob(self.get_storage_prefix(p)) for p in mangled_paths]
+        self.bucket.delete_blobs(blobs=blobs)
 
     def delete(self) -> None:
         prefix_path = self.get_storage_prefix(self.sync_path)
@@ -1,5 +1,6 @@
 import logging
 import os
+import pathlib
 from typing import Any, List, Optional
 
 from determined.common import storage
@@ -47,16 +48,26 @@ class S3TensorboardManager(base.TensorboardManager):
         path_info_list: List[base.PathUploadInfo],
     ) -> None:
         for path_info in path_info_list:
-            path = path_info.path
-            mangled_relative_path = path_info.mangled_relative_path
-            mangled_path = self.sync_path.joinpath(mangled_relative_path)
-            tbd_filename = str(mangled_path)
-            key_name = os.path.join(self.prefix, tbd_filename)
+            self._sync_file(path_info)
 
-            url = f"s3://{self.bucket}/{key_name}"
-            logger.debug(f"Uploading {path} to {url}")
+    def _key(self, mangled_path: pathlib.Path) -> str:
+        return os.path.join(self.prefix, str(mangled_path))
 
-            self.client.upload_file(str(path), self.bucket, key_name)
+    def _upload_file(self, path: pathlib.Path, mangled_path: pathlib.Path) -> None:
+        key_name = self._key(mangled_path)
+        url = f"s3://{self.bucket}/{key_name}"
+        logger.debug(f"Uploading {path} to {url}")
+
+        self.client.upload_file(str(path), self.bucket, key_name)
+
+    def _upload_bytes(self, data: bytes, mangled_path: pathlib.Path) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self._key(mangled_path), Body=data)
+
+    def _delete_files(self, mangled_paths: List[pathlib.Path]) -> None:
+        # delete_objects accepts at most 1000 keys per request.
+        for i in range(0, len(mangled_paths), 1000):
+            objects = [{"Key": self._key(p)} for p in mangled_paths[i : i + 1000]]
+            self.client.delete_objects(Bucket=self.bucket, Delete={"Objects": objects})
 
     def delete(self) -> None:
         prefix_path = os.path.join(self.prefix, self.sync_path)
@@ -338,6 +338,34 @@ def test_read_context_ignore_pycaches(tmp_path: pathlib.Path) -> None:
         assert {f["path"] for f in model_def} == {"A.py", "subdir", "subdir/A.py"}
 
 
+def test_read_context_with_negated_detignore(tmp_path: pathlib.Path) -> None:
+    with filetree.FileTree(
+        tmp_path,
+        {
+            "A.log": "",
+            "keep.log": "",
+            "data/B.py": "",
+            "data/keep.py": "",
+            ".detignore": "\n*.log\n!keep.log\ndata/*.py\n!data/keep.py\n",
+        },
+    ) as tree:
+        model_def = context.read_legacy_context(tree)
+        assert {f["path"] for f in model_def} == {"keep.log", "data", "data/keep.py"}
+
+
+def test_read_context_order(tmp_path: pathlib.Path) -> None:
+    files = {"top.py": ""}  # type: Dict[Union[str, pathlib.Path], str]
+    files.update({f"d{i}/{sub}/f{j}.py": "" for i in range(3) for sub in "ab" for j in range(3)})
+    with filetree.FileTree(tmp_path, files) as tree:
+        # Directories are walked concurrently, but listed in the order os.walk would list them.
+        expected = []
+        for parent, dirs, names in os.walk(tree):
+            for name in dirs + names:
+                expected.append(os.path.relpath(os.path.join(parent, name), tree))
+        model_def = context.read_legacy_context(tree)
+        assert [f["path"] for f in model_def] == expected
+
+
 def test_includes(tmp_path: pathlib.Path) -> None:
     with filetree.FileTree(
         tmp_path,
@@ -21,18 +21,41 @@ class TestSession:
             master=test_master, username="me", token="t1o2k3e4n5", cert=certs.Cert(noverify=True)
         )
 
-    def test_direct_instantiation_doesnt_reuse_requests_sessions(
-        self, session: api.Session
+    def test_direct_instantiation_reuses_pooled_requests_sessions(
+        self, test_master: str, session: api.Session
     ) -> None:
-        # Make a few requests, and expect the request's session to be closed immediately after
-        # each request.
-        # To requests and underlying urllib3, this means the PoolManager should not contain any
-        # ConnectionPools.
-        for _ in range(3):
-            resp = session.get(path="/info")
+        # Sessions which talk to the same master share connection pools, even if they
+        # authenticate differently.
+        other = api.Session(
+            master=test_master, username="you", token="other", cert=certs.Cert(noverify=True)
+        )
+        unauth = api.UnauthSession(master=test_master, cert=certs.Cert(noverify=True))
+        connection_pools = []
+        for sess in [session, session, other, unauth]:
+            resp = sess.get(path="/info")
             # mypy doesn't recognize attributes defined outside init.
-            resp_connection = getattr(resp, "connection", None)
-            assert len(resp_connection.poolmanager.pools) == 0
+            resp_connection = getattr(resp, "connection")
+            assert len(resp_connection.poolmanager.pools) == 1
+            pool_key = next(iter(resp_connection.poolmanager.pools.keys()))
+            connection_pools.append(resp_connection.poolmanager.pools.get(pool_key))
+        assert len(set(connection_pools)) == 1
+
+        # A different retry policy or certificate gets a separate pool.
+        resp = session.with_retry(0).get(path="/info")
+        resp_connection = getattr(resp, "connection")
+        assert resp_connection.poolmanager.pools.get(pool_key) not in connection_pools
+
+    def test_auth_headers_are_sent_with_pooled_sessions(self, session: api.Session) -> None:
+        resp = session.get(path="/info", headers={"X-Extra": "1"})
+        assert resp.request.headers["Authorization"] == "Bearer t1o2k3e4n5"
+        assert resp.request.headers["X-Extra"] == "1"
+
+        task_session = api.TaskSession(
+            master=session.master, username="me", token="task", cert=session.cert
+        )
+        resp = task_session.get(path="/info")
+        assert resp.request.headers[api.TaskSession.AUTH_HEADER] == "Bearer task"
+        assert "Authorization" not in resp.request.headers
 
     def test_context_manager_reuses_requests_sessions(self, session: api.Session) -> None:
         connection_pools = []
@@ -45,10 +68,10 @@ class TestSession:
                 # urllib3 creates HTTP connections from the PoolManager's connection pool, so we
                 # assume that if there was one connection pool, it was the one the request used.
                 # mypy doesn't recognize attributes defined outside init.
-                resp_connection = getattr(resp, "connection", None)
+                resp_connection = getattr(resp, "connection")
                 assert len(resp_connection.poolmanager.pools) == 1
 
-                pool_key = resp_connection.poolmanager.pools.keys()[0]
+                pool_key = next(iter(resp_connection.poolmanager.pools.keys()))
                 connection_pool = resp_connection.poolmanager.pools.get(pool_key)
                 connection_pools.append(connection_pool)
         assert len(set(connection_pools)) == 1
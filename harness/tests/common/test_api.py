@@ -1,6 +1,10 @@
+import threading
+from typing import Callable, Iterable, List, Optional
+
 import pytest
 
 from determined.common import api
+from determined.common.api import bindings
 
 
 @pytest.mark.parametrize(
@@ -42,3 +46,59 @@ def test_canonicalize_master_url_valid(url: str, exp: str) -> None:
 def test_canonicalize_master_url_invalid(url: str, exp: str) -> None:
     with pytest.raises(ValueError, match=exp):
         api.canonicalize_master_url(url)
+
+
+def make_pages(total: int, page_size: int) -> Callable[[int], bindings.v1GetWorkspacesResponse]:
+    def get_with_offset(offset: int) -> bindings.v1GetWorkspacesResponse:
+        end = min(offset + page_size, total)
+        return bindings.v1GetWorkspacesResponse(
+            pagination=bindings.v1Pagination(
+                offset=offset, startIndex=offset, endIndex=end, total=total
+            ),
+            workspaces=[],
+        )
+
+    return get_with_offset
+
+
+def offsets(resps: Iterable[bindings.v1GetWorkspacesResponse]) -> List[Optional[int]]:
+    return [r.pagination.offset for r in resps]
+
+
+def test_read_paginated_prefetch() -> None:
+    get_page = make_pages(total=10, page_size=3)
+    assert offsets(api.read_paginated(get_page)) == [0, 3, 6, 9]
+
+    # The pages after the first are requested concurrently, but still yielded in order.
+    both_in_flight = threading.Barrier(2, timeout=10)
+
+    def get_with_offset(offset: int) -> bindings.v1GetWorkspacesResponse:
+        if offset in (3, 6):
+            both_in_flight.wait()
+        return get_page(offset)
+
+    assert offsets(api.read_paginated(get_with_offset, prefetch=2)) == [0, 3, 6, 9]
+    assert offsets(api.read_paginated(get_page, offset=3, prefetch=8)) == [3, 6, 9]
+    assert offsets(api.read_paginated(get_page, pages=api.PageOpts.single, prefetch=2)) == [0]
+
+
+def test_read_paginated_prefetch_results_added() -> None:
+    # More results appear after the first page was read.
+    pages = [make_pages(total=5, page_size=2), make_pages(total=8, page_size=2)]
+    resps = api.read_paginated(lambda offset: pages[offset > 0](offset), prefetch=4)
+    assert offsets(resps) == [0, 2, 4, 6]
+
+
+def test_read_paginated_prefetch_stops_early() -> None:
+    requested = []  # type: List[int]
+    get_page = make_pages(total=100, page_size=1)
+
+    def get_with_offset(offset: int) -> bindings.v1GetWorkspacesResponse:
+        requested.append(offset)
+        return get_page(offset)
+
+    for resp in api.read_paginated(get_with_offset, prefetch=2):
+        if resp.pagination.offset == 1:
+            break
+    # Only pages up to prefetch ahead of the last page read were ever requested.
+    assert max(requested) <= 3
@@ -1,12 +1,16 @@
 import contextlib
+import hashlib
+import os
 import pathlib
-from typing import Any, Callable, Dict, Iterator, List, Optional
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
 from unittest import mock
 
 import pytest
 import requests
 
 from determined import core
+from determined.common import storage
 from tests import parallel
 
 
@@ -315,6 +319,55 @@ def test_checkpoint_upload(sharded: bool, tmp_path: pathlib.Path) -> None:
         assert len(list(upload_ckpt[1])) == 0
 
 
+def test_resolve_conflicts(tmp_path: pathlib.Path) -> None:
+    tmp_path.joinpath("same-file").write_text("one file seen by both ranks")
+    conflicts = {"same-file": [0, 1], "same-content": [0, 1]}
+    resources = {"same-file": 27, "same-content": 16}
+
+    with mock.patch.object(
+        core._checkpoint, "_hash_file", wraps=core._checkpoint._hash_file
+    ) as hash_file:
+        with parallel.Execution(2) as pex:
+
+            @pex.run
+            def resolve() -> Dict[str, int]:
+                ckpt_dir = tmp_path.joinpath(f"ckpt-dir-{pex.rank}")
+                ckpt_dir.mkdir()
+                os.link(tmp_path.joinpath("same-file"), ckpt_dir.joinpath("same-file"))
+                ckpt_dir.joinpath("same-content").write_text("identical copies")
+
+                checkpoint_context = core.DummyCheckpointContext(pex.distributed, mock.MagicMock())
+                return checkpoint_context._resolve_conflicts(resources, conflicts, str(ckpt_dir))
+
+            # Only the separate copies are hashed; a file shared by both ranks needs no hashing.
+            assert sorted(c.args[0] for c in hash_file.call_args_list) == [
+                str(tmp_path.joinpath(f"ckpt-dir-{rank}", "same-content")) for rank in range(2)
+            ]
+            hash_file.reset_mock()
+
+            @pex.run
+            def resolve_size_mismatch() -> None:
+                ckpt_dir = tmp_path.joinpath(f"ckpt-dir-{pex.rank}")
+                ckpt_dir.joinpath("same-content").write_text("x" * (pex.rank + 1))
+
+                checkpoint_context = core.DummyCheckpointContext(pex.distributed, mock.MagicMock())
+                with pytest.raises(RuntimeError, match="refusing to upload with files conflicts"):
+                    checkpoint_context._resolve_conflicts(resources, conflicts, str(ckpt_dir))
+
+            # Files of different sizes conflict without being read.
+            hash_file.assert_not_called()
+
+    assert resolve == [resources, {}]
+
+
+def test_hash_file(tmp_path: pathlib.Path) -> None:
+    path = tmp_path.joinpath("file")
+    data = bytes(range(256)) * 1024
+    path.write_bytes(data)
+    with mock.patch.object(core._checkpoint, "_HASH_BLOCK_SIZE", 1000):
+        assert core._checkpoint._hash_file(str(path)) == hashlib.md5(data).hexdigest()
+
+
 @pytest.mark.parametrize("sharded", [True, False])
 def test_store_path(sharded: bool, tmp_path: pathlib.Path) -> None:
     ckpt_dir = tmp_path.joinpath("ckpt-dir")
@@ -379,3 +432,103 @@ def test_store_path(sharded: bool, tmp_path: pathlib.Path) -> None:
                 else:
                     storage_manager.post_store_path.assert_not_called()
                     storage_manager._list_directory.assert_not_called()
+
+
+def test_checkpoint_upload_async(tmp_path: pathlib.Path) -> None:
+    ckpt_dir = tmp_path.joinpath("ckpt-dir")
+    ckpt_dir.mkdir()
+    ckpt_dir.joinpath("weights").write_text("v1")
+
+    staging_dirs: Dict[str, pathlib.Path] = {}
+
+    def pre_store_path(dst: str) -> pathlib.Path:
+        staging_dirs[dst] = tmp_path.joinpath("staging", dst)
+        staging_dirs[dst].mkdir(parents=True)
+        return staging_dirs[dst]
+
+    # Block the background upload until the test releases it.
+    release = threading.Event()
+    uploaded: List[Dict[str, str]] = []
+
+    def post_store_path(src: pathlib.Path, dst: str, paths: Optional[Set[str]] = None) -> None:
+        assert release.wait(timeout=10)
+        uploaded.append({p.name: p.read_text() for p in src.iterdir()})
+
+    storage_manager = mock.MagicMock()
+    storage_manager.pre_store_path = mock.MagicMock(side_effect=pre_store_path)
+    storage_manager.post_store_path = mock.MagicMock(side_effect=post_store_path)
+    storage_manager._list_directory = storage.StorageManager._list_directory
+
+    checkpoint_context = core.DummyCheckpointContext(
+        core.DummyDistributedContext(), storage_manager, max_async_uploads=1
+    )
+    checkpoint_context._report_checkpoint = mock.MagicMock()  # type: ignore
+
+    future = checkpoint_context.upload(ckpt_dir, {"steps_completed": 1}, async_=True)
+    # The upload is blocked, but the checkpoint has already been snapshotted.
+    assert not future.done()
+    ckpt_dir.joinpath("weights").write_text("v2")
+    checkpoint_context._report_checkpoint.assert_not_called()
+
+    release.set()
+    storage_id = future.result(timeout=10)
+    assert staging_dirs.keys() == {storage_id}
+    assert uploaded == [{"weights": "v1", "metadata.json": '{\n  "steps_completed": 1\n}'}]
+    checkpoint_context._report_checkpoint.assert_called_once()
+    assert checkpoint_context._report_checkpoint.call_args.args[0] == storage_id
+
+    # store_path(async_=True) uploads after the context manager exits.
+    with checkpoint_context.store_path({"steps_completed": 2}, async_=True) as (path, storage_id):
+        path.joinpath("weights").write_text("v3")
+    assert checkpoint_context.last_async_upload is not None
+    assert checkpoint_context.last_async_upload.result(timeout=10) == storage_id
+    checkpoint_context._close()
+    assert uploaded[-1]["weights"] == "v3"
+    assert checkpoint_context._report_checkpoint.call_args.args[0] == storage_id
+
+    with pytest.raises(ValueError, match="async_"):
+        checkpoint_context.upload(ckpt_dir, shard=True, async_=True)
+
+
+def test_checkpoint_upload_async_errors(tmp_path: pathlib.Path) -> None:
+    ckpt_dir = tmp_path.joinpath("ckpt-dir")
+    ckpt_dir.mkdir()
+    ckpt_dir.joinpath("weights").write_text("v1")
+
+    storage_manager = mock.MagicMock()
+    storage_manager.pre_store_path = mock.MagicMock(
+        side_effect=lambda dst: tmp_path.joinpath("staging", dst)
+    )
+    storage_manager.post_store_path = mock.MagicMock(side_effect=IOError("upload failed"))
+    storage_manager._list_directory = storage.StorageManager._list_directory
+
+    checkpoint_context = core.CheckpointContext(
+        core.DummyDistributedContext(),
+        storage_manager,
+        session=mock.MagicMock(),
+        task_id="task-id",
+        allocation_id="allocation-id",
+        tbd_sync_mode=core.TensorboardMode.MANUAL,
+        tensorboard_manager=None,
+        storage_backend_id=None,
+    )
+
+    # Metadata is validated before anything is staged, on the calling thread.
+    with pytest.raises(ValueError, match="steps_completed"):
+        checkpoint_context.upload(ckpt_dir, {}, async_=True)
+    with pytest.raises(ValueError, match="steps_completed"):
+        with checkpoint_context.store_path({}, async_=True):
+            pass
+    storage_manager.pre_store_path.assert_not_called()
+
+    # A failed upload is raised from the next upload...
+    future = checkpoint_context.upload(ckpt_dir, {"steps_completed": 1}, async_=True)
+    with pytest.raises(IOError):
+        future.result(timeout=10)
+    with pytest.raises(RuntimeError, match="asynchronous checkpoint upload failed"):
+        checkpoint_context.upload(ckpt_dir, {"steps_completed": 2}, async_=True)
+
+    # ... or from closing the context.
+    checkpoint_context.upload(ckpt_dir, {"steps_completed": 3}, async_=True)
+    with pytest.raises(RuntimeError, match="asynchronous checkpoint upload failed"):
+        checkpoint_context._close()
@@ -0,0 +1,125 @@
+import gzip
+import json
+import threading
+from typing import Any, Dict, List
+from unittest import mock
+
+import pytest
+import requests
+
+from determined.common import api
+from determined.core import _log_shipper
+
+
+def shipped_logs(session: mock.MagicMock) -> List[List[Dict[str, str]]]:
+    batches = []
+    for call in session.post.call_args_list:
+        assert call.args == ("task-logs",)
+        data = call.kwargs["data"]
+        if call.kwargs["headers"].get("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        batches.append(json.loads(data))
+    return batches
+
+
+def api_exception(status_code: int) -> api.errors.APIException:
+    response = requests.Response()
+    response.status_code = status_code
+    return api.errors.APIException(response)
+
+
+def test_log_sender_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_log_shipper, "LOG_BATCH_MAX_SIZE", 3)
+    session = mock.MagicMock()
+    sender = _log_shipper._LogSender(session, {"task_id": "task"})
+
+    # Lines are reassembled from partial writes, and a trailing partial line is held back.
+    sender.write("one\ntw")
+    sender.write("o\nthree\nfour\nfi")
+    sender.ship()
+    assert [[m["log"] for m in b] for b in shipped_logs(session)] == [
+        ["one\n", "two\n", "three\n"],
+        ["four\n"],
+    ]
+    assert all(m["task_id"] == "task" for b in shipped_logs(session) for m in b)
+    assert (sender.shipped_lines, sender.shipped_batches) == (4, 2)
+
+    sender.write("ve\n")
+    sender.ship()
+    assert shipped_logs(session)[-1][0]["log"] == "five\n"
+
+
+def test_log_sender_drops_when_full(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_log_shipper, "SHIP_BUFFER_MAX_BYTES", 10)
+    session = mock.MagicMock()
+    sender = _log_shipper._LogSender(session, {})
+
+    sender.write("12345678\n")
+    sender.write("dropped\n")
+    assert sender.dropped_bytes == 8
+    sender.ship()
+
+    logs = [m["log"] for b in shipped_logs(session) for m in b]
+    assert logs[0] == "12345678\n"
+    assert "8 bytes of output were dropped" in logs[1]
+
+    # The drop is only reported once.
+    sender.write("after\n")
+    sender.ship()
+    assert [m["log"] for m in shipped_logs(session)[-1]] == ["after\n"]
+
+
+def test_log_sender_write_does_not_block() -> None:
+    session = mock.MagicMock()
+    unblock = threading.Event()
+    session.post.side_effect = lambda *args, **kwargs: unblock.wait()
+    sender = _log_shipper._LogSender(session, {})
+    sender.start()
+    try:
+        # A master which never answers must not stall the writer.
+        for _ in range(2 * _log_shipper.SHIP_BUFFER_MAX_BYTES // 1024):
+            sender.write("x" * 1023 + "\n")
+        assert sender.dropped_bytes > 0
+    finally:
+        unblock.set()
+        sender.close()
+
+
+def test_log_sender_falls_back_to_uncompressed() -> None:
+    session = mock.MagicMock()
+
+    def post(*args: Any, headers: Dict[str, str], **kwargs: Any) -> None:
+        if "Content-Encoding" in headers:
+            raise api_exception(415)
+
+    session.post.side_effect = post
+    sender = _log_shipper._LogSender(session, {})
+    for i in range(2):
+        sender.write(f"line {i}\n")
+        sender.ship()
+
+    # Only the first batch tried compression.
+    assert [c.kwargs["headers"].get("Content-Encoding") for c in session.post.call_args_list] == [
+        "gzip",
+        None,
+        None,
+    ]
+    assert [m["log"] for b in shipped_logs(session)[1:] for m in b] == ["line 0\n", "line 1\n"]
+    assert sender.failed_batches == 0
+
+
+def test_log_sender_survives_failures(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_log_shipper, "SHIPPER_FAILURE_BACKOFF_SECONDS", 0)
+    session = mock.MagicMock()
+    session.post.side_effect = api_exception(500)
+    sender = _log_shipper._LogSender(session, {})
+
+    sender.write("lost\n")
+    sender.ship()
+    assert (sender.failed_batches, session.post.call_count) == (1, 2)
+
+    session.post.side_effect = None
+    sender.write("shipped\n")
+    sender.ship()
+    assert [m["log"] for m in shipped_logs(session)[-1]] == ["shipped\n"]
+    assert sender.shipped_lines == 1
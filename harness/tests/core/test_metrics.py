@@ -1,3 +1,4 @@
+import time
 from unittest import mock
 
 import pytest
@@ -58,3 +59,56 @@ def test_metrics_report_raises_exception(mock_post_metrics: mock.MagicMock) -> N
         metrics_context.close()
 
     assert mock_post_metrics.call_count == 1
+
+
+@mock.patch("determined.common.api.bindings.post_ReportTrialMetrics")
+def test_metrics_report_coalesces(mock_post_metrics: mock.MagicMock) -> None:
+    session = api.Session(
+        master="http://test_master:8080", username="user", token="token", cert=None
+    )
+    metrics_context = core._MetricsContext(session=session, trial_id=1, run_id=1, flush_interval=60)
+
+    # Reports published before the shipper starts are all waiting in the queue together.
+    metrics_context.report(group="training", metrics={"loss": 0.1}, steps_completed=1)
+    metrics_context.report(group="training", metrics={"lr": 0.01}, steps_completed=1)
+    metrics_context.report(group="validation", metrics={"loss": 0.2}, steps_completed=1)
+    metrics_context.report(group="training", metrics={"loss": 0.3}, steps_completed=2)
+    metrics_context.report(group="training", metrics={"loss": 0.4}, steps_completed=2)
+    metrics_context.start()
+    metrics_context.close()
+
+    bodies = [call.kwargs["body"] for call in mock_post_metrics.call_args_list]
+    assert [(b.group, b.metrics.stepsCompleted, b.metrics.metrics.avgMetrics) for b in bodies] == [
+        ("training", 1, {"loss": 0.1, "lr": 0.01}),
+        ("validation", 1, {"loss": 0.2}),
+        ("training", 2, {"loss": 0.4}),
+    ]
+    assert metrics_context.stats.reports == 5
+    assert metrics_context.stats.requests == 3
+    assert metrics_context.stats.max_queue_size == 5
+    assert metrics_context.stats.blocked_reports == 0
+
+
+@mock.patch("determined.common.api.bindings.post_ReportTrialMetrics")
+def test_metrics_report_backpressure(
+    mock_post_metrics: mock.MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(core._metrics._Shipper, "METRICS_QUEUE_MAXSIZE", 2)
+    # A slow master fills the queue, so reporting has to wait.
+    mock_post_metrics.side_effect = lambda *args, **kwargs: time.sleep(0.01)
+    session = api.Session(
+        master="http://test_master:8080", username="user", token="token", cert=None
+    )
+    metrics_context = core._MetricsContext(session=session, trial_id=1, run_id=1)
+
+    metrics_context.start()
+    for i in range(20):
+        metrics_context.report(group="training", metrics={"loss": i}, steps_completed=i)
+    metrics_context.close()
+
+    assert mock_post_metrics.call_count == 20
+    stats = metrics_context.stats
+    assert stats.max_queue_size <= 2
+    assert stats.blocked_reports > 0
+    assert stats.blocked_seconds > 0
+    assert stats.reports == stats.requests == 20
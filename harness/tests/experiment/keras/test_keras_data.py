@@ -23,6 +23,18 @@ class IdentitySequence(utils.Sequence):
         return index
 
 
+class ArraySequence(utils.Sequence):
+    def __init__(self, length: int) -> None:
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> Tuple[np.ndarray, dict]:
+        assert index < self._length
+        return np.full((64, 1024), index, dtype=np.float32), {"index": np.array([index]), "n": 1}
+
+
 def test_minimal_arraylike_data_adapter() -> None:
     seq = keras._ArrayLikeAdapter(np.array([0]), np.array([1]), batch_size=1)
     assert len(seq) == 1
@@ -218,3 +230,29 @@ def test_enqueuer_multiprocessing(workers: int) -> None:
         assert list(enqueuer.data()) == list(sampler.yield_epoch()), "first epoch was wrong"
         assert list(enqueuer.data()) == list(sampler.yield_epoch()), "second epoch was wrong"
         assert list(enqueuer.data()) == list(sampler.yield_epoch()), "third epoch was wrong"
+
+
+def test_enqueuer_multiprocessing_shared_memory() -> None:
+    with keras._build_enqueuer(
+        sequence=ArraySequence(40),
+        workers=2,
+        use_multiprocessing=True,
+        max_queue_size=4,
+        shard_rank=0,
+        num_shards=1,
+        repeat=False,
+        shuffle=True,
+        shuffle_seed=777,
+        prior_batches_trained=0,
+    ) as enqueuer:
+        expected = list(keras._Sampler(40, 0, 1, True, 777, 0).yield_epoch())
+
+        # Batches which are still held on to keep their shared memory from being reused.
+        batches = list(enqueuer.data())
+        assert [int(y["index"][0]) for _, y in batches] == expected
+        assert all((x == y["index"][0]).all() and y["n"] == 1 for x, y in batches)
+        assert any(slot is not None for slot in enqueuer.slots)
+
+        del batches
+        for x, y in enqueuer.data():
+            assert (x == y["index"][0]).all()
@@ -0,0 +1,58 @@
+"""
+Benchmark how long the chief spends averaging training metrics across ranks.
+
+Run it from the harness directory with:
+
+    python -m tests.experiment.pytorch.benchmark_metric_utils [--batches N] [--ranks 1 2 4 ...]
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from determined.pytorch import _metric_utils
+
+
+def by_batch(combined_timeseries: Dict[str, Any], num_batches: int) -> None:
+    for process_batches in combined_timeseries.values():
+        _metric_utils._average_metric_by_batch(
+            [batches[:num_batches] for batches in process_batches]
+        )
+
+
+def columnar(combined_timeseries: Dict[str, Any], num_batches: int) -> None:
+    _metric_utils._average_training_metrics(
+        combined_timeseries, [num_batches] * len(next(iter(combined_timeseries.values())))
+    )
+
+
+def make_timeseries(ranks: int, batches: int) -> Dict[str, List[List[Any]]]:
+    rng = np.random.default_rng(0)
+    # Metrics arrive from each rank as 0-d arrays, as produced by Tensor.numpy().
+    return {
+        name: [[np.array(v) for v in rng.random(batches, dtype=np.float32)] for _ in range(ranks)]
+        for name in ("loss", "accuracy")
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batches", type=int, default=10000)
+    parser.add_argument("--ranks", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64, 128, 256])
+    args = parser.parse_args()
+
+    impls = {"by_batch": by_batch, "columnar": columnar}  # type: Dict[str, Callable]
+    print(f"{'ranks':>6} " + " ".join(f"{name:>12}" for name in impls))
+    for ranks in args.ranks:
+        timeseries = make_timeseries(ranks, args.batches)
+        timings = []
+        for impl in impls.values():
+            start = time.perf_counter()
+            impl(timeseries, args.batches)
+            timings.append(time.perf_counter() - start)
+        print(f"{ranks:>6} " + " ".join(f"{t:>11.3f}s" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark the per-batch cost of moving batches of many small tensors to a device.
+
+Run it from the harness directory with:
+
+    python -m tests.experiment.pytorch.benchmark_to_device [--batches N] [--leaves 8 64 ...]
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict, List
+
+import torch
+
+from determined import pytorch
+
+
+def make_batch(leaves: int) -> Dict[str, Any]:
+    # Token features of a small NLP batch: a few dozen small integer and float tensors.
+    return {
+        f"feature_{i}": torch.zeros(32, 16, dtype=torch.int64 if i % 2 else torch.float32)
+        for i in range(leaves)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batches", type=int, default=2000)
+    parser.add_argument("--leaves", type=int, nargs="+", default=[8, 64, 256])
+    args = parser.parse_args()
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    warned_types = set()  # type: Any
+
+    def plan(coalesce: bool) -> Callable[[Any], Any]:
+        plans = []  # type: List[pytorch._ToDevicePlan]
+
+        def move(batch: Any) -> Any:
+            if not plans:
+                plans.append(pytorch._ToDevicePlan(batch, warned_types, coalesce))
+            return plans[0].move(batch, device)
+
+        return move
+
+    def make_impls() -> Dict[str, Callable[[Any], Any]]:
+        return {
+            "to_device": lambda batch: pytorch.to_device(batch, device, warned_types),
+            "plan": plan(coalesce=False),
+            "coalesced": plan(coalesce=True),
+        }
+
+    print(f"device: {device}")
+    print(f"{'leaves':>6} " + " ".join(f"{name:>12}" for name in make_impls()))
+    for leaves in args.leaves:
+        batch = make_batch(leaves)
+        impls = make_impls()
+        timings = []
+        for impl in impls.values():
+            impl(batch)
+            start = time.perf_counter()
+            for _ in range(args.batches):
+                impl(batch)
+            if device.type == "cuda":
+                torch.cuda.synchronize()
+            timings.append((time.perf_counter() - start) / args.batches)
+        print(f"{leaves:>6} " + " ".join(f"{t * 1e6:>10.1f}us" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -84,6 +84,38 @@ def test_average_training_metrics() -> None:
     ]
     assert averaged_metrics == expected_metrics
 
+    # Test ranks which did not report every metric every batch
+    combined_timeseries = {
+        "loss1": [[1, None, None], [3, 4, None]],
+        "loss2": [[np.array(-1), None, np.array(-5)], [np.array(-3), np.array(-4), None]],
+    }
+    averaged_metrics = metric_utils._average_training_metrics(combined_timeseries, [3, 3])
+    assert averaged_metrics[:2] == [
+        {"loss1": 2, "loss2": np.array(-2)},
+        {"loss1": 4, "loss2": np.array(-4)},
+    ]
+    assert np.isnan(averaged_metrics[2]["loss1"])
+    assert averaged_metrics[2]["loss2"] == np.array(-5)
+    assert isinstance(averaged_metrics[2]["loss2"], np.ndarray)
+
+
+@pytest.mark.parametrize(
+    "process_batches",
+    [
+        [[np.float32(0.1), np.float32(0.2)], [np.float32(0.3), np.float32(0.4)]],
+        [[1.5, None], [2, 3]],
+        [[np.array([1.0, 2.0]), np.array([3.0])], [np.array([5.0, 6.0]), np.array([7.0])]],
+        [[True, False], [True, True]],
+    ],
+)
+def test_average_training_metrics_matches_by_batch(process_batches: List[List[Any]]) -> None:
+    averaged_metrics = metric_utils._average_training_metrics({"m": process_batches}, [2, 2])
+    expected = metric_utils._average_metric_by_batch(process_batches)
+    if isinstance(process_batches[0][0], np.ndarray):
+        expected = [np.array(e) for e in expected]
+    assert [m["m"] for m in averaged_metrics] == pytest.approx(expected)
+    assert [type(m["m"]) for m in averaged_metrics] == [type(e) for e in expected]
+
 
 def test_prepare_metric_reducers() -> None:
     metrics_dict = {"loss1": 1, "loss2": 2}
@@ -55,3 +55,15 @@ class TestPyTorchContext:
         scaler = torch.cuda.amp.GradScaler()
         assert scaler == self.context.wrap_scaler(scaler)
         assert scaler == self.context._scaler
+
+    def test_to_device_plans(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(pytorch._pytorch_context, "MAX_TO_DEVICE_PLANS", 2)
+        monkeypatch.setattr(self.context, "device", torch.device("cpu"))
+        batches = [{"x": torch.zeros(2)}, [torch.zeros(2)], (torch.zeros(2), torch.ones(2))]
+        for batch in batches + batches[1:]:
+            moved = self.context.to_device(batch)  # type: ignore
+            assert type(moved) is type(batch)
+        # Plans are kept for the most recently moved layouts only.
+        assert len(self.context._to_device_plans) == 2
+        assert self.context._to_device_plans[0].move(batches[2], self.context.device) is not None
+        assert self.context._to_device_plans[1].move(batches[1], self.context.device) is not None
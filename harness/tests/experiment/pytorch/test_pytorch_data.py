@@ -233,3 +233,105 @@ def test_to_device_warnings(dedup_between_calls: bool) -> None:
     finally:
         # Restore logging as it was before.
         logger.removeHandler(handler)
+
+
+def test_batch_layout() -> None:
+    batch = {"a": torch.zeros(2), "b": [np.zeros(2), (1, "str")]}
+    layout = pytorch._data._BatchLayout(batch)
+    leaves = layout.flatten(batch)
+    assert leaves is not None and len(leaves) == 4
+    rebuilt = layout.unflatten(leaves)
+    assert rebuilt.keys() == batch.keys() and rebuilt["b"][1] == (1, "str")
+
+    # Batches laid out differently are not taken apart.
+    for other in [
+        {"a": torch.zeros(2)},
+        {"a": torch.zeros(2), "c": [np.zeros(2), (1, "str")]},
+        {"a": torch.zeros(2), "b": [np.zeros(2), [1, "str"]]},
+        {"a": torch.zeros(2), "b": [np.zeros(2), (1, "str", 2)]},
+        {"a": np.zeros(2), "b": [np.zeros(2), (1, "str")]},
+    ]:
+        assert layout.flatten(other) is None
+
+
+def test_device_prefetcher() -> None:
+    reads = []  # type: typing.List[typing.Any]
+
+    def batches() -> typing.Iterator[typing.Any]:
+        for i in range(3):
+            reads.append(i)
+            yield {"x": np.full(2, i), "y": [torch.full((2,), i)]}
+        reads.append("last")
+        yield (torch.tensor(3),)
+
+    prefetcher = pytorch._DevicePrefetcher(batches(), "cpu")
+    assert reads == []
+
+    # The next batch is read as soon as the previous one is handed out.
+    first = next(prefetcher)
+    assert reads == [0, 1]
+    assert isinstance(first["x"], torch.Tensor) and torch.equal(first["x"], torch.zeros(2))
+    assert torch.equal(first["y"][0], torch.zeros(2))
+
+    rest = list(prefetcher)
+    assert [int(b["x"][0]) for b in rest[:2]] == [1, 2]
+    # A batch laid out differently is still moved.
+    assert isinstance(rest[2], tuple) and torch.equal(rest[2][0], torch.tensor(3))
+    assert reads == [0, 1, 2, "last"]
+
+
+def test_device_prefetcher_errors() -> None:
+    def batches() -> typing.Iterator[torch.Tensor]:
+        yield torch.zeros(1)
+        raise ValueError("bad batch")
+
+    prefetcher = pytorch._DevicePrefetcher(batches(), "cpu")
+    # The batch read before the error is handed out first.
+    assert torch.equal(next(prefetcher), torch.zeros(1))
+    with pytest.raises(ValueError, match="bad batch"):
+        next(prefetcher)
+
+
+def test_to_device_plan() -> None:
+    warned_types = set()  # type: typing.Set[typing.Type]
+    batch = {
+        "tensor": torch.zeros(2),
+        "array": np.ones(2),
+        "strings": np.array(["a"]),
+        "nested": [1, (torch.ones(1),)],
+    }
+    plan = pytorch._ToDevicePlan(batch, warned_types)
+    # Leaves which cannot be moved are warned about once, when the plan is built.
+    assert warned_types == {int}
+
+    moved, tensors = typing.cast(typing.Tuple, plan.move(batch, torch.device("cpu")))
+    expected = pytorch.to_device(batch, torch.device("cpu"))  # type: ignore
+    assert moved.keys() == expected.keys()  # type: ignore
+    assert torch.equal(moved["array"], expected["array"])  # type: ignore
+    assert moved["strings"] is batch["strings"]
+    assert moved["nested"][0] == 1 and torch.equal(moved["nested"][1][0], torch.ones(1))
+    assert [t.shape for t in tensors] == [torch.Size([2]), torch.Size([1]), torch.Size([2])]
+    assert warned_types == {int, np.ndarray}
+
+    assert plan.move({"tensor": torch.zeros(2)}, torch.device("cpu")) is None
+
+
+def test_to_device_plan_coalesce() -> None:
+    batch = {
+        "a": torch.zeros(2, 3),
+        "b": torch.ones(4, dtype=torch.int64),
+        "c": torch.ones(()),
+        "d": torch.zeros(1, 2, dtype=torch.int64),
+    }
+    plan = pytorch._ToDevicePlan(batch, set(), coalesce=True)
+    # The meta device stands in for a GPU: tensors moved there have shapes but no data.
+    moved, tensors = typing.cast(typing.Tuple, plan.move(batch, torch.device("meta")))
+    for name, tensor in batch.items():
+        assert moved[name].device.type == "meta"
+        assert (moved[name].shape, moved[name].dtype) == (tensor.shape, tensor.dtype)
+    assert len(tensors) == 4
+
+    # Tensors of the same dtype were moved in one buffer.
+    assert moved["a"]._base is not None and moved["a"]._base is moved["c"]._base
+    assert moved["b"]._base is not None and moved["b"]._base is moved["d"]._base
+    assert moved["a"]._base is not moved["b"]._base
@@ -126,6 +126,75 @@ class TestPyTorchTrial:
         for metric in metrics:
             assert "mse" in metric
 
+    def test_deferred_metrics_transfer(self, tmp_path: pathlib.Path) -> None:
+        trial, trial_controller = pytorch_utils.create_trial_and_trial_controller(
+            trial_class=pytorch_onevar_model.OneVarTrialWithTrainingMetrics,
+            hparams=self.hparams,
+            trial_seed=self.trial_seed,
+            tensorboard_path=tmp_path.joinpath("tensorboard"),
+        )
+        trial_controller.context.experimental.defer_metrics_transfer()
+
+        # Every Tensor.numpy() call is a point where the host waits for the device.
+        numpy_calls = []
+        to_numpy = torch.Tensor.numpy
+
+        def counting_numpy(tensor: torch.Tensor, *args, **kwargs) -> np.ndarray:
+            numpy_calls.append(tensor)
+            return to_numpy(tensor, *args, **kwargs)
+
+        with mock.patch.object(torch.Tensor, "numpy", counting_numpy):
+            _, metrics = trial_controller._train_with_boundaries(
+                training_enumerator=enumerate(trial_controller.training_iterator),
+                train_boundaries=[
+                    pytorch._TrainBoundary(
+                        step_type=pytorch._TrainBoundaryType.TRAIN, unit=pytorch.Batch(10)
+                    )
+                ],
+            )
+            assert len(numpy_calls) == 0
+            host_metrics = pytorch._transfer_metrics_to_host(metrics)
+            # One transfer per metric, rather than one per metric per batch.
+            assert len(numpy_calls) == 2
+
+        assert len(host_metrics) == 10
+        for batch, host_batch in zip(metrics, host_metrics):
+            assert batch.keys() == host_batch.keys() == {"loss", "mse"}
+            for name, value in host_batch.items():
+                assert isinstance(value, np.ndarray)
+                assert value.shape == batch[name].shape
+                assert value == batch[name].numpy()
+
+    def test_prefetch_to_device(self, tmp_path: pathlib.Path) -> None:
+        def train(prefetch: bool) -> typing.List[typing.Dict[str, typing.Any]]:
+            trial, trial_controller = pytorch_utils.create_trial_and_trial_controller(
+                trial_class=pytorch_onevar_model.OneVarTrialWithTrainingMetrics,
+                hparams=self.hparams,
+                trial_seed=self.trial_seed,
+                tensorboard_path=tmp_path.joinpath("tensorboard"),
+            )
+            if prefetch:
+                trial_controller.context.experimental.prefetch_to_device()
+            trial_controller.training_iterator = trial_controller._make_training_iterator()
+            assert trial_controller._prefetching == prefetch
+
+            with mock.patch.object(
+                trial_controller.context, "to_device", wraps=trial_controller.context.to_device
+            ) as to_device:
+                _, metrics = trial_controller._train_with_boundaries(
+                    training_enumerator=enumerate(trial_controller.training_iterator),
+                    train_boundaries=[
+                        pytorch._TrainBoundary(
+                            step_type=pytorch._TrainBoundaryType.TRAIN, unit=pytorch.Batch(10)
+                        )
+                    ],
+                )
+            # Prefetched batches are already on device when they are trained on.
+            assert to_device.call_count == (0 if prefetch else 10)
+            return pytorch._transfer_metrics_to_host(metrics)
+
+        assert train(prefetch=True) == train(prefetch=False)
+
     def test_nonscalar_validation(self, tmp_path: pathlib.Path) -> None:
         tensorboard_path = tmp_path.joinpath("tensorboard")
 
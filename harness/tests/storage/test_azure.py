@@ -1,13 +1,17 @@
 import io
 import os
 import pathlib
+import posixpath
 import tempfile
+import threading
 import uuid
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List
+from unittest import mock
 
 import pytest
 
 from determined.common import storage
+from determined.common.storage import azure_client
 from determined.tensorboard.fetchers import azure
 from tests.storage import util
 
@@ -74,6 +78,99 @@ def test_live_azure_lifecycle(require_secrets: bool, tmp_path: pathlib.Path) ->
     util.run_storage_lifecycle_test(live_manager, post_delete_cb)
 
 
+def test_azure_download_concurrency(tmp_path: pathlib.Path) -> None:
+    """Downloads are spread across worker threads and large blobs use ranged requests."""
+    objects = {f"storage-id/{k}": v for k, v in util.EXPECTED_FILES.items()}
+
+    threads = set()
+    lock = threading.Lock()
+
+    def get_blob_client(container: str, blob: str) -> mock.Mock:
+        def download_blob(max_concurrency: int) -> mock.Mock:
+            assert max_concurrency == 3
+            with lock:
+                threads.add(threading.get_ident())
+            stream = mock.Mock()
+            stream.readinto.side_effect = lambda f: f.write((objects[blob] or "").encode())
+            return stream
+
+        blob = posixpath.relpath(posixpath.join(container, blob), CONTAINER_NAME)
+        client = mock.Mock()
+        client.download_blob.side_effect = download_blob
+        return client
+
+    with mock.patch("azure.storage.blob.BlobServiceClient") as service:
+        service_client = service.from_connection_string.return_value
+        service_client.get_container_client.return_value.list_blobs.side_effect = (
+            lambda name_starts_with: iter({"name": name} for name in objects)
+        )
+        service_client.get_blob_client.side_effect = get_blob_client
+        manager = storage.AzureStorageManager(
+            CONTAINER_NAME, connection_string="conn", temp_dir=str(tmp_path), max_concurrency=9
+        )
+
+        # The transport's connection pool fits every concurrent request.
+        transport = service.from_connection_string.call_args.kwargs["transport"]
+        assert transport.session.get_adapter("https://")._pool_maxsize == 10
+
+        manager.download("storage-id", tmp_path.joinpath("all"))
+        util.validate_checkpoint(tmp_path.joinpath("all"), util.EXPECTED_FILES)
+        assert threading.get_ident() not in threads
+
+        manager.download(
+            "storage-id", tmp_path.joinpath("some"), selector=lambda x: x.startswith("subdir/")
+        )
+        expected = {k: v for k, v in util.EXPECTED_FILES.items() if k.startswith("subdir/")}
+        util.validate_checkpoint(tmp_path.joinpath("some"), expected)
+
+
+def test_azure_exists_and_download_paths(tmp_path: pathlib.Path) -> None:
+    """Individual blobs are looked up and fetched by name, without listing the prefix."""
+    objects = {"chunks/a/1": "one", "chunks/b/2": "two"}
+
+    def get_blob_client(container: str, blob: str) -> mock.Mock:
+        blob = posixpath.relpath(posixpath.join(container, blob), CONTAINER_NAME)
+        stream = mock.Mock()
+        stream.readinto.side_effect = lambda f: f.write(objects[blob].encode())
+        client = mock.Mock()
+        client.exists.return_value = blob in objects
+        client.download_blob.return_value = stream
+        return client
+
+    with mock.patch("azure.storage.blob.BlobServiceClient") as service:
+        service_client = service.from_connection_string.return_value
+        service_client.get_blob_client.side_effect = get_blob_client
+        manager = storage.AzureStorageManager(
+            CONTAINER_NAME, connection_string="conn", temp_dir=str(tmp_path)
+        )
+
+        assert manager._exists("chunks", {"a/1", "b/2", "c/3"}) == {"a/1", "b/2"}
+        manager._download_paths("chunks", tmp_path.joinpath("out"), {"a/1", "b/2"})
+        service_client.get_container_client.assert_not_called()
+
+    assert tmp_path.joinpath("out", "a", "1").read_text() == "one"
+    assert tmp_path.joinpath("out", "b", "2").read_text() == "two"
+
+
+def test_azure_iter_files_is_lazy() -> None:
+    listed = []
+
+    def list_blobs(name_starts_with: str) -> Iterator[Dict[str, Any]]:
+        for name in ["a", "b", "c"]:
+            listed.append(name)
+            yield {"name": f"{name_starts_with}/{name}"}
+
+    with mock.patch("azure.storage.blob.BlobServiceClient") as service:
+        container_client = service.from_connection_string.return_value.get_container_client
+        container_client.return_value.list_blobs.side_effect = list_blobs
+        client = azure_client.AzureStorageClient(CONTAINER_NAME, connection_string="conn")
+        files = client.iter_files(CONTAINER_NAME, "prefix")
+        assert listed == []
+        assert next(files) == "prefix/a"
+        assert listed == ["a"]
+        assert list(files) == ["prefix/b", "prefix/c"]
+
+
 def get_tensorboard_fetcher_azure(
     require_secrets: bool, local_sync_dir: str, paths_to_sync: List[str]
 ) -> azure.AzureFetcher:
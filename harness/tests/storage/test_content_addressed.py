@@ -0,0 +1,217 @@
+import os
+import pathlib
+import threading
+from typing import Any, List, Set
+from unittest import mock
+
+import pytest
+
+from determined.common import storage
+from determined.common.storage import content_addressed
+from determined.exec import gc_checkpoints
+from tests import parallel
+from tests.storage import util
+
+
+@pytest.fixture()
+def inner(tmp_path: pathlib.Path) -> storage.SharedFSStorageManager:
+    return storage.SharedFSStorageManager(str(tmp_path.joinpath("storage")))
+
+
+@pytest.fixture()
+def manager(
+    tmp_path: pathlib.Path, inner: storage.SharedFSStorageManager
+) -> storage.ContentAddressedStorageManager:
+    return storage.ContentAddressedStorageManager(
+        inner, chunk_size=8, temp_dir=str(tmp_path.joinpath("scratch"))
+    )
+
+
+def list_chunks(inner: storage.SharedFSStorageManager) -> List[str]:
+    chunks_dir = os.path.join(inner._base_path, content_addressed.CHUNKS_DIR)
+    if not os.path.exists(chunks_dir):
+        return []
+    return [p for p in inner._list_directory(chunks_dir) if not p.endswith("/")]
+
+
+def test_build() -> None:
+    manager = storage.build(
+        {"type": "shared_fs", "host_path": "/tmp", "content_addressed": True}, None
+    )
+    assert isinstance(manager, storage.ContentAddressedStorageManager)
+    assert isinstance(manager.inner, storage.SharedFSStorageManager)
+
+    manager = storage.build(
+        {"type": "shared_fs", "host_path": "/tmp", "content_addressed": False}, None
+    )
+    assert isinstance(manager, storage.SharedFSStorageManager)
+
+
+def test_checkpoint_lifecycle(caplog: Any, manager: storage.ContentAddressedStorageManager) -> None:
+    util.run_storage_lifecycle_test(manager, caplog=caplog)
+
+
+def test_validate(manager: storage.ContentAddressedStorageManager) -> None:
+    storage.validate_manager(manager)
+
+
+def test_deduplication(
+    tmp_path: pathlib.Path,
+    inner: storage.SharedFSStorageManager,
+    manager: storage.ContentAddressedStorageManager,
+) -> None:
+    frozen = b"frozen weights, unchanged between checkpoints"
+    for i in range(2):
+        ckpt_dir = tmp_path.joinpath(f"ckpt{i}")
+        ckpt_dir.mkdir()
+        ckpt_dir.joinpath("frozen.bin").write_bytes(frozen)
+        ckpt_dir.joinpath("trained.bin").write_bytes(f"step {i}".encode())
+        manager.upload(ckpt_dir, f"ckpt{i}")
+        if i == 0:
+            first_chunks = set(list_chunks(inner))
+
+    # The second checkpoint only added a chunk for the changed file.
+    assert len(set(list_chunks(inner)) - first_chunks) == 1
+
+    manager.delete("ckpt0", ["**/*"])
+    out = tmp_path.joinpath("out")
+    manager.download("ckpt1", out)
+    assert out.joinpath("frozen.bin").read_bytes() == frozen
+    assert out.joinpath("trained.bin").read_bytes() == b"step 1"
+
+    manager.delete("ckpt1", ["**/*"])
+    assert list_chunks(inner) == []
+
+
+def test_gc_checkpoints_collects_once(
+    tmp_path: pathlib.Path,
+    inner: storage.SharedFSStorageManager,
+    manager: storage.ContentAddressedStorageManager,
+) -> None:
+    storage_ids = []
+    for i in range(3):
+        ckpt_dir = tmp_path.joinpath(f"ckpt{i}")
+        util.create_checkpoint(ckpt_dir)
+        manager.upload(ckpt_dir, f"ckpt{i}")
+        storage_ids.append(f"ckpt{i}")
+
+    collections = 0
+    collect_garbage = manager.collect_garbage
+
+    def counting_collect_garbage() -> int:
+        nonlocal collections
+        collections += 1
+        return collect_garbage()
+
+    manager.collect_garbage = counting_collect_garbage  # type: ignore
+    resources = gc_checkpoints.delete_checkpoints(manager, storage_ids, ["**/*"], dry_run=False)
+
+    assert resources == {storage_id: {} for storage_id in storage_ids}
+    assert collections == 1
+    assert list_chunks(inner) == []
+
+
+def test_checkpoint_sharded_upload_download(
+    tmp_path: pathlib.Path, manager: storage.ContentAddressedStorageManager
+) -> None:
+    with parallel.Execution(4, local_size=2) as pex:
+
+        @pex.run
+        def do_test() -> None:
+            util.run_storage_upload_download_sharded_test(pex, manager, tmp_path)
+
+
+def test_legacy_checkpoints(
+    tmp_path: pathlib.Path,
+    inner: storage.SharedFSStorageManager,
+    manager: storage.ContentAddressedStorageManager,
+) -> None:
+    # Checkpoints stored before content addressing was enabled have no manifest.
+    ckpt_dir = tmp_path.joinpath("ckpt")
+    util.create_checkpoint(ckpt_dir)
+    inner.upload(ckpt_dir, "legacy")
+
+    out = tmp_path.joinpath("out")
+    manager.download("legacy", out)
+    assert inner._list_directory(out) == inner._list_directory(ckpt_dir)
+
+    manager.delete("legacy", ["**/*"])
+    assert not os.path.exists(os.path.join(inner._base_path, "legacy"))
+
+
+def test_chunk_store_is_not_listed(
+    tmp_path: pathlib.Path,
+    inner: storage.SharedFSStorageManager,
+    manager: storage.ContentAddressedStorageManager,
+) -> None:
+    ckpt_dir = tmp_path.joinpath("ckpt")
+    util.create_checkpoint(ckpt_dir)
+
+    with mock.patch.object(inner, "download", wraps=inner.download) as download:
+        manager.upload(ckpt_dir, "ckpt")
+        manager.upload(ckpt_dir, "ckpt-again")
+        out = tmp_path.joinpath("out")
+        manager.download("ckpt-again", out)
+
+    assert inner._list_directory(out) == inner._list_directory(ckpt_dir)
+    assert all(not c.args[0].startswith(content_addressed.CHUNKS_DIR) for c in download.mock_calls)
+
+
+def test_garbage_collection_during_upload(
+    tmp_path: pathlib.Path,
+    inner: storage.SharedFSStorageManager,
+    manager: storage.ContentAddressedStorageManager,
+) -> None:
+    ckpt_dir = tmp_path.joinpath("ckpt")
+    util.create_checkpoint(ckpt_dir)
+    manager.upload(ckpt_dir, "old")
+    chunks = list_chunks(inner)
+
+    # Drop the only reference to the chunks, so that they are garbage until the next upload
+    # reuses them.
+    inner.delete(f"{content_addressed.MANIFESTS_DIR}/old", ["**/*"])
+
+    # Another process collects garbage right after the upload finds the chunks it can reuse.
+    collector = storage.ContentAddressedStorageManager(inner, chunk_size=8)
+    exists = inner._exists
+    collected = []
+
+    def exists_then_collect(src: str, paths: Set[str]) -> Set[str]:
+        found = exists(src, paths)
+        collected.append(collector.collect_garbage())
+        return found
+
+    with mock.patch.object(inner, "_exists", side_effect=exists_then_collect):
+        manager.upload(ckpt_dir, "new")
+
+    assert collected == [0]
+    assert list_chunks(inner) == chunks
+    out = tmp_path.joinpath("out")
+    manager.download("new", out)
+    assert inner._list_directory(out) == inner._list_directory(ckpt_dir)
+
+
+def test_upload_waits_for_garbage_collection(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: pathlib.Path,
+    manager: storage.ContentAddressedStorageManager,
+) -> None:
+    monkeypatch.setattr(content_addressed, "LOCK_POLL_INTERVAL", 0.01)
+    ckpt_dir = tmp_path.joinpath("ckpt")
+    util.create_checkpoint(ckpt_dir)
+
+    # A lock left behind by a crashed garbage collection is ignored.
+    manager._write_json(content_addressed.LOCKS_DIR, {"gc.0.stale/lock.json": {}})
+    manager.upload(ckpt_dir, "first")
+
+    with manager._lock("gc"):
+        upload = threading.Thread(target=manager.upload, args=(ckpt_dir, "second"))
+        upload.start()
+        upload.join(timeout=0.5)
+        assert upload.is_alive()
+    upload.join(timeout=10)
+    assert not upload.is_alive()
+
+    out = tmp_path.joinpath("out")
+    manager.download("second", out)
+    assert manager._list_directory(out) == manager._list_directory(ckpt_dir)
@@ -1,13 +1,17 @@
 import os
 import pathlib
+import threading
 import uuid
-from typing import Dict, Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+from unittest import mock
 
 import pytest
 from google.auth import exceptions
+from google.cloud.storage import transfer_manager
 
 from determined import errors
 from determined.common import storage
+from determined.common.storage import gcs as gcs_storage
 from determined.tensorboard.fetchers import gcs
 from tests.storage import util
 
@@ -95,6 +99,117 @@ def test_gcs_lifecycle(
     util.run_storage_lifecycle_test(live_gcs_manager, post_delete_cb)
 
 
+def make_mock_blobs(objects: Dict[str, Optional[str]], large: str) -> List[mock.Mock]:
+    def download_to_filename(blob: mock.Mock, filename: str) -> None:
+        pathlib.Path(filename).write_text(objects[blob.name] or "")
+
+    blobs = []
+    for name in objects:
+        blob = mock.Mock()
+        blob.name = name
+        blob.size = gcs_storage.RANGED_DOWNLOAD_THRESHOLD + 1 if name == large else 1
+        blob.download_to_filename.side_effect = lambda filename, blob=blob: download_to_filename(
+            blob, filename
+        )
+        blobs.append(blob)
+    return blobs
+
+
+def test_gcs_download_concurrency(tmp_path: pathlib.Path) -> None:
+    """Downloads are spread across worker threads and large blobs use ranged requests."""
+    objects = {f"pre/storage-id/{k}": v for k, v in util.EXPECTED_FILES.items()}
+    large = "pre/storage-id/root.txt"
+    blobs = make_mock_blobs(objects, large)
+
+    threads = set()
+    lock = threading.Lock()
+
+    def download_chunks(blob: Any, filename: str, **kwargs: Any) -> None:
+        assert kwargs["max_workers"] == 3
+        with lock:
+            threads.add(threading.get_ident())
+        pathlib.Path(filename).write_text(objects[blob.name] or "")
+
+    with mock.patch("google.cloud.storage.Client") as client, mock.patch.object(
+        transfer_manager, "download_chunks_concurrently", side_effect=download_chunks
+    ) as download_chunks_concurrently:
+        client.return_value.bucket.return_value.list_blobs.return_value = blobs
+        manager = storage.GCSStorageManager(
+            bucket=BUCKET_NAME, prefix="pre", temp_dir=str(tmp_path), max_concurrency=9
+        )
+
+        manager.download("storage-id", tmp_path.joinpath("all"))
+        util.validate_checkpoint(tmp_path.joinpath("all"), util.EXPECTED_FILES)
+        download_chunks_concurrently.assert_called_once()
+        assert threading.get_ident() not in threads
+
+        # The shared session's connection pool fits every concurrent request.
+        adapter = client.return_value._http.mount.call_args.args[1]
+        assert adapter._pool_maxsize == 10
+
+        manager.download(
+            "storage-id", tmp_path.joinpath("some"), selector=lambda x: x.startswith("subdir/")
+        )
+        expected = {k: v for k, v in util.EXPECTED_FILES.items() if k.startswith("subdir/")}
+        util.validate_checkpoint(tmp_path.joinpath("some"), expected)
+
+    with mock.patch("google.cloud.storage.Client") as client:
+        client.return_value.bucket.return_value.list_blobs.return_value = []
+        manager = storage.GCSStorageManager(bucket=BUCKET_NAME, temp_dir=str(tmp_path))
+        with pytest.raises(errors.CheckpointNotFound):
+            manager.download("storage-id", tmp_path.joinpath("missing"))
+
+
+def test_gcs_download_without_transfer_manager(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Older google-cloud-storage releases fall back to whole-blob downloads."""
+    objects = {f"pre/storage-id/{k}": v for k, v in util.EXPECTED_FILES.items()}
+    blobs = make_mock_blobs(objects, large="pre/storage-id/root.txt")
+    monkeypatch.delattr(transfer_manager, "download_chunks_concurrently")
+
+    with mock.patch("google.cloud.storage.Client") as client:
+        client.return_value.bucket.return_value.list_blobs.return_value = blobs
+        manager = storage.GCSStorageManager(
+            bucket=BUCKET_NAME, prefix="pre", temp_dir=str(tmp_path)
+        )
+        manager.download("storage-id", tmp_path.joinpath("all"))
+
+    util.validate_checkpoint(tmp_path.joinpath("all"), util.EXPECTED_FILES)
+    for blob in blobs:
+        if not blob.name.endswith("/"):
+            blob.download_to_filename.assert_called_once()
+
+
+def test_gcs_exists_and_download_paths(tmp_path: pathlib.Path) -> None:
+    """Individual blobs are looked up and fetched by name, without listing the prefix."""
+    objects = {"pre/chunks/a/1": "one", "pre/chunks/b/2": "two"}
+
+    def blob(name: str) -> mock.Mock:
+        blob = mock.Mock()
+        blob.name = name
+        blob.size = None
+        blob.exists.return_value = name in objects
+        blob.download_to_filename.side_effect = lambda filename: pathlib.Path(filename).write_text(
+            objects[name]
+        )
+        return blob
+
+    with mock.patch("google.cloud.storage.Client") as client:
+        bucket = client.return_value.bucket.return_value
+        bucket.blob.side_effect = blob
+        manager = storage.GCSStorageManager(
+            bucket=BUCKET_NAME, prefix="pre", temp_dir=str(tmp_path)
+        )
+
+        assert manager._exists("chunks", {"a/1", "b/2", "c/3"}) == {"a/1", "b/2"}
+        manager._download_paths("chunks", tmp_path.joinpath("out"), {"a/1", "b/2"})
+        bucket.list_blobs.assert_not_called()
+
+    assert tmp_path.joinpath("out", "a", "1").read_text() == "one"
+    assert tmp_path.joinpath("out", "b", "2").read_text() == "two"
+
+
 def get_tensorboard_fetcher_gcs(
     require_secrets: bool, local_sync_dir: str, paths_to_sync: List[str]
 ) -> gcs.GCSFetcher:
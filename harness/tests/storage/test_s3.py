@@ -2,8 +2,10 @@ import io
 import logging
 import os
 import pathlib
+import threading
 import uuid
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
+from unittest import mock
 
 import pytest
 from botocore import exceptions
@@ -89,6 +91,126 @@ def test_storage_prefix_normalization(
         assert should_fail and "prefix must not match" in str(exc)
 
 
+def test_s3_upload_concurrency(tmp_path: pathlib.Path) -> None:
+    """Uploads are spread across worker threads and every path is uploaded exactly once."""
+    src = tmp_path.joinpath("src")
+    util.create_checkpoint(src)
+
+    threads = set()
+    uploaded: Dict[str, str] = {}
+    lock = threading.Lock()
+
+    def upload_file(filename: str, bucket: str, key: str, **kwargs: Any) -> None:
+        assert bucket == BUCKET_NAME
+        assert kwargs["Config"].multipart_chunksize == 8 * 1024 * 1024
+        assert kwargs["Config"].max_concurrency == 3
+        with lock:
+            threads.add(threading.get_ident())
+            uploaded[key] = pathlib.Path(filename).read_text()
+
+    def put_object(Bucket: str, Key: str, Body: bytes) -> None:
+        assert Bucket == BUCKET_NAME and Body == b""
+        with lock:
+            uploaded[Key] = ""
+
+    with mock.patch("boto3.resource") as resource:
+        client = resource.return_value.meta.client
+        client.upload_file.side_effect = upload_file
+        client.put_object.side_effect = put_object
+        manager = storage.S3StorageManager(
+            bucket=BUCKET_NAME,
+            prefix="pre",
+            temp_dir=str(tmp_path),
+            max_concurrency=9,
+            multipart_chunksize=8 * 1024 * 1024,
+        )
+        manager.upload(src, "storage-id")
+
+    # Nine requests are split into three files at a time with three parts each, and the
+    # connection pool has room for all of them plus the object listing.
+    assert manager._object_concurrency == 3
+    assert resource.call_args.kwargs["config"].max_pool_connections == 10
+
+    expected = {f"pre/storage-id/{k}": v or "" for k, v in util.EXPECTED_FILES.items()}
+    assert uploaded == expected
+    assert threading.get_ident() not in threads
+
+    # Errors from a worker thread surface in the caller.
+    with mock.patch("boto3.resource") as resource:
+        resource.return_value.meta.client.upload_file.side_effect = ValueError("upload failed")
+        manager = storage.S3StorageManager(bucket=BUCKET_NAME, temp_dir=str(tmp_path))
+        with pytest.raises(ValueError, match="upload failed"):
+            manager.upload(src, "storage-id")
+
+    with pytest.raises(ValueError, match="multipart_chunksize"):
+        with mock.patch("boto3.resource"):
+            storage.S3StorageManager(bucket=BUCKET_NAME, multipart_chunksize=1024)
+
+
+def test_s3_download_concurrency(tmp_path: pathlib.Path) -> None:
+    """Downloads are spread across worker threads and honor the selector."""
+    objects = {f"pre/storage-id/{k}": v for k, v in util.EXPECTED_FILES.items()}
+
+    threads = set()
+    lock = threading.Lock()
+
+    def download_file(bucket: str, key: str, filename: str, **kwargs: Any) -> None:
+        assert bucket == BUCKET_NAME
+        with lock:
+            threads.add(threading.get_ident())
+        pathlib.Path(filename).write_text(objects[key] or "")
+
+    with mock.patch("boto3.resource") as resource:
+        resource.return_value.Bucket.return_value.objects.filter.return_value = [
+            mock.Mock(key=key) for key in objects
+        ]
+        resource.return_value.meta.client.download_file.side_effect = download_file
+        manager = storage.S3StorageManager(
+            bucket=BUCKET_NAME, prefix="pre", temp_dir=str(tmp_path), max_concurrency=4
+        )
+
+        manager.download("storage-id", tmp_path.joinpath("all"))
+        util.validate_checkpoint(tmp_path.joinpath("all"), util.EXPECTED_FILES)
+        assert threading.get_ident() not in threads
+
+        manager.download(
+            "storage-id", tmp_path.joinpath("some"), selector=lambda x: x.startswith("subdir/")
+        )
+        expected = {k: v for k, v in util.EXPECTED_FILES.items() if k.startswith("subdir/")}
+        util.validate_checkpoint(tmp_path.joinpath("some"), expected)
+
+
+def test_s3_exists_and_download_paths(tmp_path: pathlib.Path) -> None:
+    """Individual objects are looked up and fetched by key, without listing the prefix."""
+    objects = {"pre/chunks/a/1": "one", "pre/chunks/b/2": "two"}
+
+    def head_object(Bucket: str, Key: str) -> None:
+        if Key not in objects:
+            raise exceptions.ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+    def download_file(bucket: str, key: str, filename: str, **kwargs: Any) -> None:
+        pathlib.Path(filename).write_text(objects[key])
+
+    with mock.patch("boto3.resource") as resource:
+        client = resource.return_value.meta.client
+        client.head_object.side_effect = head_object
+        client.download_file.side_effect = download_file
+        manager = storage.S3StorageManager(bucket=BUCKET_NAME, prefix="pre", temp_dir=str(tmp_path))
+
+        assert manager._exists("chunks", {"a/1", "b/2", "c/3"}) == {"a/1", "b/2"}
+        manager._download_paths("chunks", tmp_path.joinpath("out"), {"a/1", "b/2"})
+        resource.return_value.Bucket.return_value.objects.filter.assert_not_called()
+
+        client.head_object.side_effect = exceptions.ClientError(
+            {"Error": {"Code": "403"}}, "HeadObject"
+        )
+        with pytest.raises(exceptions.ClientError):
+            manager._exists("chunks", {"a/1"})
+
+    assert tmp_path.joinpath("out", "a", "1").read_text() == "one"
+    assert tmp_path.joinpath("out", "b", "2").read_text() == "two"
+
+
 @pytest.mark.cloud
 @pytest.mark.parametrize("prefix", [None, "my/test/prefix"])
 def test_live_s3_lifecycle(
@@ -1,6 +1,9 @@
+import contextlib
+import errno
 import os
 import pathlib
 import shutil
+import threading
 import unittest.mock
 import uuid
 from typing import Any, Dict, List
@@ -202,3 +205,52 @@ def test_copytree(tmp_path: pathlib.Path, manager: storage.SharedFSStorageManage
             "subdir/file_nested": "nested file",
         },
     )
+
+
+def test_copytree_copies_in_parallel(tmp_path: pathlib.Path) -> None:
+    src_dir = tmp_path.joinpath("src")
+    util.create_checkpoint(src_dir, util.EXPECTED_FILES)
+    os.utime(src_dir.joinpath("subdir"), (0, 0))
+
+    copy_file = shared._copy_file
+    threads = set()
+
+    def record_thread(src: str, dst: str) -> None:
+        threads.add(threading.get_ident())
+        copy_file(src, dst)
+
+    dst_dir = tmp_path.joinpath("dst")
+    with unittest.mock.patch.object(shared, "_copy_file", side_effect=record_thread):
+        shared.copytree(str(src_dir), str(dst_dir))
+
+    util.validate_checkpoint(dst_dir, expected_files=util.EXPECTED_FILES)
+    assert threads and threading.get_ident() not in threads
+    # Directory timestamps survive the files being copied into them.
+    assert dst_dir.joinpath("subdir").stat().st_mtime == 0
+
+    # Errors from every file are collected.
+    with unittest.mock.patch.object(shared, "_copy_file", side_effect=OSError("copy failed")):
+        with pytest.raises(shutil.Error, match="copy failed"):
+            shared.copytree(str(src_dir), str(tmp_path.joinpath("failed")))
+
+
+@pytest.mark.parametrize("disabled", ["nothing", "reflink", "copy_file_range"])
+def test_copy_file(disabled: str, tmp_path: pathlib.Path) -> None:
+    src = tmp_path.joinpath("src")
+    src.write_bytes(os.urandom(3 * 1024 * 1024 + 7))
+    os.utime(src, (1, 1))
+    dst = tmp_path.joinpath("dst")
+
+    with contextlib.ExitStack() as stack:
+        if disabled != "nothing":
+            stack.enter_context(unittest.mock.patch.object(shared, "_reflink", return_value=False))
+        if disabled == "copy_file_range":
+            stack.enter_context(
+                unittest.mock.patch.object(
+                    os, "copy_file_range", side_effect=OSError(errno.EXDEV, "cross-device")
+                )
+            )
+        shared._copy_file(str(src), str(dst))
+
+    assert dst.read_bytes() == src.read_bytes()
+    assert dst.stat().st_mtime == 1
@@ -0,0 +1,62 @@
+import os
+import pathlib
+import queue
+from concurrent import futures
+from typing import List
+from unittest import mock
+
+from determined.exec import tensorboard
+from determined.tensorboard import fetchers
+
+
+def fetch(fetcher: fetchers.Fetcher, paths: List[pathlib.Path]) -> None:
+    for path in paths:
+        fetcher._fetch(str(path), lambda: None)
+
+
+def test_fetch_reassembles_segments(tmp_path: pathlib.Path) -> None:
+    storage = tmp_path.joinpath("storage")
+    storage.mkdir()
+    local_dir = tmp_path.joinpath("local")
+    fetcher = fetchers.SharedFSFetcher({}, [str(storage)], str(local_dir))
+
+    events = storage.joinpath("events.out.tfevents.example")
+    events.write_bytes(b"zero")
+    segments = []
+    for start, data in [(4, b"one"), (7, b"two"), (10, b"three")]:
+        segment = storage.joinpath(f"{events.name}.segment-{start:020d}-{start + len(data):020d}")
+        segment.write_bytes(data)
+        segments.append(segment)
+
+    # Segments which arrive early wait for the bytes before them.
+    fetch(fetcher, [segments[1], events, segments[2], segments[0]])
+    local_events = local_dir.joinpath(str(events).lstrip("/"))
+    assert local_events.read_bytes() == b"zeroonetwothree"
+    assert [p.name for p in local_events.parent.iterdir()] == [events.name]
+    assert fetcher._pending_segments == {}
+
+    # Once the whole file has been uploaded again, segments it covers are not downloaded at all.
+    events.write_bytes(b"zeroonetwothreefour")
+    for segment in segments:
+        segment.unlink()
+    fetch(fetcher, [events, segments[2]])
+    assert local_events.read_bytes() == b"zeroonetwothreefour"
+
+
+def test_iteration_lists_newest_runs_first(tmp_path: pathlib.Path) -> None:
+    runs = [tmp_path.joinpath(f"trial{i}") for i in range(3)]
+    for i in [1, 0, 2]:
+        runs[i].mkdir()
+        runs[i].joinpath("events").write_bytes(b"")
+        os.utime(runs[i].joinpath("events"), (i, i))
+    fetcher = fetchers.SharedFSFetcher({}, [str(run) for run in runs], str(tmp_path))
+    thread = tensorboard.TBFetchIterationThread(fetcher, queue.Queue())
+
+    with futures.ThreadPoolExecutor(2) as pool:
+        assert thread._iterate(pool) == [str(run.joinpath("events")) for run in reversed(runs)]
+
+        # Storage paths without changes are listed less and less often.
+        with mock.patch.object(fetcher, "_list", return_value=iter([])) as list_files:
+            for _ in range(8):
+                thread._iterate(pool)
+        assert [c.args[0] for c in list_files.call_args_list].count(str(runs[0])) == 3
@@ -0,0 +1,99 @@
+import os
+import pathlib
+import time
+from typing import List
+from unittest import mock
+
+import pytest
+
+from determined.tensorboard import _file_index
+
+
+def touch(path: pathlib.Path, content: str = "x") -> pathlib.Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as f:
+        f.write(content)
+    return path
+
+
+def age(path: pathlib.Path, seconds: float = 10) -> None:
+    """Backdate a file or directory, as if it was last modified a while ago."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - int(seconds * 1e9)))
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_file_index(tmp_path: pathlib.Path, use_inotify: bool) -> None:
+    index = _file_index.FileIndex(tmp_path.joinpath("tb"), use_inotify=use_inotify)
+    try:
+        assert index.modified_since(0) == []
+
+        events = touch(tmp_path.joinpath("tb", "events.out.tfevents.1"))
+        trace = touch(tmp_path.joinpath("tb", "plugins", "profile", "1", "trace.json.gz"))
+        assert set(index.modified_since(0)) == {events, trace}
+
+        # Nothing changed.
+        since = time.time()
+        assert index.modified_since(since) == []
+
+        # Files which are appended to, created, and created in new directories are all found.  File
+        # timestamps come from a coarser clock than time.time(), so let it tick past `since` first.
+        time.sleep(0.1)
+        touch(events)
+        new = touch(tmp_path.joinpath("tb", "plugins", "profile", "2", "trace.json.gz"))
+        assert set(index.modified_since(since)) == {events, new}
+
+        # Deleted files and directories are forgotten.
+        since = time.time()
+        new.unlink()
+        new.parent.rmdir()
+        assert index.modified_since(since) == []
+
+        # Going back in time falls back to a full scan.
+        assert set(index.modified_since(0)) == {events, trace}
+    finally:
+        index.close()
+
+
+def test_file_index_caches_directory_listings(tmp_path: pathlib.Path) -> None:
+    dirs = [tmp_path.joinpath(str(i)) for i in range(5)]
+    files = [touch(d.joinpath("file")) for d in dirs]
+    for path in [*files, *dirs, tmp_path]:
+        age(path)
+
+    index = _file_index.FileIndex(tmp_path, use_inotify=False)
+    scandir = os.scandir
+    scanned: List[str] = []
+
+    def counting_scandir(path: str) -> "os._ScandirIterator[str]":
+        scanned.append(path)
+        return scandir(path)
+
+    with mock.patch("os.scandir", counting_scandir):
+        assert set(index.modified_since(0)) == set(files)
+        assert len(scanned) == 6
+
+        # Only the directory which gained a file is listed again.
+        scanned.clear()
+        new = touch(dirs[3].joinpath("new"))
+        assert index.modified_since(time.time() - 5) == [new]
+        assert scanned == [str(dirs[3])]
+
+
+def test_file_index_with_inotify_only_stats_changes(tmp_path: pathlib.Path) -> None:
+    files = [touch(tmp_path.joinpath(str(i), "file")) for i in range(100)]
+    index = _file_index.FileIndex(tmp_path)
+    try:
+        since = time.time()
+        assert len(index.modified_since(0)) == 100
+        if index._watcher is None:
+            pytest.skip("inotify is not available")
+
+        time.sleep(0.1)
+        touch(files[42])
+        with mock.patch("os.stat", wraps=os.stat) as stat:
+            assert index.modified_since(since) == [files[42]]
+        # Only the base directory's existence and the changed file were checked.
+        assert [c.args[0] for c in stat.call_args_list] == [str(tmp_path), str(files[42])]
+    finally:
+        index.close()
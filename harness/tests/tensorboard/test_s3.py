@@ -1,6 +1,7 @@
 import copy
 import os
 import pathlib
+import time
 from typing import Optional
 
 import pytest
@@ -95,3 +96,31 @@ def test_s3_faulty_lifecycle(monkeypatch: monkeypatch.MonkeyPatch) -> None:
 
     with pytest.raises(exceptions.S3UploadFailedError):
         manager.sync()
+
+
+def test_s3_append_uploads(monkeypatch: monkeypatch.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    monkeypatch.setattr("boto3.client", s3.s3_client)
+    manager = tensorboard.S3TensorboardManager(
+        "s3_bucket", None, None, None, None, tmp_path, pathlib.Path("sync"), async_upload=False
+    )
+    events = tmp_path.joinpath("events.out.tfevents.example")
+    key = "sync/events.out.tfevents.example"
+
+    events.write_bytes(b"first")
+    manager._sync()
+    # Let the mtime move on before appending.
+    time.sleep(0.1)
+    with events.open("ab") as f:
+        f.write(b"second")
+    manager._sync()
+
+    # Only the appended bytes were uploaded the second time.
+    segment = f"{key}.segment-{5:020d}-{11:020d}"
+    assert manager.client.objects == {
+        ("s3_bucket", key): "first",
+        ("s3_bucket", segment): b"second",
+    }
+
+    # Closing replaces the segments with the whole file.
+    manager.close()
+    assert manager.client.objects == {("s3_bucket", key): "firstsecond"}
@@ -5,8 +5,10 @@ import sys
 import textwrap
 import time
 import traceback
-from typing import Any, List, Optional, cast
+from typing import Any, Dict, List, Optional, cast
+from unittest import mock
 
+import numpy as np
 import pytest
 
 import determined as det
@@ -114,10 +116,45 @@ def test_broadcast_server_client() -> None:
                 assert all(g == 2 * msg for g in gathered)
 
 
+def test_send_recv_pyobj_out_of_band() -> None:
+    import zmq
+
+    context = zmq.Context()
+    with context.socket(zmq.PUSH) as push, context.socket(zmq.PULL) as pull:
+        port = pull.bind_to_random_port("tcp://127.0.0.1")
+        push.connect(f"tcp://127.0.0.1:{port}")
+
+        big = np.arange(1024 * 1024, dtype=np.float64)
+        small = np.arange(8, dtype=np.int32)
+        expect: Dict[str, Any] = {"big": big.copy(), "small": small.copy(), "other": [1, "two"]}
+
+        with mock.patch.object(push, "send", wraps=push.send) as send:
+            ipc._send_pyobj(push, {"big": big, "small": small, "other": [1, "two"]})
+        # The pickle, then each array's data in its own frame, with only the big one zero-copy.
+        assert send.call_count == 3
+        assert [c.kwargs.get("copy", True) for c in send.call_args_list] == [True, False, True]
+
+        # Once sending returns, the arrays may be modified without affecting the message.
+        big[:] = 0
+        small[:] = 0
+
+        out = ipc._recv_pyobj(pull)
+        assert out.keys() == expect.keys()
+        assert out["other"] == expect["other"]
+        for name in ("big", "small"):
+            assert np.array_equal(out[name], expect[name])
+            assert out[name].dtype == expect[name].dtype
+            assert out[name].flags.writeable
+    context.term()
+
+
 @pytest.mark.parametrize("cross_size", [1, 4])
 @pytest.mark.parametrize("local_size", [1, 4])
 @pytest.mark.parametrize("force_tcp", [False, True])
-def test_distributed_context(cross_size: int, local_size: int, force_tcp: bool) -> None:
+@pytest.mark.parametrize("hierarchical_gather", [False, True])
+def test_distributed_context(
+    cross_size: int, local_size: int, force_tcp: bool, hierarchical_gather: bool
+) -> None:
     size = cross_size * local_size
 
     # Make sure `make test` doesn't hang on macbook's default values.  Avoid skipping on linux
@@ -143,6 +180,7 @@ def test_distributed_context(cross_size: int, local_size: int, force_tcp: bool)
                 cross_size=pex.cross_size,
                 chief_ip="localhost",
                 force_tcp=force_tcp,
+                hierarchical_gather=hierarchical_gather,
             )
 
         # Perform a broadcast.
@@ -182,6 +220,15 @@ def test_distributed_context(cross_size: int, local_size: int, force_tcp: bool)
         ]
         assert results == expect, "not all threads ran allgather_local correctly"
 
+        # Gathers preserve rank order, and stay in sync across repeated and mixed collectives.
+        for _ in range(3):
+            results = pex.run(lambda: contexts[pex.rank].gather(pex.rank))
+            assert results == [list(range(size))] + [None] * (size - 1)
+            results = pex.run(lambda: contexts[pex.rank].allgather(pex.rank))
+            assert results == [list(range(size))] * size
+            results = pex.run(lambda: contexts[pex.rank].broadcast(pex.rank))
+            assert results == [0] * size
+
         # Close all contexts.
         for context in contexts:
             context.close()
@@ -0,0 +1,68 @@
+import base64
+import io
+import os
+import pathlib
+import tarfile
+from typing import Dict
+from unittest import mock
+
+import pytest
+
+from determined import constants
+from determined.exec import prep_container
+
+
+def make_b64_tgz(files: Dict[str, bytes]) -> str:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tgz:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tgz.addfile(info, io.BytesIO(content))
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def download(b64_tgz: str) -> None:
+    info = mock.Mock(task_id="task", task_type="COMMAND")
+    resp = mock.Mock(b64Tgz=b64_tgz)
+    with mock.patch.object(
+        prep_container.bindings, "get_GetTaskContextDirectory", return_value=resp
+    ):
+        prep_container.download_context_directory(mock.Mock(), info)
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_download_context_directory(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path, cached: bool
+) -> None:
+    if cached:
+        monkeypatch.setenv(prep_container.CONTEXT_CACHE_DIR_ENV, str(tmp_path.joinpath("cache")))
+    b64_tgz = make_b64_tgz({"train.py": b"print('hi')", "lib/util.py": b"x = 1"})
+    extract = mock.Mock(wraps=prep_container._extract_context_directory)
+    monkeypatch.setattr(prep_container, "_extract_context_directory", extract)
+
+    # Two containers on the same agent start with the same context directory.
+    for i in range(2):
+        model_copy = tmp_path.joinpath(f"model{i}")
+        workdir = tmp_path.joinpath(f"workdir{i}")
+        workdir.mkdir()
+        monkeypatch.setattr(constants, "MANAGED_TRAINING_MODEL_COPY", str(model_copy))
+        monkeypatch.chdir(workdir)
+        download(b64_tgz)
+        for path in [model_copy, workdir]:
+            assert path.joinpath("train.py").read_bytes() == b"print('hi')"
+            assert path.joinpath("lib", "util.py").read_bytes() == b"x = 1"
+
+    assert extract.call_count == (1 if cached else 2)
+    if cached:
+        assert os.listdir(tmp_path.joinpath("cache")) == [prep_container._context_digest(b64_tgz)]
+
+
+def test_download_context_directory_rejects_parent_paths(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    monkeypatch.setenv(prep_container.CONTEXT_CACHE_DIR_ENV, str(tmp_path.joinpath("cache")))
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match="parent directory"):
+        download(make_b64_tgz({"../escape.py": b""}))
+    assert os.listdir(tmp_path.joinpath("cache")) == []
@@ -1311,6 +1311,9 @@ func (m *Master) Run(ctx context.Context, gRPCLogInitDone chan struct{}) error {
 	}
 	m.echo.Use(middleware.GzipWithConfig(gzipConfig))
 
+	// Log shippers send gzip-compressed request bodies.
+	m.echo.Use(middleware.Decompress())
+
 	m.echo.Use(middleware.AddTrailingSlashWithConfig(middleware.TrailingSlashConfig{
 		Skipper: func(c echo.Context) bool {
 			return !staticWebDirectoryPaths[c.Path()]
@@ -29,9 +29,10 @@ type CheckpointStorageConfigV0 struct {
 	RawAzureConfig     *AzureConfigV0     `union:"type,azure" json:"-"`
 	RawDirectoryConfig *DirectoryConfigV0 `union:"type,directory" json:"-"`
 
-	RawSaveExperimentBest *int `json:"save_experiment_best"`
-	RawSaveTrialBest      *int `json:"save_trial_best"`
-	RawSaveTrialLatest    *int `json:"save_trial_latest"`
+	RawContentAddressed   *bool `json:"content_addressed"`
+	RawSaveExperimentBest *int  `json:"save_experiment_best"`
+	RawSaveTrialBest      *int  `json:"save_trial_best"`
+	RawSaveTrialLatest    *int  `json:"save_trial_latest"`
 }
 
 // Merge implements schemas.Mergeable.
@@ -166,6 +167,9 @@ type S3ConfigV0 struct {
 	RawSecretKey   *string `json:"secret_key"`
 	RawEndpointURL *string `json:"endpoint_url"`
 	RawPrefix      *string `json:"prefix"`
+
+	RawMaxConcurrency     *int `json:"max_concurrency"`
+	RawMultipartChunksize *int `json:"multipart_chunksize"`
 }
 
 // Validate implements the check.Validatable interface.
@@ -194,6 +198,8 @@ func validateStoragePrefix(prefix *string) error {
 type GCSConfigV0 struct {
 	RawBucket *string `json:"bucket"`
 	RawPrefix *string `json:"prefix"`
+
+	RawMaxConcurrency *int `json:"max_concurrency"`
 }
 
 // Validate implements the check.Validatable interface.
@@ -216,6 +222,8 @@ type AzureConfigV0 struct {
 	RawConnectionString *string `json:"connection_string,omitempty"`
 	RawAccountURL       *string `json:"account_url,omitempty"`
 	RawCredential       *string `json:"credential,omitempty"`
+
+	RawMaxConcurrency *int `json:"max_concurrency"`
 }
 
 // Merge implements schemas.Mergeable.
@@ -232,6 +240,7 @@ func (c AzureConfigV0) Merge(other AzureConfigV0) AzureConfigV0 {
 		RawConnectionString: schemas.Copy(credSource.RawConnectionString),
 		RawAccountURL:       schemas.Copy(credSource.RawAccountURL),
 		RawCredential:       schemas.Copy(credSource.RawCredential),
+		RawMaxConcurrency:   schemas.Merge(c.RawMaxConcurrency, other.RawMaxConcurrency),
 	}
 }
 
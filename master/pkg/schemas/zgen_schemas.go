@@ -88,6 +88,21 @@ var (
             ],
             "default": null
         },
+        "max_concurrency": {
+            "type": [
+                "integer",
+                "null"
+            ],
+            "default": null,
+            "minimum": 1
+        },
+        "content_addressed": {
+            "type": [
+                "boolean",
+                "null"
+            ],
+            "default": false
+        },
         "save_experiment_best": {
             "type": [
                 "integer",
@@ -314,12 +329,21 @@ var (
         "endpoint_url": true,
         "prefix": true,
         "host_path": true,
+        "max_concurrency": true,
+        "multipart_chunksize": true,
         "propagation": true,
         "secret_key": true,
         "storage_path": true,
         "tensorboard_path": true,
         "type": true,
         "user": true,
+        "content_addressed": {
+            "type": [
+                "boolean",
+                "null"
+            ],
+            "default": false
+        },
         "save_experiment_best": {
             "type": [
                 "integer",
@@ -421,6 +445,13 @@ var (
             ],
             "default": null
         },
+        "content_addressed": {
+            "type": [
+                "boolean",
+                "null"
+            ],
+            "default": false
+        },
         "save_experiment_best": {
             "type": [
                 "integer",
@@ -1092,6 +1123,21 @@ var (
             },
             "default": null
         },
+        "max_concurrency": {
+            "type": [
+                "integer",
+                "null"
+            ],
+            "default": null,
+            "minimum": 1
+        },
+        "content_addressed": {
+            "type": [
+                "boolean",
+                "null"
+            ],
+            "default": false
+        },
         "save_experiment_best": {
             "type": [
                 "integer",
@@ -2205,6 +2251,29 @@ var (
             },
             "default": null
         },
+        "max_concurrency": {
+            "type": [
+                "integer",
+                "null"
+            ],
+            "default": null,
+            "minimum": 1
+        },
+        "multipart_chunksize": {
+            "type": [
+                "integer",
+                "null"
+            ],
+            "default": null,
+            "minimum": 5242880
+        },
+        "content_addressed": {
+            "type": [
+                "boolean",
+                "null"
+            ],
+            "default": false
+        },
         "save_experiment_best": {
             "type": [
                 "integer",
@@ -3200,6 +3269,13 @@ var (
             ],
             "default": null
         },
+        "content_addressed": {
+            "type": [
+                "boolean",
+                "null"
+            ],
+            "default": false
+        },
         "save_experiment_best": {
             "type": [
                 "integer",
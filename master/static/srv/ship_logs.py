@@ -22,24 +22,31 @@ ship_logs.py will read environment variables set by the master to obtain its con
 isn't intended to be useful in any non-managed environments.
 """
 
+import base64
+import collections
 import datetime
+import gzip
+import http.client
 import io
 import json
 import logging
 import os
 import queue
 import re
+import shutil
 import signal
 import socket
 import ssl
 import subprocess
 import sys
+import tempfile
 import threading
 import time
 import traceback
 import urllib.error
+import urllib.parse
 import urllib.request
-from typing import Any, Dict, Iterator, List, NamedTuple, Optional, cast
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple, cast
 
 # Duplicated from determined/__init__.py.  It's nice to keep them in sync.
 LOG_FORMAT = "%(levelname)s: [%(process)s] %(name)s: %(message)s"
@@ -51,7 +58,16 @@ LOG_FORMAT = "%(levelname)s: [%(process)s] %(name)s: %(message)s"
 # Excluding empty spaces this regex matches rank in the above example as [rank=0]
 # Using the DOTALL flag means we keep the newline at the end of the pattern.
 rank = re.compile(
-    r"(?P<space1> ?)\[rank=(?P<rank_id>([0-9]+))\](?P<space2> ?)(?P<log>.*)", flags=re.DOTALL
+    r"(?P<space1> ?)\[rank=(?P<rank_id>([0-9]+))\](?P<space2> ?)(?P<log>.*)",
+    flags=re.DOTALL,
+)
+# Lines which could match the patterns above start with one of these, which is much cheaper to
+# check for than to try matching the patterns.
+rank_prefixes = ("[rank=", " [rank=")
+level_prefixes = tuple(
+    f"{space}{name}:"
+    for space in ("", " ")
+    for name in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
 )
 # Below regex is used to extract the message severity from the log message.
 # Excluding empty spaces and delimiter(:) this regex matches message severity level in the above
@@ -61,7 +77,8 @@ level = re.compile(
     r"(?P<space1> ?)(?P<level>(DEBUG|INFO|WARNING|ERROR|CRITICAL)):(?P<space2> ?)(?P<log>.*)",
     flags=re.DOTALL,
 )
-lineend = re.compile(rb"[\r\n]")
+# How much output to read at a time.
+READ_BLOCK_SIZE = 64 * 1024
 
 
 # Interval at which to force a flush.
@@ -77,6 +94,15 @@ LOG_BATCH_MAX_SIZE = 1000
 # only hit this if we got underwater by three full batches while trying to ship a batch.
 SHIP_QUEUE_MAX_SIZE = 3 * LOG_BATCH_MAX_SIZE
 
+# While the master is unreachable, logs are spooled to disk, and the oldest spooled batch is retried
+# with exponential backoff up to this long between attempts.
+SPOOL_RETRY_MAX_SECONDS = 15
+
+# Size of each spool segment file, and of all spool segments together before the oldest segments
+# are evicted.
+SPOOL_SEGMENT_BYTES = 4 * 1024 * 1024
+SPOOL_MAX_BYTES = 256 * 1024 * 1024
+
 
 class DoneMsg(NamedTuple):
     """
@@ -108,51 +134,35 @@ def read_newlines_or_carriage_returns(fd: io.RawIOBase) -> Iterator[str]:
     """
     # Ship lines of length of DEFAULT_BUFFER_SIZE, including the terminating newline.
     limit = io.DEFAULT_BUFFER_SIZE - 1
-    nread = 0
-    chunks: List[bytes] = []
-
-    def oneline():
-        nonlocal nread
-        nonlocal chunks
-        out = b"".join(chunks).decode("utf8")
-        chunks = []
-        nread = 0
-        return out
+    # The start of a line whose end has not been read yet.
+    partial = b""
 
     while True:
-        buf = fd.read(limit - nread)
+        # Each read returns whatever output is available, up to READ_BLOCK_SIZE.
+        buf = fd.read(READ_BLOCK_SIZE)
         if not buf:
             # EOF.
             break
 
-        # Extract all the lines from this buffer.
-        while buf:
-            m = lineend.search(buf)
-            if m is None:
-                # No line break here; just append to chunks.
-                chunks.append(buf)
-                nread += len(buf)
-                break
-
-            # Line break found!
-            start, end = m.span()
-            chunks.append(buf[:start])
-            # Even if we matched a '\r', emit a '\n'.
-            chunks.append(b"\n")
-            yield oneline()
-            # keep checking the rest of buf
-            buf = buf[end:]
+        # Split all the lines out of this buffer at once.  Even if we matched a '\r', emit a '\n'.
+        lines = (partial + buf).replace(b"\r", b"\n").split(b"\n")
+        partial = lines.pop()
+        for line in lines:
+            if len(line) <= limit:
+                yield line.decode("utf8") + "\n"
+                continue
+            for start in range(0, len(line), limit):
+                yield line[start : start + limit].decode("utf8") + "\n"
 
         # Detect if we reached our buffer limit.
-        if nread >= limit:
+        while len(partial) >= limit:
             # Pretend we got a line anyway.
-            chunks.append(b"\n")
-            yield oneline()
+            yield partial[:limit].decode("utf8") + "\n"
+            partial = partial[limit:]
 
     # One last line, maybe.
-    if chunks:
-        chunks.append(b"\n")
-        yield oneline()
+    if partial:
+        yield partial.decode("utf8") + "\n"
 
 
 class Collector(threading.Thread):
@@ -195,34 +205,67 @@ class Collector(threading.Thread):
             self.logq.put(None)
 
     def _run(self) -> None:
+        timestamps = TimestampFormatter()
         for line in read_newlines_or_carriage_returns(self.fd):
             # Capture the timestamp as soon as the line is collected.
-            now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            now = timestamps.now()
 
             if self.dup_io:
-                print(line, file=self.dup_io, flush=True, end="")
-
-            log: Dict[str, Any] = {"timestamp": now, **self.metadata}
-
-            m = rank.match(line)
-            if m:
-                try:
-                    log["rank_id"] = int(m.group("rank_id"))
+                self.dup_io.write(line)
+                self.dup_io.flush()
+
+            log: Dict[str, Any] = self.metadata.copy()
+            log["timestamp"] = now
+
+            if line.startswith(rank_prefixes):
+                m = rank.match(line)
+                if m:
+                    try:
+                        log["rank_id"] = int(m.group("rank_id"))
+                        line = m.group("log")
+                    except ValueError:
+                        pass
+
+            if line.startswith(level_prefixes):
+                m = level.match(line)
+                if m:
+                    found = m.group("level")
+                    log["level"] = f"LOG_LEVEL_{found}"
                     line = m.group("log")
-                except ValueError:
-                    pass
-
-            m = level.match(line)
-            if m:
-                found = m.group("level")
-                log["level"] = f"LOG_LEVEL_{found}"
-                line = m.group("log")
 
             log["log"] = line
 
             self.logq.put(log)
 
 
+class TimestampFormatter:
+    """
+    TimestampFormatter formats the current time like datetime.isoformat(), to the millisecond.
+
+    Formatting a timestamp costs more than reading and parsing a short line, so each timestamp is
+    formatted only once per millisecond, and its date and time only once per second.
+    """
+
+    def __init__(self) -> None:
+        self.ms = -1
+        self.second = -1
+        self.prefix = ""
+        self.formatted = ""
+
+    def now(self) -> str:
+        ms = int(time.time() * 1000)
+        if ms != self.ms:
+            self.ms = ms
+            second, frac = divmod(ms, 1000)
+            if second != self.second:
+                self.second = second
+                self.prefix = datetime.datetime.fromtimestamp(
+                    second, datetime.timezone.utc
+                ).strftime("%Y-%m-%dT%H:%M:%S")
+            self.formatted = f"{self.prefix}.{frac:03d}+00:00"
+        return self.formatted
+
+
 def override_verify_name(ctx: ssl.SSLContext, verify_name: str) -> ssl.SSLContext:
     class VerifyNameOverride:
         def __getattr__(self, name: str, default: Any = None) -> Any:
@@ -235,6 +278,104 @@ def override_verify_name(ctx: ssl.SSLContext, verify_name: str) -> ssl.SSLContex
     return cast(ssl.SSLContext, VerifyNameOverride())
 
 
+class SpoolSegment:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.size = 0
+        self.batches = 0
+
+
+class Spool:
+    """
+    Spool is a bounded, append-only queue of batches of logs on disk.
+
+    It holds logs while the master is unreachable, so that they neither pile up in memory nor get
+    lost during a master restart.  Batches are appended to segment files of SPOOL_SEGMENT_BYTES,
+    and once the segments add up to more than SPOOL_MAX_BYTES, whole segments are evicted, oldest
+    first.
+
+    Spool is not thread-safe.
+    """
+
+    def __init__(self, parent_dir: Optional[str] = None) -> None:
+        self.parent_dir = parent_dir
+        self.dir: Optional[str] = None
+        self.segments: Deque[SpoolSegment] = collections.deque()
+        self.writer: Optional[io.BufferedWriter] = None
+        self.next_segment = 0
+        # How far into the oldest segment batches have been popped.
+        self.read_offset = 0
+        self.size = 0
+        self.batches = 0
+        self.evicted_batches = 0
+
+    def append(self, data: bytes) -> None:
+        if self.writer is None or self.segments[-1].size >= SPOOL_SEGMENT_BYTES:
+            self.start_segment()
+        assert self.writer
+        segment = self.segments[-1]
+        # Batches are JSON, which never contains a raw newline.
+        self.writer.write(data + b"\n")
+        self.writer.flush()
+        segment.size += len(data) + 1
+        segment.batches += 1
+        self.size += len(data) + 1
+        self.batches += 1
+
+        while self.size > SPOOL_MAX_BYTES and len(self.segments) > 1:
+            evicted = self.segments.popleft()
+            os.remove(evicted.path)
+            self.size -= evicted.size
+            self.batches -= evicted.batches
+            self.evicted_batches += evicted.batches
+            self.read_offset = 0
+            logging.error(
+                f"log spool is full, dropped {evicted.batches} batches of logs ({evicted.size} "
+                f"bytes); {self.evicted_batches} batches dropped so far"
+            )
+
+    def peek(self) -> bytes:
+        """Return the oldest batch in the spool, which must not be empty."""
+        with open(self.segments[0].path, "rb") as f:
+            f.seek(self.read_offset)
+            return f.readline()[:-1]
+
+    def pop(self, data: bytes) -> None:
+        """Remove the oldest batch from the spool, as returned by peek()."""
+        segment = self.segments[0]
+        self.read_offset += len(data) + 1
+        segment.batches -= 1
+        self.batches -= 1
+        if segment.batches:
+            return
+        # Every batch in the segment was shipped.
+        self.segments.popleft()
+        if not self.segments and self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        os.remove(segment.path)
+        self.size -= segment.size
+        self.read_offset = 0
+
+    def start_segment(self) -> None:
+        if self.dir is None:
+            self.dir = tempfile.mkdtemp(prefix="det-ship-logs-", dir=self.parent_dir)
+        if self.writer is not None:
+            self.writer.close()
+        path = os.path.join(self.dir, f"{self.next_segment:012d}.spool")
+        self.next_segment += 1
+        self.writer = cast(io.BufferedWriter, open(path, "xb"))
+        self.segments.append(SpoolSegment(path))
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        if self.dir is not None:
+            shutil.rmtree(self.dir, ignore_errors=True)
+            self.dir = None
+
+
 class Shipper(threading.Thread):
     """
     Shipper reads structured logs from logq and ships them to the determined-master.
@@ -251,10 +392,12 @@ class Shipper(threading.Thread):
         logq: queue.Queue,
         doneq: queue.Queue,
         daemon: bool,
+        spool_dir: Optional[str] = None,
     ) -> None:
         super().__init__(daemon=daemon)
         self.logq = logq
         self.doneq = doneq
+        self.spool = Spool(spool_dir)
 
         # TODO(rb): Switch to DET_USER_TOKEN when the user token passed into a container isn't
         # limited to expire in 7 days, and then set `Authorization: Bearer $token` here instead.
@@ -272,7 +415,38 @@ class Shipper(threading.Thread):
                 logging.error("failed to read DET_MASTER_CERT_FILE ({cert_file})", exc_info=True)
 
         self.base_url = master_url.rstrip("/")
-        self.logs_url = f"{self.base_url}/api/v1/task/logs"
+        self.logs_path = "/api/v1/task/logs"
+
+        url = urllib.parse.urlsplit(self.base_url)
+        self.https = url.scheme == "https"
+        self.host = url.hostname or ""
+        self.port = url.port
+        self.path_prefix = url.path
+
+        # Honor http_proxy, https_proxy, and no_proxy like urllib does.
+        self.proxy: Optional[urllib.parse.SplitResult] = None
+        self.proxy_headers: Dict[str, str] = {}
+        proxy = urllib.request.getproxies().get(url.scheme)
+        if proxy and not urllib.request.proxy_bypass(url.netloc):
+            self.proxy = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            if self.proxy.username is not None:
+                creds = "{}:{}".format(
+                    urllib.parse.unquote(self.proxy.username),
+                    urllib.parse.unquote(self.proxy.password or ""),
+                )
+                self.proxy_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(
+                    creds.encode("utf8")
+                ).decode("ascii")
+
+        # One keep-alive connection to the master is reused for every batch.
+        self.conn: Optional[http.client.HTTPConnection] = None
+        # Cleared if the master rejects gzip-compressed logs.
+        self.gzip = True
+
+        # Batches are handed from the shipper thread, which accumulates the next batch, to a sender
+        # thread, which ships the previous one.
+        self.sendq: queue.Queue = queue.Queue(maxsize=1)
+        self.send_error: Optional[Exception] = None
 
         self.context = None
         if master_url.startswith("https://"):
@@ -302,6 +476,9 @@ class Shipper(threading.Thread):
             self.doneq.put(DoneMsg("shipper", error=None))
 
     def _run(self) -> None:
+        sender = threading.Thread(target=self.send_batches, daemon=True)
+        sender.start()
+
         eofs = 0
         while eofs < 2:
             logs: List[Dict[str, Any]] = []
@@ -329,50 +506,184 @@ class Shipper(threading.Thread):
             if not logs:
                 continue
 
-            data = json.dumps({"logs": logs}).encode("utf8")
+            self.hand_off(json.dumps({"logs": logs}).encode("utf8"), sender)
 
-            # Try to ship for about ten minutes.
-            backoffs = [0, 1, 5, 10, 15, 15, 15, 15, 15, 15, 15, 60, 60, 60, 60, 60, 60, 60, 60, 60]
+        self.hand_off(None, sender)
+        sender.join()
+        if self.send_error is not None:
+            raise self.send_error
 
-            self.ship(data, backoffs)
+    def hand_off(self, data: Optional[bytes], sender: threading.Thread) -> None:
+        """
+        Wait for the sender to take the batch before this one, then hand it the next batch.
+        """
+        while True:
+            try:
+                self.sendq.put(data, timeout=SHIPPER_FLUSH_INTERVAL)
+                return
+            except queue.Full:
+                if not sender.is_alive():
+                    raise cast(Exception, self.send_error)
+
+    def send_batches(self) -> None:
+        try:
+            eof = False
+            failures = 0
+            retry_at = 0.0
+            while True:
+                if not self.spool.batches:
+                    if eof:
+                        return
+                    data = self.sendq.get()
+                    if data is None:
+                        return
+                    if self.try_ship(data):
+                        continue
+                    # The master is unreachable; hold on to logs on disk until it is back.
+                    self.spool_batch(data)
+                    failures = 1
+                    retry_at = time.time() + 1
+                    continue
+
+                # While any batches are spooled, newer batches are spooled behind them, to keep
+                # logs in order.
+                timeout = max(retry_at - time.time(), 0)
+                if not eof:
+                    try:
+                        data = self.sendq.get(timeout=timeout)
+                    except queue.Empty:
+                        pass
+                    else:
+                        if data is None:
+                            eof = True
+                        else:
+                            self.spool_batch(data)
+                        continue
+                elif timeout:
+                    time.sleep(timeout)
+
+                # Once the master answers again, the spool drains as fast as it accepts batches.
+                data = self.spool.peek()
+                if self.try_ship(data):
+                    self.spool.pop(data)
+                    failures = 0
+                    retry_at = 0.0
+                else:
+                    failures += 1
+                    retry_at = time.time() + min(2 ** (failures - 1), SPOOL_RETRY_MAX_SECONDS)
+        except Exception as e:
+            self.send_error = e
+        finally:
+            self.close()
+            self.spool.close()
+
+    def spool_batch(self, data: bytes) -> None:
+        try:
+            self.spool.append(data)
+        except OSError:
+            logging.error("failed to spool logs, dropping them", exc_info=True)
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
 
     def ship(self, data: bytes, backoffs: List[int]) -> None:
         for delay in backoffs:
             time.sleep(delay)
-            try:
-                req = urllib.request.Request(self.logs_url, data, self.headers, method="POST")
-                try:
-                    with urllib.request.urlopen(req, context=self.context) as resp:
-                        respbody = resp.read()
-                except urllib.error.URLError as e:
-                    # urllib stacktraces are awful, so see if we can interpret what happened.
-                    # Note that we've already connected successfully to the master so failures here
-                    # are likely related to master crashing or the network breaking or something to
-                    # that effect.
-                    if isinstance(e, urllib.error.HTTPError):
-                        raise RuntimeError(
-                            f"POST logs returned status code: {e.code} and reason: {e.reason}, "
-                            "is the master healthy?"
-                        ) from None
-                    elif isinstance(e.reason, ConnectionRefusedError):
-                        raise RuntimeError(
-                            f"The connection to {self.master_url} was refused, is master down?"
-                        )
-                    raise
+            if self.try_ship(data):
+                return
 
-                if resp.getcode() != 200:
-                    raise RuntimeError(
-                        f"ship logs failed: status code {resp.get_code()}, body:\n---\n"
-                        + respbody.decode("utf8")
-                    )
+        raise RuntimeError("failed to connect to master for too long, giving up")
+
+    def try_ship(self, data: bytes) -> bool:
+        """
+        Try once to ship a batch of logs, and return False if it should be tried again later.
+        """
+        try:
+            try:
+                status, reason, respbody = self.post_logs(data)
+            except ConnectionRefusedError:
+                # Note that we've already connected successfully to the master so failures here
+                # are likely related to master crashing or the network breaking or something to
+                # that effect.
+                raise RuntimeError(
+                    f"The connection to {self.master_url} was refused, is master down?"
+                ) from None
 
+            if status == 200:
                 # Shipped successfully
-                return
+                return True
 
-            except Exception:
-                logging.error("failed to ship logs to master", exc_info=True)
+            msg = (
+                f"POST logs returned status code: {status} and reason: {reason}"
+                + "\n---\n"
+                + respbody.decode("utf8", "replace")
+            )
+            if 400 <= status < 500 and status not in (408, 429):
+                # Trying again would only be rejected again, and hold up every later batch.
+                logging.error(f"master rejected logs, dropping them: {msg}")
+                return True
+            raise RuntimeError(f"{msg}\nis the master healthy?")
 
-        raise RuntimeError("failed to connect to master for too long, giving up")
+        except Exception:
+            logging.error("failed to ship logs to master", exc_info=True)
+            return False
+
+    def post_logs(self, data: bytes) -> Tuple[int, str, bytes]:
+        headers = {**self.headers, "Content-Type": "application/json"}
+        if self.gzip:
+            status, reason, respbody = self.request(
+                "POST",
+                self.logs_path,
+                gzip.compress(data, compresslevel=1),
+                {**headers, "Content-Encoding": "gzip"},
+            )
+            if status not in (400, 415):
+                return status, reason, respbody
+            # This master does not accept compressed logs.
+            self.gzip = False
+        return self.request("POST", self.logs_path, data, headers)
+
+    def request(
+        self, method: str, path: str, body: bytes, headers: Dict[str, str]
+    ) -> Tuple[int, str, bytes]:
+        """
+        Make a request over the keep-alive connection to the master, and read the whole response.
+        """
+        target = self.path_prefix + path
+        if self.proxy is not None and not self.https:
+            # Plain http proxies expect the full url of the request.
+            target = self.base_url + path
+            headers = {**headers, **self.proxy_headers}
+
+        while True:
+            reused = self.conn is not None
+            if self.conn is None:
+                self.conn = self.connect()
+            try:
+                self.conn.request(method, target, body, headers)
+                resp = self.conn.getresponse()
+                return resp.status, resp.reason, resp.read()
+            except (http.client.HTTPException, OSError):
+                self.conn.close()
+                self.conn = None
+                # The master may have closed a connection which sat idle between batches; only a
+                # fresh connection failing is an error.
+                if not reused:
+                    raise
+
+    def connect(self) -> http.client.HTTPConnection:
+        if self.proxy is None:
+            host, port = self.host, self.port
+        else:
+            host, port = self.proxy.hostname or "", self.proxy.port
+        if not self.https:
+            return http.client.HTTPConnection(host, port)
+        conn = http.client.HTTPSConnection(host, port, context=self.context)
+        if self.proxy is not None:
+            conn.set_tunnel(self.host, self.port, headers=self.proxy_headers)
+        return conn
 
     def ship_special(self, msg: str, metadata: Dict[str, str], emit_stdout_logs: bool) -> None:
         """
@@ -400,7 +711,10 @@ class Shipper(threading.Thread):
 
         # Try to ship for about 30 seconds.
         backoffs = [0, 1, 5, 10, 15]
-        self.ship(data, backoffs)
+        try:
+            self.ship(data, backoffs)
+        finally:
+            self.close()
 
     def assert_master_is_reachable(self):
         """
@@ -506,6 +820,7 @@ def main(
     emit_stdout_logs: bool,
     cmd: List[str],
     log_wait_time: int,
+    spool_dir: Optional[str] = None,
 ) -> int:
     logq: queue.Queue = queue.Queue()
     doneq: queue.Queue = queue.Queue()
@@ -525,7 +840,16 @@ def main(
     #
     # So as an easy workaround, we set daemon=True and just exit the process if it's not done on
     # time.
-    shipper = Shipper(master_url, token, cert_name, cert_file, logq, doneq, daemon=True)
+    shipper = Shipper(
+        master_url,
+        token,
+        cert_name,
+        cert_file,
+        logq,
+        doneq,
+        daemon=True,
+        spool_dir=spool_dir,
+    )
     shipper_timed_out = False
 
     shipper.assert_master_is_reachable()
@@ -534,7 +858,11 @@ def main(
     try:
         # Don't rely on Popen's standard line buffering; we want to do our own line buffering.
         p = subprocess.Popen(
-            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
         )
     except FileNotFoundError:
         shipper.ship_special(f"FileNotFoundError executing {cmd}", metadata, emit_stdout_logs)
@@ -703,6 +1031,9 @@ def main(
                     f"waited {log_wait_time} seconds for shipper to finish after crash; "
                     "giving up now"
                 )
+        if shipper_started and shipper.is_alive():
+            # Whatever is still spooled will never be shipped.
+            shipper.spool.close()
 
 
 def configure_escape_hatch(dirpath: str) -> None:
@@ -779,6 +1110,9 @@ if __name__ == "__main__":
 
         emit_stdout_logs = bool(os.environ.get("DET_SHIPPER_EMIT_STDOUT_LOGS"))
 
+        # Where to spool logs while the master is unreachable; the default is the temp directory.
+        spool_dir = os.environ.get("DET_SHIP_LOGS_SPOOL_DIR") or None
+
         metadata["source"] = "task"
 
         exit_code = main(
@@ -790,6 +1124,7 @@ if __name__ == "__main__":
             emit_stdout_logs,
             cmd=sys.argv[1:],
             log_wait_time=log_wait_time,
+            spool_dir=spool_dir,
         )
     except Exception:
         logging.error("ship_logs.py crashed!", exc_info=True)